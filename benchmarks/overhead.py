@@ -0,0 +1,565 @@
+"""
+Measures the overhead of pytest-asyncio compared to equivalent synchronous suites.
+
+Each scenario generates a synthetic project in several variants: a synchronous
+baseline and one or more variants that run the same number of tests with
+pytest-asyncio. Every variant is run in a fresh interpreter, which reports its
+collection time, the time spent running the tests and in their setup, and its peak
+resident set size. Scenarios that run several sessions in the same interpreter
+also report the memory retained by the later sessions and the number of live
+FixtureDef objects. The fastest of several runs is kept. The results are printed
+and can be written to a JSON file, which allows comparing the results of
+different revisions.
+
+Usage::
+
+    python benchmarks/overhead.py --tests 10000 --output results.json
+    python benchmarks/overhead.py --scenario trivial --compare baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.metadata
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from textwrap import dedent
+from typing import Any, Callable, NamedTuple
+
+# Runs pytest sessions in a fresh interpreter and writes the measurements of the
+# last session to a JSON file
+RUNNER = dedent(
+    """\
+    import gc
+    import json
+    import resource
+    import sys
+    import time
+
+    import pytest
+    from _pytest.fixtures import FixtureDef
+
+    class Timer:
+        def __init__(self):
+            self.setup = 0.0
+
+        def pytest_sessionstart(self, session):
+            self.start = time.perf_counter()
+
+        def pytest_collection_finish(self, session):
+            self.collected = time.perf_counter()
+            self.tests = len(session.items)
+
+        def pytest_runtest_logreport(self, report):
+            if report.when == "setup":
+                self.setup += report.duration
+
+        def pytest_sessionfinish(self, session):
+            self.finish = time.perf_counter()
+
+    def resident_set_size():
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * resource.getpagesize()
+        except OSError:
+            # Fall back to the peak resident set size on platforms without procfs
+            return max_rss()
+
+    def max_rss():
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    result_path, sessions, args = sys.argv[1], int(sys.argv[2]), sys.argv[3:]
+    project = args[-1]
+    rss = []
+    for _ in range(sessions):
+        timer = Timer()
+        exit_code = pytest.main(args, plugins=[timer])
+        if exit_code != 0:
+            break
+        # Later sessions import the test modules again, like IDE runners do
+        for name, module in list(sys.modules.items()):
+            if (getattr(module, "__file__", None) or "").startswith(project):
+                del sys.modules[name]
+        gc.collect()
+        rss.append(resident_set_size())
+    with open(result_path, "w") as result_file:
+        json.dump(
+            {
+                "exit_code": int(exit_code),
+                "tests": timer.tests,
+                "collect": timer.collected - timer.start,
+                "run": timer.finish - timer.collected,
+                "setup": timer.setup,
+                "max_rss": max_rss(),
+                "retained": rss[-1] - rss[0] if rss else 0,
+                "fixture_defs": sum(
+                    isinstance(obj, FixtureDef) for obj in gc.get_objects()
+                ),
+            },
+            result_file,
+        )
+    """
+)
+
+TRIVIAL_MODULE = dedent(
+    """\
+    import pytest
+
+    {marker}
+    @pytest.mark.parametrize("n", range({tests}))
+    {async_}def test_trivial(n):
+        pass
+
+    class TestClass:
+        {marker}
+        @pytest.mark.parametrize("n", range({tests}))
+        {async_}def test_method(self, n):
+            pass
+    """
+)
+
+SYNC_SUITE_MODULE = dedent(
+    """\
+    import pytest
+
+    @pytest.fixture
+    def value():
+        return 1
+
+    class TestSync:
+        def test_method(self, value):
+            assert value == 1
+
+    @pytest.mark.parametrize("n", range({tests}))
+    def test_function(value, n):
+        assert value == 1
+    """
+)
+
+FIXTURE_PARAMS_MODULE = dedent(
+    """\
+    import pytest
+    import pytest_asyncio
+
+    @{decorator}(params=range({params}))
+    {async_}def parametrized_fixture(request):
+        return request.param
+
+    @{decorator}
+    {async_}def dependent_fixture(parametrized_fixture):
+        yield parametrized_fixture
+
+    {marker}
+    @pytest.mark.parametrize("n", range({tests_per_param}))
+    {async_}def test_fixture_setup(dependent_fixture, n):
+        pass
+    """
+)
+
+REPEATED_SESSIONS_MODULE = dedent(
+    """\
+    import pytest
+    import pytest_asyncio
+
+    @{decorator}({loop_scope}scope="module")
+    {async_}def payload():
+        yield bytearray(1024 * 1024)
+
+    @pytest.mark.parametrize("n", range(10))
+    {marker}
+    {async_}def test_payload(payload, n):
+        assert len(payload) == 1024 * 1024
+    """
+)
+
+SCOPED_LOOP_MODULE = dedent(
+    """\
+    import pytest
+
+    {marker}
+
+    @pytest.mark.parametrize("n", range({tests}))
+    {async_}def test_function(n):
+        pass
+
+    class TestClass:
+        {async_}def test_method(self):
+            pass
+    """
+)
+
+HYPOTHESIS_FUNCTION = dedent(
+    """\
+
+    {marker}
+    @settings(max_examples={examples}, database=None, deadline=None)
+    @given(st.integers())
+    {async_}def test_hypothesis_{index}(value):
+        pass
+    """
+)
+
+MODULES = 10
+FIXTURE_DEPTH = 10
+FIXTURE_WIDTH = 3
+FIXTURE_PARAMS = 10
+PACKAGES = 10
+HYPOTHESIS_EXAMPLES = 100
+TESTS_PER_SESSION = 10
+
+# A variant writes its project into a directory and returns additional pytest
+# arguments
+Variant = Callable[[Path], list[str]]
+
+
+class Scenario(NamedTuple):
+    # Returns the variants of the scenario for the requested number of tests
+    variants: Callable[[int], dict[str, Variant]]
+    # Returns the number of sessions that run in the same interpreter
+    sessions: Callable[[int], int] = lambda tests: 1
+
+
+def trivial_tests(tests: int) -> dict[str, Variant]:
+    """Many trivial functions and methods, in strict mode and in auto mode."""
+
+    def variant(async_: bool, marker: bool, mode: str) -> Variant:
+        def create(directory: Path) -> list[str]:
+            for module_index in range(MODULES):
+                (directory / f"test_trivial_{module_index}.py").write_text(
+                    TRIVIAL_MODULE.format(
+                        marker="@pytest.mark.asyncio" if marker else "",
+                        tests=tests // (2 * MODULES),
+                        async_="async " if async_ else "",
+                    )
+                )
+            return [f"--asyncio-mode={mode}"]
+
+        return create
+
+    return {
+        "sync": variant(async_=False, marker=False, mode="strict"),
+        "strict": variant(async_=True, marker=True, mode="strict"),
+        "auto": variant(async_=True, marker=False, mode="auto"),
+    }
+
+
+def sync_suite(tests: int) -> dict[str, Variant]:
+    """Packages of synchronous tests, without the plugin and with each activation."""
+
+    def variant(args: list[str]) -> Variant:
+        def create(directory: Path) -> list[str]:
+            tests_per_module = max(tests // (PACKAGES * MODULES) - 1, 1)
+            for package_index in range(PACKAGES):
+                package = directory / f"package_{package_index}"
+                package.mkdir()
+                (package / "__init__.py").write_text("")
+                for module_index in range(MODULES):
+                    (package / f"test_module_{module_index}.py").write_text(
+                        SYNC_SUITE_MODULE.format(tests=tests_per_module)
+                    )
+            return args
+
+        return create
+
+    return {
+        "sync": variant(["-p", "no:asyncio"]),
+        "eager": variant(["-o", "asyncio_activation=eager"]),
+        "lazy": variant(["-o", "asyncio_activation=lazy"]),
+    }
+
+
+def fixture_params(tests: int) -> dict[str, Variant]:
+    """Tests that request a parametrized fixture through a generator fixture."""
+
+    def variant(async_: bool) -> Variant:
+        def create(directory: Path) -> list[str]:
+            (directory / "test_fixture_setup.py").write_text(
+                FIXTURE_PARAMS_MODULE.format(
+                    decorator="pytest_asyncio.fixture" if async_ else "pytest.fixture",
+                    params=FIXTURE_PARAMS,
+                    tests_per_param=tests // FIXTURE_PARAMS,
+                    marker="@pytest.mark.asyncio" if async_ else "",
+                    async_="async " if async_ else "",
+                )
+            )
+            return ["--asyncio-mode=strict"]
+
+        return create
+
+    return {"sync": variant(async_=False), "strict": variant(async_=True)}
+
+
+def repeated_sessions(tests: int) -> dict[str, Variant]:
+    """Small sessions with a module-scoped fixture, run in the same interpreter."""
+
+    def variant(async_: bool) -> Variant:
+        def create(directory: Path) -> list[str]:
+            (directory / "__init__.py").write_text("")
+            (directory / "test_payload.py").write_text(
+                REPEATED_SESSIONS_MODULE.format(
+                    decorator="pytest_asyncio.fixture" if async_ else "pytest.fixture",
+                    loop_scope='loop_scope="module", ' if async_ else "",
+                    marker='@pytest.mark.asyncio(loop_scope="module")'
+                    if async_
+                    else "",
+                    async_="async " if async_ else "",
+                )
+            )
+            return ["--asyncio-mode=strict"]
+
+        return create
+
+    return {"sync": variant(async_=False), "strict": variant(async_=True)}
+
+
+def fixture_graph(tests: int) -> dict[str, Variant]:
+    """Tests that request a deep graph of fixtures, half of which are generators."""
+
+    def create_module(async_: bool) -> str:
+        decorator = "@pytest_asyncio.fixture" if async_ else "@pytest.fixture"
+        prefix = "async " if async_ else ""
+        lines = ["import pytest", "import pytest_asyncio", ""]
+        for level in range(FIXTURE_DEPTH):
+            dependencies = (
+                [f"fixture_{level - 1}_{index}" for index in range(FIXTURE_WIDTH)]
+                if level
+                else []
+            )
+            for index in range(FIXTURE_WIDTH):
+                statement = "yield" if level % 2 else "return"
+                lines += [
+                    decorator,
+                    f"{prefix}def fixture_{level}_{index}({', '.join(dependencies)}):",
+                    f"    {statement} {level}",
+                    "",
+                ]
+        leaves = ", ".join(
+            f"fixture_{FIXTURE_DEPTH - 1}_{index}" for index in range(FIXTURE_WIDTH)
+        )
+        lines += [
+            "@pytest.mark.asyncio" if async_ else "",
+            f'@pytest.mark.parametrize("n", range({tests // MODULES}))',
+            f"{prefix}def test_graph({leaves}, n):",
+            "    pass",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def variant(async_: bool) -> Variant:
+        def create(directory: Path) -> list[str]:
+            for module_index in range(MODULES):
+                (directory / f"test_graph_{module_index}.py").write_text(
+                    create_module(async_)
+                )
+            return ["--asyncio-mode=strict"]
+
+        return create
+
+    return {"sync": variant(async_=False), "strict": variant(async_=True)}
+
+
+def scoped_loops(tests: int) -> dict[str, Variant]:
+    """Many packages and modules whose tests run in module or package loops."""
+
+    def variant(async_: bool) -> Variant:
+        def create(directory: Path) -> list[str]:
+            tests_per_module = max(tests // (PACKAGES * MODULES) - 1, 1)
+            for package_index in range(PACKAGES):
+                package = directory / f"package_{package_index}"
+                package.mkdir()
+                (package / "__init__.py").write_text("")
+                loop_scope = "package" if package_index % 2 else "module"
+                marker = (
+                    f'pytestmark = pytest.mark.asyncio(loop_scope="{loop_scope}")'
+                    if async_
+                    else ""
+                )
+                for module_index in range(MODULES):
+                    (package / f"test_scoped_{module_index}.py").write_text(
+                        SCOPED_LOOP_MODULE.format(
+                            marker=marker,
+                            tests=tests_per_module,
+                            async_="async " if async_ else "",
+                        )
+                    )
+            return ["--asyncio-mode=strict"]
+
+        return create
+
+    return {"sync": variant(async_=False), "strict": variant(async_=True)}
+
+
+def hypothesis_tests(tests: int) -> dict[str, Variant]:
+    """Hypothesis tests, each of which runs many examples."""
+
+    def variant(async_: bool) -> Variant:
+        def create(directory: Path) -> list[str]:
+            functions = max(tests // HYPOTHESIS_EXAMPLES // MODULES, 1)
+            for module_index in range(MODULES):
+                source = [
+                    "import pytest",
+                    "from hypothesis import given, settings, strategies as st",
+                ]
+                source += (
+                    HYPOTHESIS_FUNCTION.format(
+                        marker="@pytest.mark.asyncio" if async_ else "",
+                        examples=HYPOTHESIS_EXAMPLES,
+                        async_="async " if async_ else "",
+                        index=index,
+                    )
+                    for index in range(functions)
+                )
+                (directory / f"test_hypothesis_{module_index}.py").write_text(
+                    "\n".join(source)
+                )
+            return ["--asyncio-mode=strict", "-p", "no:hypothesispytest"]
+
+        return create
+
+    return {"sync": variant(async_=False), "strict": variant(async_=True)}
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "trivial": Scenario(trivial_tests),
+    "sync_suite": Scenario(sync_suite),
+    "fixture_params": Scenario(fixture_params),
+    "fixture_graph": Scenario(fixture_graph),
+    "scoped_loops": Scenario(scoped_loops),
+    "hypothesis": Scenario(hypothesis_tests),
+    "repeated_sessions": Scenario(
+        repeated_sessions, sessions=lambda tests: max(tests // TESTS_PER_SESSION, 2)
+    ),
+}
+
+
+def measure(
+    directory: Path, args: list[str], repeat: int, sessions: int
+) -> dict[str, Any]:
+    """Runs the project several times and keeps the fastest run."""
+    command = [
+        sys.executable,
+        "-c",
+        RUNNER,
+        str(directory / "result.json"),
+        str(sessions),
+        "-q",
+        "-p",
+        "no:cacheprovider",
+        "-o",
+        "asyncio_default_fixture_loop_scope=function",
+        *args,
+        str(directory),
+    ]
+    runs = []
+    for _ in range(repeat):
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=directory)
+        result = json.loads((directory / "result.json").read_text())
+        if result.pop("exit_code") != 0:
+            raise RuntimeError(f"The tests in {directory} failed")
+        runs.append(result)
+    return {
+        "tests": runs[0]["tests"],
+        "sessions": sessions,
+        **{
+            metric: min(run[metric] for run in runs)
+            for metric in ("collect", "run", "setup", "max_rss", "retained")
+        },
+        "fixture_defs": runs[0]["fixture_defs"],
+    }
+
+
+def run_scenario(name: str, tests: int, repeat: int) -> dict[str, Any]:
+    scenario = SCENARIOS[name]
+    variants = {}
+    for variant_name, create in scenario.variants(tests).items():
+        with tempfile.TemporaryDirectory() as directory:
+            project = Path(directory) / "project"
+            project.mkdir()
+            args = create(project)
+            variants[variant_name] = measure(
+                project, args, repeat, scenario.sessions(tests)
+            )
+    baseline = variants["sync"]
+    for result in variants.values():
+        result["overhead_per_test"] = (result["run"] - baseline["run"]) / max(
+            result["tests"], 1
+        )
+    return variants
+
+
+def print_results(results: dict[str, Any]) -> None:
+    for scenario, variants in results["scenarios"].items():
+        for variant, result in variants.items():
+            line = (
+                f"{scenario:>17} {variant:>7}: {result['tests']:>6} tests, "
+                f"collect {result['collect']:.3f}s, run {result['run']:.3f}s, "
+                f"setup {result['setup']:.3f}s, "
+                f"overhead {result['overhead_per_test'] * 1e6:8.1f}us/test, "
+                f"peak RSS {result['max_rss'] / 2**20:.1f} MiB"
+            )
+            if result["sessions"] > 1:
+                line += (
+                    f", {result['sessions']} sessions retained "
+                    f"{result['retained'] / 2**20:.1f} MiB and "
+                    f"{result['fixture_defs']} FixtureDefs"
+                )
+            print(line)
+
+
+def print_comparison(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Prints the change of each measurement relative to the baseline results."""
+    for scenario, variants in results["scenarios"].items():
+        for variant, result in variants.items():
+            try:
+                previous = baseline["scenarios"][scenario][variant]
+            except KeyError:
+                continue
+            changes = ", ".join(
+                f"{metric} {(result[metric] / previous[metric] - 1) * 100:+.1f}%"
+                for metric in ("collect", "run", "setup", "max_rss")
+                if previous.get(metric)
+            )
+            print(f"{scenario:>17} {variant:>7}: {changes}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tests", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="scenario to run, may be given several times (default: all)",
+    )
+    parser.add_argument("--output", help="write the results to a JSON file")
+    parser.add_argument("--compare", help="compare the results to a JSON file")
+    args = parser.parse_args()
+    scenarios = args.scenario or list(SCENARIOS)
+    if "hypothesis" in scenarios and importlib.util.find_spec("hypothesis") is None:
+        print("hypothesis is not installed, skipping the hypothesis scenario")
+        scenarios.remove("hypothesis")
+    results = {
+        "python": platform.python_version(),
+        "pytest": importlib.metadata.version("pytest"),
+        "pytest-asyncio": importlib.metadata.version("pytest-asyncio"),
+        "tests": args.tests,
+        "scenarios": {
+            name: run_scenario(name, args.tests, args.repeat) for name in scenarios
+        },
+    }
+    print_results(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        print_comparison(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
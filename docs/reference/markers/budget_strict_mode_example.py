@@ -0,0 +1,10 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.asyncio(max_loop_iterations=100)
+
+
+@pytest.mark.asyncio(max_duration=1.0, max_cpu=0.5)
+async def test_stays_within_budget():
+    await asyncio.sleep(0)
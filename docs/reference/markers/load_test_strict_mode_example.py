@@ -0,0 +1,8 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio(repeat=100, concurrency=10, max_p99=0.5)
+async def test_handles_concurrent_requests():
+    await asyncio.sleep(0)
@@ -3,6 +3,18 @@
 from __future__ import annotations
 
 from ._version import version as __version__  # noqa: F401
-from .plugin import fixture, is_async_test
+from .plugin import (
+    SharedResource,
+    StubResolver,
+    fixture,
+    is_async_test,
+    shared_resource,
+)
 
-__all__ = ("fixture", "is_async_test")
+__all__ = (
+    "SharedResource",
+    "StubResolver",
+    "fixture",
+    "is_async_test",
+    "shared_resource",
+)
@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
+import ast
 import asyncio
+import collections
+import concurrent.futures
 import contextlib
 import contextvars
+import cProfile
 import enum
 import functools
+import gc
+import hashlib
 import inspect
+import ipaddress
+import json
+import linecache
+import os
+import pickle
+import pstats
+import re
+import shutil
 import socket
 import sys
+import threading
+import time
+import tracemalloc
+import types
 import warnings
+import weakref
 from asyncio import AbstractEventLoop, AbstractEventLoopPolicy
 from collections.abc import (
     AsyncIterator,
@@ -22,13 +41,17 @@ from collections.abc import (
     Mapping,
     Sequence,
 )
+from pathlib import Path
 from textwrap import dedent
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
+    Generic,
     Literal,
     TypeVar,
     Union,
+    cast,
     overload,
 )
 
@@ -64,6 +87,11 @@ _ScopeName = Literal["session", "package", "module", "class", "function"]
 _T = TypeVar("_T")
 _R = TypeVar("_R", bound=Union[Awaitable[Any], AsyncIterator[Any]])
 _P = ParamSpec("_P")
+_F = TypeVar("_F", bound="PytestAsyncioFunction")
+if TYPE_CHECKING:
+    from typing_extensions import TypeVarTuple, Unpack
+
+    _Ts = TypeVarTuple("_Ts")
 FixtureFunction = Callable[_P, _R]
 
 
@@ -88,6 +116,48 @@ both pytest-asyncio and pytest-trio are used in the same project)
 """
 
 
+class LeakPolicy(str, enum.Enum):
+    OFF = "off"
+    WARN = "warn"
+    FAIL = "fail"
+    CANCEL = "cancel"
+
+
+class Activation(str, enum.Enum):
+    EAGER = "eager"
+    LAZY = "lazy"
+
+
+class ContextMode(str, enum.Enum):
+    COPY = "copy"
+    SHARED = "shared"
+
+
+class GcMode(str, enum.Enum):
+    DEFAULT = "default"
+    DEFERRED = "deferred"
+    FROZEN = "frozen"
+
+
+class ChildWatcher(str, enum.Enum):
+    DEFAULT = "default"
+    PIDFD = "pidfd"
+
+
+class ProfileFormat(str, enum.Enum):
+    COLLAPSED = "collapsed"
+    PSTATS = "pstats"
+
+
+ASYNCIO_LEAK_POLICY_HELP = """\
+'off' - do not track asyncio resources created by tests
+'warn' - warn about tasks, timers, transports and subprocesses \
+that are still alive when a test ends
+'fail' - report leftover asyncio resources as a test error
+'cancel' - cancel or close leftover asyncio resources before the event loop is closed
+"""
+
+
 def pytest_addoption(parser: Parser, pluginmanager: PytestPluginManager) -> None:
     group = parser.getgroup("asyncio")
     group.addoption(
@@ -97,6 +167,107 @@ def pytest_addoption(parser: Parser, pluginmanager: PytestPluginManager) -> None
         metavar="MODE",
         help=ASYNCIO_MODE_HELP,
     )
+    group.addoption(
+        "--asyncio-leak-policy",
+        dest="asyncio_leak_policy",
+        default=None,
+        metavar="POLICY",
+        help=ASYNCIO_LEAK_POLICY_HELP,
+    )
+    group.addoption(
+        "--asyncio-trace",
+        dest="asyncio_trace",
+        default=None,
+        metavar="PATH",
+        help="write a timeline of event loops, async fixtures and tests to PATH "
+        "in the Trace Event Format, which can be viewed in Perfetto",
+    )
+    group.addoption(
+        "--asyncio-trace-tasks",
+        dest="asyncio_trace_tasks",
+        action="store_true",
+        default=False,
+        help="include the lifetime of individual tasks in the --asyncio-trace output",
+    )
+    group.addoption(
+        "--asyncio-load",
+        dest="asyncio_load",
+        default=None,
+        type=int,
+        metavar="REPEAT",
+        help="run the body of each async test REPEAT times and report its "
+        "throughput and latency percentiles",
+    )
+    group.addoption(
+        "--asyncio-load-concurrency",
+        dest="asyncio_load_concurrency",
+        default=1,
+        type=int,
+        metavar="N",
+        help="number of concurrent runs of a test body in load tests (default: 1)",
+    )
+    group.addoption(
+        "--asyncio-profile",
+        dest="asyncio_profile",
+        default=None,
+        metavar="DIR",
+        help="profile async tests and fixtures and write one profile per test to DIR",
+    )
+    group.addoption(
+        "--asyncio-profile-format",
+        dest="asyncio_profile_format",
+        default=ProfileFormat.COLLAPSED.value,
+        choices=[profile_format.value for profile_format in ProfileFormat],
+        help="'collapsed' - coroutine stacks with CPU, await and idle time, "
+        "suitable for flamegraph tools; "
+        "'pstats' - cProfile statistics",
+    )
+    group.addoption(
+        "--asyncio-profile-aggregate",
+        dest="asyncio_profile_aggregate",
+        action="store_true",
+        default=False,
+        help="write a single profile for the whole session instead of one per test",
+    )
+    group.addoption(
+        "--asyncio-lag",
+        dest="asyncio_lag",
+        action="store_true",
+        default=False,
+        help="measure the delay between scheduling and running event loop callbacks "
+        "and report its percentiles per test and async fixture",
+    )
+    group.addoption(
+        "--asyncio-task-counts",
+        dest="asyncio_task_counts",
+        action="store_true",
+        default=False,
+        help="count the tasks created by each async test, the peak number of those "
+        "tasks that are pending at the same time and the event loop iterations",
+    )
+    group.addoption(
+        "--asyncio-memory",
+        dest="asyncio_memory",
+        action="store_true",
+        default=False,
+        help="trace memory allocations and report the allocation sites and the "
+        "futures, tasks and handles left behind by tests and async fixtures",
+    )
+    group.addoption(
+        "--asyncio-advise",
+        dest="asyncio_advise",
+        action="store_true",
+        default=False,
+        help="measure the time spent creating event loops and async fixtures "
+        "repeatedly and recommend wider loop scopes",
+    )
+    group.addoption(
+        "--asyncio-cache-clear",
+        dest="asyncio_cache_clear",
+        action="store_true",
+        default=False,
+        help="remove the cached results of async fixtures declared with cache='disk'",
+    )
     parser.addini(
         "asyncio_mode",
         help="default value for --asyncio-mode",
@@ -114,6 +285,86 @@ def pytest_addoption(parser: Parser, pluginmanager: PytestPluginManager) -> None
         help="default scope of the asyncio event loop used to execute tests",
         default="function",
     )
+    parser.addini(
+        "asyncio_default_max_duration",
+        type="string",
+        help="default loop time budget of async tests in seconds",
+        default=None,
+    )
+    parser.addini(
+        "asyncio_default_max_cpu",
+        type="string",
+        help="default process CPU time budget of async tests in seconds",
+        default=None,
+    )
+    parser.addini(
+        "asyncio_default_max_loop_iterations",
+        type="string",
+        help="default budget of event loop iterations of async tests",
+        default=None,
+    )
+    parser.addini(
+        "asyncio_default_timeout",
+        type="string",
+        help="default timeout of async tests and the async fixtures they request "
+        "in seconds",
+        default=None,
+    )
+    parser.addini(
+        "asyncio_default_max_lag",
+        type="string",
+        help="default budget of the 99th percentile of the loop lag of async tests "
+        "in seconds",
+        default=None,
+    )
+    parser.addini(
+        "asyncio_leak_policy",
+        help="default value for --asyncio-leak-policy",
+        default="off",
+    )
+    parser.addini(
+        "asyncio_cache_max_size",
+        type="string",
+        help="maximum size in megabytes of the cached results of async fixtures",
+        default="100",
+    )
+    parser.addini(
+        "asyncio_activation",
+        type="string",
+        help="'eager' to prepare every collector for asyncio tests, "
+        "'lazy' to stay dormant until the first async function or asyncio mark",
+        default="eager",
+    )
+    parser.addini(
+        "asyncio_gc_mode",
+        type="string",
+        help="'default' to leave the garbage collector alone, "
+        "'deferred' to collect garbage after each async test instead of during it, "
+        "'frozen' to also freeze the objects that exist after the first test setup",
+        default=None,
+    )
+    parser.addini(
+        "asyncio_gc_full_interval",
+        type="string",
+        help="number of async tests between full garbage collections "
+        "when collections are deferred (default: 1)",
+        default="1",
+    )
+    parser.addini(
+        "asyncio_child_watcher",
+        type="string",
+        help="'default' to leave child processes to the watcher of the event loop "
+        "policy, 'pidfd' to watch them through pidfds in all event loops "
+        "(Python 3.9 to 3.11 on Linux)",
+        default="default",
+    )
+    parser.addini(
+        "asyncio_context_mode",
+        type="string",
+        help="'copy' to run each async fixture in a copy of the current context, "
+        "'shared' to run async fixtures and tests in one context per event loop",
+        default="copy",
+    )
 
 
 @overload
@@ -122,6 +373,8 @@ def fixture(
     *,
     scope: _ScopeName | Callable[[str, Config], _ScopeName] = ...,
     loop_scope: _ScopeName | None = ...,
+    cache: Literal["disk"] | None = ...,
+    cache_inputs: Iterable[str | os.PathLike[str]] = ...,
     params: Iterable[object] | None = ...,
     autouse: bool = ...,
     ids: (
@@ -139,6 +392,8 @@ def fixture(
     *,
     scope: _ScopeName | Callable[[str, Config], _ScopeName] = ...,
     loop_scope: _ScopeName | None = ...,
+    cache: Literal["disk"] | None = ...,
+    cache_inputs: Iterable[str | os.PathLike[str]] = ...,
     params: Iterable[object] | None = ...,
     autouse: bool = ...,
     ids: (
@@ -153,6 +408,8 @@ def fixture(
 def fixture(
     fixture_function: FixtureFunction[_P, _R] | None = None,
     loop_scope: _ScopeName | None = None,
+    cache: Literal["disk"] | None = None,
+    cache_inputs: Iterable[str | os.PathLike[str]] = (),
     **kwargs: Any,
 ) -> (
     FixtureFunction[_P, _R]
@@ -160,17 +417,75 @@ def fixture(
 ):
     if fixture_function is not None:
         _make_asyncio_fixture_function(fixture_function, loop_scope)
+        if cache is not None:
+            _make_cached_fixture_function(fixture_function, cache, cache_inputs)
         return pytest.fixture(fixture_function, **kwargs)
 
     else:
 
         @functools.wraps(fixture)
         def inner(fixture_function: FixtureFunction[_P, _R]) -> FixtureFunction[_P, _R]:
-            return fixture(fixture_function, loop_scope=loop_scope, **kwargs)
+            return fixture(
+                fixture_function,
+                loop_scope=loop_scope,
+                cache=cache,
+                cache_inputs=cache_inputs,
+                **kwargs,
+            )
 
         return inner
 
 
+def _make_cached_fixture_function(
+    obj: Any, cache: str, cache_inputs: Iterable[str | os.PathLike[str]]
+) -> None:
+    if cache != "disk":
+        raise ValueError(f"cache must be None or 'disk', got {cache!r}")
+    if not inspect.iscoroutinefunction(obj):
+        raise ValueError(
+            f"{obj.__name__} cannot be cached on disk. "
+            f"Only coroutine fixtures that return their value can be cached."
+        )
+    obj._disk_cache_inputs = tuple(os.fspath(path) for path in cache_inputs)
+
+
+def shared_resource(
+    fixture_function: Callable[..., Any] | None = None, **kwargs: Any
+) -> Any:
+    """
+    Declares an async fixture whose value can be used from any event loop.
+
+    The fixture runs in an event loop of its own, which runs in a background
+    thread. Tests and fixtures receive a SharedResource proxy of the fixture value
+    rather than the value itself. The fixture is session-scoped by default. All
+    other keyword arguments are passed to pytest.fixture.
+    """
+    kwargs.setdefault("scope", "session")
+    if fixture_function is not None:
+        _make_shared_resource_function(fixture_function)
+        return pytest.fixture(fixture_function, **kwargs)
+
+    @functools.wraps(shared_resource)
+    def inner(fixture_function: Callable[..., Any]) -> Any:
+        return shared_resource(fixture_function, **kwargs)
+
+    return inner
+
+
+def _make_shared_resource_function(obj: Any) -> None:
+    if not _is_coroutine_or_asyncgen(getattr(obj, "__func__", obj)):
+        raise ValueError(
+            f"{obj.__name__} cannot be a shared resource. "
+            f"Only coroutines and async generators can be shared resources."
+        )
+    _make_asyncio_fixture_function(obj, None)
+    getattr(obj, "__func__", obj)._shared_resource = True
+
+
+def _is_shared_resource_function(obj: Any) -> bool:
+    return getattr(obj, "_shared_resource", False)
+
+
 def _is_asyncio_fixture_function(obj: Any) -> bool:
     obj = getattr(obj, "__func__", obj)  # instance method maybe?
     return getattr(obj, "_force_asyncio_fixture", False)
@@ -201,6 +516,79 @@ def _get_asyncio_mode(config: Config) -> Mode:
         ) from e
 
 
+def _get_leak_policy(config: Config) -> LeakPolicy:
+    val = config.getoption("asyncio_leak_policy")
+    if val is None:
+        val = config.getini("asyncio_leak_policy")
+    try:
+        return LeakPolicy(val)
+    except ValueError as e:
+        policies = ", ".join(p.value for p in LeakPolicy)
+        raise pytest.UsageError(
+            f"{val!r} is not a valid asyncio_leak_policy. Valid policies: {policies}."
+        ) from e
+
+
+def _get_activation(config: Config) -> Activation:
+    val = config.getini("asyncio_activation")
+    try:
+        return Activation(val)
+    except ValueError as e:
+        activations = ", ".join(a.value for a in Activation)
+        raise pytest.UsageError(
+            f"{val!r} is not a valid asyncio_activation. "
+            f"Valid activations: {activations}."
+        ) from e
+
+
+def _get_child_watcher(config: Config) -> ChildWatcher:
+    val = config.getini("asyncio_child_watcher")
+    try:
+        return ChildWatcher(val)
+    except ValueError as e:
+        watchers = ", ".join(w.value for w in ChildWatcher)
+        raise pytest.UsageError(
+            f"{val!r} is not a valid asyncio_child_watcher. Valid watchers: {watchers}."
+        ) from e
+
+
+def _get_cache_max_size(config: Config) -> int:
+    """Returns the maximum size of the fixture cache in bytes."""
+    val = config.getini("asyncio_cache_max_size")
+    try:
+        max_size = float(val)
+    except ValueError as e:
+        raise pytest.UsageError(
+            f"{val!r} is not a valid asyncio_cache_max_size. "
+            f"The size must be a number of megabytes."
+        ) from e
+    return int(max_size * 2**20)
+
+
+def _get_context_mode(config: Config) -> ContextMode:
+    val = config.getini("asyncio_context_mode")
+    try:
+        return ContextMode(val)
+    except ValueError as e:
+        modes = ", ".join(m.value for m in ContextMode)
+        raise pytest.UsageError(
+            f"{val!r} is not a valid asyncio_context_mode. Valid modes: {modes}."
+        ) from e
+
+
+def _get_gc_mode(config: Config) -> GcMode | None:
+    val = config.getini("asyncio_gc_mode")
+    if not val:
+        return None
+    try:
+        return GcMode(val)
+    except ValueError as e:
+        modes = ", ".join(m.value for m in GcMode)
+        raise pytest.UsageError(
+            f"{val!r} is not a valid asyncio_gc_mode. Valid modes: {modes}."
+        ) from e
+
+
 _DEFAULT_FIXTURE_LOOP_SCOPE_UNSET = """\
 The configuration option "asyncio_default_fixture_loop_scope" is unset.
 The event loop scope for asynchronous fixtures will default to the fixture caching \
@@ -221,6 +609,87 @@ def pytest_configure(config: Config) -> None:
         "mark the test as a coroutine, it will be "
         "run using an asyncio event loop",
     )
+    config.stash[_processed_fixturedefs] = weakref.WeakSet()
+    config.stash[_call_plans] = weakref.WeakKeyDictionary()
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        snapshot_cache = config.stash[_snapshot_cache] = _SnapshotCache(
+            functools.partial(cache.mkdir, "pytest-asyncio-fixtures"),
+            max_size=_get_cache_max_size(config),
+        )
+        if config.getoption("asyncio_cache_clear") and not hasattr(
+            config, "workerinput"
+        ):
+            snapshot_cache.clear()
+    config.stash[_package_loop_stack] = []
+    if _get_activation(config) == Activation.LAZY:
+        config.stash[_dormant] = True
+    else:
+        _register_autouse_event_loop_policy(config)
+    if _get_context_mode(config) == ContextMode.SHARED:
+        config.stash[_shared_contexts] = _SharedContexts()
+    leak_policy = _get_leak_policy(config)
+    if leak_policy != LeakPolicy.OFF:
+        config.stash[_leak_tracker] = _LeakTracker(leak_policy)
+    trace_path = config.getoption("asyncio_trace")
+    if trace_path:
+        workerinput = getattr(config, "workerinput", None)
+        config.stash[_trace_recorder] = _TraceRecorder(
+            os.path.abspath(trace_path),
+            process_name=workerinput["workerid"] if workerinput else "pytest",
+            trace_tasks=config.getoption("asyncio_trace_tasks"),
+        )
+    if config.getoption("asyncio_lag"):
+        config.stash[_lag_monitor] = _LagMonitor(report=True)
+    if config.getoption("asyncio_task_counts"):
+        config.stash[_task_counter] = _TaskCounter()
+    gc_mode = _get_gc_mode(config)
+    if gc_mode is not None:
+        try:
+            full_interval = int(config.getini("asyncio_gc_full_interval"))
+        except ValueError as e:
+            raise pytest.UsageError(
+                f"asyncio_gc_full_interval must be a positive integer: {e}"
+            ) from e
+        if full_interval < 1:
+            raise pytest.UsageError(
+                "asyncio_gc_full_interval must be a positive integer, "
+                f"got {full_interval}"
+            )
+        config.stash[_gc_controller] = _GcController(gc_mode, full_interval)
+    if config.getoption("asyncio_memory"):
+        config.stash[_memory_tracker] = _MemoryTracker()
+    if _get_child_watcher(config) == ChildWatcher.PIDFD and _can_use_pidfd():
+        config.stash[_child_watcher] = _PidfdChildWatcher()
+    if config.getoption("asyncio_advise"):
+        config.stash[_loop_scope_advisor] = _LoopScopeAdvisor()
+    profile_directory = config.getoption("asyncio_profile")
+    if profile_directory:
+        config.stash[_profiler] = _AsyncioProfiler(
+            os.path.abspath(profile_directory),
+            ProfileFormat(config.getoption("asyncio_profile_format")),
+            aggregate=config.getoption("asyncio_profile_aggregate"),
+        )
+
+
+def pytest_unconfigure(config: Config) -> None:
+    # Pytest may run several sessions in the same process, for example with
+    # pytester or in IDE runners. Drop references to the fixtures and event loop
+    # fixtures of this session, so they can be garbage collected.
+    keys: tuple[StashKey[Any], ...] = (
+        _processed_fixturedefs,
+        _call_plans,
+        _package_loop_stack,
+    )
+    for key in keys:
+        with contextlib.suppress(KeyError):
+            del config.stash[key]
+    memory_tracker = config.stash.get(_memory_tracker, None)
+    if memory_tracker is not None:
+        memory_tracker.stop()
+    gc_controller = config.stash.get(_gc_controller, None)
+    if gc_controller is not None:
+        gc_controller.stop()
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -240,8 +709,8 @@ def pytest_report_header(config: Config) -> list[str]:
 
 
 def _preprocess_async_fixtures(
-    collector: Collector,
-    processed_fixturedefs: set[FixtureDef],
+    collector: Collector | Item,
+    processed_fixturedefs: weakref.WeakSet[FixtureDef],
 ) -> None:
     config = collector.config
     default_loop_scope = config.getini("asyncio_default_fixture_loop_scope")
@@ -259,6 +728,13 @@ def _preprocess_async_fixtures(
                 # Ignore async fixtures without explicit asyncio mark in strict mode
                 # This applies to pytest_trio fixtures, for example
                 continue
+            if _is_shared_resource_function(func):
+                # Shared resources bring their own event loop
+                if "request" not in fixturedef.argnames:
+                    fixturedef.argnames += ("request",)
+                _wrap_shared_resource(config, fixturedef)
+                processed_fixturedefs.add(fixturedef)
+                continue
             scope = (
                 getattr(func, "_loop_scope", None)
                 or default_loop_scope
@@ -267,8 +743,7 @@ def _preprocess_async_fixtures(
             if scope == "function" and "event_loop" not in fixturedef.argnames:
                 fixturedef.argnames += ("event_loop",)
             _make_asyncio_fixture_function(func, scope)
-            function_signature = inspect.signature(func)
-            if "event_loop" in function_signature.parameters:
+            if _get_call_plan(config, func).wants_event_loop:
                 warnings.warn(
                     PytestDeprecationWarning(
                         f"{func.__name__} is asynchronous and explicitly "
@@ -279,88 +754,135 @@ def _preprocess_async_fixtures(
                 )
             if "request" not in fixturedef.argnames:
                 fixturedef.argnames += ("request",)
-            _synchronize_async_fixture(fixturedef)
+            _synchronize_async_fixture(config, fixturedef)
             assert _is_asyncio_fixture_function(fixturedef.func)
             processed_fixturedefs.add(fixturedef)
 
 
-def _synchronize_async_fixture(fixturedef: FixtureDef) -> None:
+def _synchronize_async_fixture(config: Config, fixturedef: FixtureDef) -> None:
     """Wraps the fixture function of an async fixture in a synchronous function."""
     if inspect.isasyncgenfunction(fixturedef.func):
-        _wrap_asyncgen_fixture(fixturedef)
+        _wrap_asyncgen_fixture(config, fixturedef)
     elif inspect.iscoroutinefunction(fixturedef.func):
-        _wrap_async_fixture(fixturedef)
+        _wrap_async_fixture(config, fixturedef)
 
 
-def _add_kwargs(
-    func: Callable[..., Any],
-    kwargs: dict[str, Any],
-    event_loop: asyncio.AbstractEventLoop,
-    request: FixtureRequest,
-) -> dict[str, Any]:
-    sig = inspect.signature(func)
-    ret = kwargs.copy()
-    if "request" in sig.parameters:
-        ret["request"] = request
-    if "event_loop" in sig.parameters:
-        ret["event_loop"] = event_loop
-    return ret
-
-
-def _perhaps_rebind_fixture_func(func: _T, instance: Any | None) -> _T:
-    if instance is not None:
-        # The fixture needs to be bound to the actual request.instance
-        # so it is bound to the same object as the test method.
-        unbound, cls = func, None
+class _CallPlan:
+    """
+    Information about a fixture or test function that pytest-asyncio needs
+    whenever the function is invoked.
+
+    Computing the plan requires inspecting the function signature, which is
+    comparatively expensive. Plans are therefore cached per function object.
+    Plans must not reference the function, because the cache is keyed weakly
+    by the function. The cache lives in the config stash, because the loop scope
+    of a function depends on the configuration of the session.
+    """
+
+    __slots__ = (
+        "bound_type",
+        "loop_scope",
+        "wants_event_loop",
+        "wants_request",
+    )
+
+    def __init__(self, func: Callable[..., Any]) -> None:
         try:
-            unbound, cls = func.__func__, type(func.__self__)  # type: ignore
+            bound_type: type | None = type(func.__self__)  # type: ignore[attr-defined]
         except AttributeError:
-            pass
+            bound_type = None
+        self.bound_type = bound_type
+        parameters = inspect.signature(func).parameters
+        self.wants_request = "request" in parameters
+        self.wants_event_loop = "event_loop" in parameters
+        self.loop_scope: _ScopeName | None = getattr(func, "_loop_scope", None)
+
+    def bind(self, func: _T, instance: Any | None) -> _T:
+        """Rebinds a fixture method to the instance of the current test, if needed."""
+        # The fixture needs to be bound to the actual request.instance
+        # so it is bound to the same object as the test method.
         # Only if the fixture was bound before to an instance of
         # the same type.
-        if cls is not None and isinstance(instance, cls):
-            func = unbound.__get__(instance)  # type: ignore
-    return func
+        if (
+            instance is not None
+            and self.bound_type is not None
+            and isinstance(instance, self.bound_type)
+        ):
+            return func.__func__.__get__(instance)  # type: ignore[attr-defined]
+        return func
 
+    def add_kwargs(
+        self,
+        kwargs: dict[str, Any],
+        event_loop: asyncio.AbstractEventLoop,
+        request: FixtureRequest,
+    ) -> dict[str, Any]:
+        if self.wants_request:
+            kwargs["request"] = request
+        if self.wants_event_loop:
+            kwargs["event_loop"] = event_loop
+        return kwargs
 
-def _wrap_asyncgen_fixture(fixturedef: FixtureDef) -> None:
+
+_call_plans = StashKey["weakref.WeakKeyDictionary[Callable[..., Any], _CallPlan]"]()
+
+
+def _get_call_plan(config: Config, func: Callable[..., Any]) -> _CallPlan:
+    call_plans = config.stash[_call_plans]
+    try:
+        return call_plans[func]
+    except KeyError:
+        plan = call_plans[func] = _CallPlan(func)
+        return plan
+    except TypeError:
+        # The function cannot be referenced weakly, e.g. a staticmethod object
+        return _CallPlan(func)
+
+
+def _wrap_asyncgen_fixture(config: Config, fixturedef: FixtureDef) -> None:
     fixture = fixturedef.func
+    plan = _get_call_plan(config, fixture)
 
     @functools.wraps(fixture)
     def _asyncgen_fixture_wrapper(request: FixtureRequest, **kwargs: Any):
-        func = _perhaps_rebind_fixture_func(fixture, request.instance)
+        func = plan.bind(fixture, request.instance)
         event_loop_fixture_id = _get_event_loop_fixture_id_for_async_fixture(
-            request, func
+            request, plan.loop_scope
         )
         event_loop = request.getfixturevalue(event_loop_fixture_id)
         kwargs.pop(event_loop_fixture_id, None)
-        gen_obj = func(**_add_kwargs(func, kwargs, event_loop, request))
+        gen_obj = cast(
+            AsyncIterator[Any], func(**plan.add_kwargs(kwargs, event_loop, request))
+        )
 
         async def setup():
-            res = await gen_obj.__anext__()  # type: ignore[union-attr]
+            res = await gen_obj.__anext__()
             return res
 
-        context = contextvars.copy_context()
-        setup_task = _create_task_in_context(event_loop, setup(), context)
-        result = event_loop.run_until_complete(setup_task)
+        shared_context = _get_shared_context(request.config, event_loop)
+        context = (
+            contextvars.copy_context() if shared_context is None else shared_context
+        )
+        timeout = _get_timeout(request._pyfuncitem)
+        with _instrument_fixture_phase(request, fixturedef, "setup"):
+            setup_task = _create_task_in_context(event_loop, setup(), context)
+            result = _run_until_complete(
+                event_loop, setup_task, timeout, f"Setup of {fixturedef.argname}"
+            )
 
-        reset_contextvars = _apply_contextvar_changes(context)
+        reset_contextvars = (
+            _apply_contextvar_changes(context) if shared_context is None else None
+        )
 
         def finalizer() -> None:
             """Yield again, to finalize."""
-
-            async def async_finalizer() -> None:
-                try:
-                    await gen_obj.__anext__()  # type: ignore[union-attr]
-                except StopAsyncIteration:
-                    pass
-                else:
-                    msg = "Async generator fixture didn't stop."
-                    msg += "Yield only once."
-                    raise ValueError(msg)
-
-            task = _create_task_in_context(event_loop, async_finalizer(), context)
-            event_loop.run_until_complete(task)
+            with _instrument_fixture_phase(request, fixturedef, "teardown"):
+                task = _create_task_in_context(
+                    event_loop, _finalize_async_generator(gen_obj), context
+                )
+                _run_until_complete(
+                    event_loop, task, timeout, f"Teardown of {fixturedef.argname}"
+                )
             if reset_contextvars is not None:
                 reset_contextvars()
 
@@ -370,25 +892,64 @@ def _wrap_asyncgen_fixture(fixturedef: FixtureDef) -> None:
     fixturedef.func = _asyncgen_fixture_wrapper  # type: ignore[misc]
 
 
-def _wrap_async_fixture(fixturedef: FixtureDef) -> None:
+async def _finalize_async_generator(gen_obj: AsyncIterator[Any]) -> None:
+    """Yield again, to finalize."""
+    try:
+        await gen_obj.__anext__()
+    except StopAsyncIteration:
+        pass
+    else:
+        msg = "Async generator fixture didn't stop."
+        msg += "Yield only once."
+        raise ValueError(msg)
+
+
+def _wrap_async_fixture(config: Config, fixturedef: FixtureDef) -> None:
     fixture = fixturedef.func
+    plan = _get_call_plan(config, fixture)
+    disk_cache_inputs: tuple[str, ...] | None = getattr(
+        fixture, "_disk_cache_inputs", None
+    )
 
     @functools.wraps(fixture)
     def _async_fixture_wrapper(request: FixtureRequest, **kwargs: Any):
-        func = _perhaps_rebind_fixture_func(fixture, request.instance)
+        snapshot_cache = request.config.stash.get(_snapshot_cache, None)
+        if disk_cache_inputs is None:
+            snapshot_cache = None
+        elif snapshot_cache is not None:
+            snapshot_key = snapshot_cache.key(request, fixture, disk_cache_inputs)
+            try:
+                return snapshot_cache.load(snapshot_key)
+            except KeyError:
+                pass
+        func = plan.bind(fixture, request.instance)
         event_loop_fixture_id = _get_event_loop_fixture_id_for_async_fixture(
-            request, func
+            request, plan.loop_scope
         )
         event_loop = request.getfixturevalue(event_loop_fixture_id)
         kwargs.pop(event_loop_fixture_id, None)
 
         async def setup():
-            res = await func(**_add_kwargs(func, kwargs, event_loop, request))
+            res = await func(**plan.add_kwargs(kwargs, event_loop, request))
             return res
 
-        context = contextvars.copy_context()
-        setup_task = _create_task_in_context(event_loop, setup(), context)
-        result = event_loop.run_until_complete(setup_task)
+        shared_context = _get_shared_context(request.config, event_loop)
+        context = (
+            contextvars.copy_context() if shared_context is None else shared_context
+        )
+        setup_start = time.perf_counter()
+        with _instrument_fixture_phase(request, fixturedef, "setup"):
+            setup_task = _create_task_in_context(event_loop, setup(), context)
+            result = _run_until_complete(
+                event_loop,
+                setup_task,
+                _get_timeout(request._pyfuncitem),
+                f"Setup of {fixturedef.argname}",
+            )
+        if snapshot_cache is not None:
+            snapshot_cache.store(
+                snapshot_key, result, time.perf_counter() - setup_start
+            )
 
         # Copy the context vars modified by the setup task into the current
         # context, and (if needed) add a finalizer to reset them.
@@ -398,88 +959,380 @@ def _wrap_async_fixture(fixturedef: FixtureDef) -> None:
         # to reset the variables. In this case, the author of the fixture can't
         # write such a finalizer because they have no way to capture the Context
         # in which the setup function was run, so we need to do it for them.
-        reset_contextvars = _apply_contextvar_changes(context)
-        if reset_contextvars is not None:
-            request.addfinalizer(reset_contextvars)
+        # When the event loop shares its context, the changes are already visible
+        # to the test.
+        if shared_context is None:
+            reset_contextvars = _apply_contextvar_changes(context)
+            if reset_contextvars is not None:
+                request.addfinalizer(reset_contextvars)
 
         return result
 
     fixturedef.func = _async_fixture_wrapper  # type: ignore[misc]
 
 
-def _get_event_loop_fixture_id_for_async_fixture(
-    request: FixtureRequest, func: Any
-) -> str:
-    default_loop_scope = request.config.getini("asyncio_default_fixture_loop_scope")
-    loop_scope = (
-        getattr(func, "_loop_scope", None) or default_loop_scope or request.scope
-    )
-    if loop_scope == "function":
-        event_loop_fixture_id = "event_loop"
-    else:
-        event_loop_node = _retrieve_scope_root(request._pyfuncitem, loop_scope)
-        event_loop_fixture_id = event_loop_node.stash.get(
-            # Type ignored because of non-optimal mypy inference.
-            _event_loop_fixture_id,  # type: ignore[arg-type]
-            "",
-        )
-    assert event_loop_fixture_id
-    return event_loop_fixture_id
+def _wrap_shared_resource(config: Config, fixturedef: FixtureDef) -> None:
+    fixture = fixturedef.func
+    plan = _get_call_plan(config, fixture)
 
+    @functools.wraps(fixture)
+    def _shared_resource_wrapper(request: FixtureRequest, **kwargs: Any):
+        func = plan.bind(fixture, request.instance)
+        policy = request.getfixturevalue(event_loop_policy.__name__)
+        owner = _BackgroundLoop(policy, f"pytest-asyncio {fixturedef.argname}")
+        timeout = _get_timeout(request._pyfuncitem)
+        try:
+            fixture_result = func(**plan.add_kwargs(kwargs, owner.loop, request))
+            setup: AbstractCoroutine[Any, Any, Any]
+            if inspect.isasyncgen(fixture_result):
+                gen_obj = fixture_result
+                setup = gen_obj.__anext__()
+            else:
+                gen_obj = None
+                # Shared resources are either async generators or coroutines
+                setup = cast(AbstractCoroutine[Any, Any, Any], fixture_result)
+            with _trace(request.config, f"setup {fixturedef.argname}", "fixture"):
+                resource = owner.run(setup, timeout, f"Setup of {fixturedef.argname}")
+        except BaseException:
+            owner.close()
+            raise
 
-def _create_task_in_context(
-    loop: asyncio.AbstractEventLoop,
-    coro: AbstractCoroutine[Any, Any, _T],
-    context: contextvars.Context,
-) -> asyncio.Task[_T]:
-    """
-    Return an asyncio task that runs the coro in the specified context,
-    if possible.
+        def finalizer() -> None:
+            try:
+                if gen_obj is not None:
+                    with _trace(
+                        request.config, f"teardown {fixturedef.argname}", "fixture"
+                    ):
+                        owner.run(
+                            _finalize_async_generator(gen_obj),
+                            timeout,
+                            f"Teardown of {fixturedef.argname}",
+                        )
+            finally:
+                owner.close()
 
-    This allows fixture setup and teardown to be run as separate asyncio tasks,
-    while still being able to use context-manager idioms to maintain context
-    variables and make those variables visible to test functions.
+        request.addfinalizer(finalizer)
+        return SharedResource(resource, owner.loop)
 
-    This is only fully supported on Python 3.11 and newer, as it requires
-    the API added for https://github.com/python/cpython/issues/91150.
-    On earlier versions, the returned task will use the default context instead.
-    """
-    try:
-        return loop.create_task(coro, context=context)
-    except TypeError:
-        return loop.create_task(coro)
+    fixturedef.func = _shared_resource_wrapper  # type: ignore[misc]
 
 
-def _apply_contextvar_changes(
-    context: contextvars.Context,
-) -> Callable[[], None] | None:
-    """
-    Copy contextvar changes from the given context to the current context.
+class _BackgroundLoop:
+    """An event loop that runs in a daemon thread until it is closed."""
 
-    If any contextvars were modified by the fixture, return a finalizer that
-    will restore them.
-    """
-    context_tokens = []
-    for var in context:
+    def __init__(self, policy: AbstractEventLoopPolicy, name: str) -> None:
+        self.loop = policy.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(
+        self,
+        coro: AbstractCoroutine[Any, Any, _T],
+        timeout: float | None,
+        description: str,
+    ) -> _T:
+        """Runs the coroutine in the loop and waits for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
         try:
-            if var.get() is context.get(var):
-                # This variable is not modified, so leave it as-is.
-                continue
-        except LookupError:
-            # This variable isn't yet set in the current context at all.
-            pass
-        token = var.set(context.get(var))
-        context_tokens.append((var, token))
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            pytest.fail(f"{description} timed out after {timeout:g}s.", pytrace=False)
 
-    if not context_tokens:
-        return None
+    def close(self) -> None:
+        try:
+            self.run(self._shutdown(), None, "Shutdown")
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
 
-    def restore_contextvars():
-        while context_tokens:
-            (var, token) = context_tokens.pop()
-            var.reset(token)
+    async def _shutdown(self) -> None:
+        """Cancels the tasks that are left in the loop and closes async generators."""
+        current_task = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current_task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.loop.shutdown_asyncgens()
 
-    return restore_contextvars
+
+class SharedResource(Generic[_T]):
+    """
+    Proxy for the value of a shared resource fixture.
+
+    The value belongs to an event loop in a background thread. Calling a method of
+    the proxy runs the method in that event loop and returns an awaitable of the
+    result, which can be awaited in any other event loop. Other attributes are read
+    from the value directly.
+    """
+
+    __slots__ = ("_loop", "_resource")
+
+    def __init__(self, resource: _T, loop: AbstractEventLoop) -> None:
+        self._resource = resource
+        self._loop = loop
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._resource, name)
+        if not callable(attribute):
+            return attribute
+        return functools.partial(self._call, attribute)
+
+    def __repr__(self) -> str:
+        return f"<SharedResource {self._resource!r}>"
+
+    async def run_in_loop(
+        self, func: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Runs func(resource, *args, **kwargs) in the event loop of the resource.
+
+        This allows to use the resource in ways that are not plain method calls,
+        for example as an async context manager.
+        """
+        return await self._call(func, self._resource, *args, **kwargs)
+
+    async def _call(
+        self, func: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Any:
+        async def call() -> Any:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        future = asyncio.run_coroutine_threadsafe(call(), self._loop)
+        return await asyncio.wrap_future(future)
+
+
+def _get_event_loop_fixture_id_for_async_fixture(
+    request: FixtureRequest, loop_scope: _ScopeName | None
+) -> str:
+    if loop_scope is None:
+        loop_scope = (
+            request.config.getini("asyncio_default_fixture_loop_scope") or request.scope
+        )
+    event_loop_fixture_id = _get_event_loop_fixture_id(request._pyfuncitem, loop_scope)
+    assert event_loop_fixture_id
+    return event_loop_fixture_id
+
+
+class _SnapshotCache:
+    """
+    Stores the results of async fixtures declared with cache="disk" on disk.
+
+    Results are keyed by the source code of the fixture function, the index of
+    the fixture parameter and the contents of the declared input files. When the
+    total size of the stored results exceeds the limit, the least recently used
+    results are evicted. The directory is only created once a fixture with
+    cache="disk" is evaluated.
+    """
+
+    def __init__(self, make_directory: Callable[[], Path], max_size: int) -> None:
+        self._make_directory = make_directory
+        self._directory: Path | None = None
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._directory = self._make_directory()
+        return self._directory
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._directory = None
+
+    def key(
+        self,
+        request: FixtureRequest,
+        func: Callable[..., Any],
+        inputs: Iterable[str],
+    ) -> str:
+        func = getattr(func, "__func__", func)
+        digest = hashlib.sha256()
+        digest.update(f"{func.__module__}.{func.__qualname__}".encode())
+        try:
+            digest.update(inspect.getsource(func).encode())
+        except OSError:
+            digest.update(func.__code__.co_code)
+        # Unlike the repr of a parameter, which may contain its address, the index
+        # is the same in every test run
+        digest.update(str(getattr(request, "param_index", 0)).encode())
+        for input_path in inputs:
+            path = request.config.rootpath / input_path
+            digest.update(str(path).encode())
+            try:
+                digest.update(path.read_bytes())
+            except FileNotFoundError:
+                digest.update(b"<missing>")
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Any:
+        """Returns the stored result, or raises KeyError if there is none."""
+        path = self.directory / f"{key}.pickle"
+        try:
+            with path.open("rb") as snapshot:
+                duration, value = pickle.load(snapshot)
+            # The modification time serves as the time of last use for eviction
+            os.utime(path)
+        except Exception as e:
+            # Missing, corrupt and outdated snapshots are treated alike
+            self.misses += 1
+            raise KeyError(key) from e
+        self.hits += 1
+        self.time_saved += duration
+        return value
+
+    def store(self, key: str, value: Any, duration: float) -> None:
+        try:
+            data = pickle.dumps((duration, value))
+        except Exception as e:
+            warnings.warn(
+                pytest.PytestWarning(
+                    f"The result of a fixture with cache='disk' cannot be stored: {e}"
+                )
+            )
+            return
+        path = self.directory / f"{key}.pickle"
+        partial_path = path.with_suffix(f".{os.getpid()}.partial")
+        partial_path.write_bytes(data)
+        os.replace(partial_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        snapshots = []
+        for path in self.directory.glob("*.pickle"):
+            with contextlib.suppress(FileNotFoundError):
+                snapshots.append((path.stat(), path))
+        total_size = sum(stat.st_size for stat, _ in snapshots)
+        for stat, path in sorted(snapshots, key=lambda snapshot: snapshot[0].st_mtime):
+            if total_size <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            total_size -= stat.st_size
+
+
+_snapshot_cache = StashKey[_SnapshotCache]()
+
+
+# The coroutine that pytest-asyncio is wrapping in a task of its own
+_plugin_coroutine: contextvars.ContextVar[object] = contextvars.ContextVar(
+    "pytest_asyncio_plugin_coroutine", default=None
+)
+
+
+@contextlib.contextmanager
+def _creating_plugin_task(coro: Awaitable[Any]) -> Iterator[None]:
+    """
+    Marks the task that wraps the coroutine as a task of pytest-asyncio.
+
+    The mark is based on the identity of the coroutine, so that tasks created by
+    the coroutine itself are not marked, even though they inherit the context.
+    """
+    token = _plugin_coroutine.set(coro)
+    try:
+        yield
+    finally:
+        _plugin_coroutine.reset(token)
+
+
+def _is_plugin_task(task: asyncio.Task[Any]) -> bool:
+    return task.get_coro() is _plugin_coroutine.get()
+
+
+def _create_task_in_context(
+    loop: asyncio.AbstractEventLoop,
+    coro: AbstractCoroutine[Any, Any, _T],
+    context: contextvars.Context,
+) -> asyncio.Task[_T]:
+    """
+    Return an asyncio task that runs the coro in the specified context,
+    if possible.
+
+    This allows fixture setup and teardown to be run as separate asyncio tasks,
+    while still being able to use context-manager idioms to maintain context
+    variables and make those variables visible to test functions.
+
+    This is only fully supported on Python 3.11 and newer, as it requires
+    the API added for https://github.com/python/cpython/issues/91150.
+    On earlier versions, the returned task will use the default context instead.
+    """
+    with _creating_plugin_task(coro):
+        try:
+            return loop.create_task(coro, context=context)
+        except TypeError:
+            return loop.create_task(coro)
+
+
+def _apply_contextvar_changes(
+    context: contextvars.Context,
+) -> Callable[[], None] | None:
+    """
+    Copy contextvar changes from the given context to the current context.
+
+    If any contextvars were modified by the fixture, return a finalizer that
+    will restore them.
+    """
+    context_tokens = []
+    for var in context:
+        try:
+            if var.get() is context.get(var):
+                # This variable is not modified, so leave it as-is.
+                continue
+        except LookupError:
+            # This variable isn't yet set in the current context at all.
+            pass
+        token = var.set(context.get(var))
+        context_tokens.append((var, token))
+
+    if not context_tokens:
+        return None
+
+    def restore_contextvars():
+        while context_tokens:
+            (var, token) = context_tokens.pop()
+            var.reset(token)
+
+    return restore_contextvars
+
+
+class _SharedContexts:
+    """Owns the single context in which async fixtures and tests of a loop run."""
+
+    def __init__(self) -> None:
+        self._contexts: weakref.WeakKeyDictionary[
+            AbstractEventLoop, contextvars.Context
+        ] = weakref.WeakKeyDictionary()
+
+    def for_loop(self, loop: AbstractEventLoop) -> contextvars.Context:
+        try:
+            return self._contexts[loop]
+        except KeyError:
+            context = self._contexts[loop] = contextvars.copy_context()
+            return context
+
+
+_shared_contexts = StashKey[_SharedContexts]()
+
+
+def _get_shared_context(
+    config: Config, loop: AbstractEventLoop
+) -> contextvars.Context | None:
+    """Returns the context shared by the specified loop, if contexts are shared."""
+    shared_contexts = config.stash.get(_shared_contexts, None)
+    if shared_contexts is None:
+        return None
+    return shared_contexts.for_loop(loop)
 
 
 class PytestAsyncioFunction(Function):
@@ -516,8 +1369,12 @@ class PytestAsyncioFunction(Function):
         )
         subclass_instance.own_markers = function.own_markers
         assert subclass_instance.own_markers == function.own_markers
-        subclassed_function_signature = inspect.signature(subclass_instance.obj)
-        if "event_loop" in subclassed_function_signature.parameters:
+        # Test methods are bound to a new instance for each item, so the plan
+        # is looked up for the underlying function
+        test_function = getattr(
+            subclass_instance.obj, "__func__", subclass_instance.obj
+        )
+        if _get_call_plan(function.config, test_function).wants_event_loop:
             subclass_instance.warn(
                 PytestDeprecationWarning(
                     f"{subclass_instance.name} is asynchronous and explicitly "
@@ -532,6 +1389,23 @@ class PytestAsyncioFunction(Function):
         """Returns whether the specified function can be replaced by this class"""
         raise NotImplementedError()
 
+    def runtest(self) -> None:
+        budget = _TestBudget.for_item(self)
+        lag_monitor = self.config.stash.get(_lag_monitor, None)
+        if lag_monitor is None and budget is not None and budget.max_lag is not None:
+            lag_monitor = self.config.stash[_lag_monitor] = _LagMonitor(report=False)
+        if budget is None and lag_monitor is None:
+            super().runtest()
+            return
+        loop = _get_item_event_loop(self)
+        with contextlib.ExitStack() as stack:
+            lag = None
+            if lag_monitor is not None:
+                lag = stack.enter_context(lag_monitor.measuring_item(self, loop))
+            if budget is not None:
+                stack.enter_context(budget.enforce(self, loop, lag))
+            super().runtest()
+
 
 class Coroutine(PytestAsyncioFunction):
     """Pytest item created by a coroutine"""
@@ -544,7 +1418,10 @@ class Coroutine(PytestAsyncioFunction):
     def runtest(self) -> None:
         self.obj = wrap_in_sync(
             # https://github.com/pytest-dev/pytest-asyncio/issues/596
-            self.obj,  # type: ignore[has-type]
+            _LoadTest.apply(self, self.obj),  # type: ignore[has-type]
+            self.config.stash.get(_shared_contexts, None),
+            _get_item_event_loop(self),
+            _get_timeout(self),
         )
         super().runtest()
 
@@ -587,7 +1464,10 @@ class AsyncStaticMethod(PytestAsyncioFunction):
     def runtest(self) -> None:
         self.obj = wrap_in_sync(
             # https://github.com/pytest-dev/pytest-asyncio/issues/596
-            self.obj,  # type: ignore[has-type]
+            _LoadTest.apply(self, self.obj),  # type: ignore[has-type]
+            self.config.stash.get(_shared_contexts, None),
+            _get_item_event_loop(self),
+            _get_timeout(self),
         )
         super().runtest()
 
@@ -610,11 +1490,191 @@ class AsyncHypothesisTest(PytestAsyncioFunction):
     def runtest(self) -> None:
         self.obj.hypothesis.inner_test = wrap_in_sync(
             self.obj.hypothesis.inner_test,
+            self.config.stash.get(_shared_contexts, None),
+            _get_item_event_loop(self),
+            _get_timeout(self),
         )
         super().runtest()
 
 
-_HOLDER: set[FixtureDef] = set()
+class IsolatedAsyncioTestCaseFunction(PytestAsyncioFunction):
+    """Pytest item created by a test method of unittest.IsolatedAsyncioTestCase"""
+
+    @staticmethod
+    def _can_substitute(item: Function) -> bool:
+        # Avoid importing unittest if it has not been imported by the test suite
+        unittest = sys.modules.get("unittest")
+        if unittest is None:
+            return False
+        cls = getattr(item.parent, "obj", None)
+        return isinstance(cls, type) and issubclass(
+            cls, unittest.IsolatedAsyncioTestCase
+        )
+
+    @classmethod
+    def _from_function(cls, function: Function, /) -> Function:
+        # The unittest item keeps its own behaviour, because unittest drives the
+        # setUp and tearDown methods of the test case. The item is created like
+        # the unittest plugin creates it.
+        assert function.get_closest_marker("asyncio")
+        item_class = _with_item_class(cls, type(function))
+        subclass_instance = item_class.from_parent(function.parent, name=function.name)
+        subclass_instance.own_markers = function.own_markers
+        return subclass_instance
+
+    def runtest(self) -> None:
+        loop = _get_item_event_loop(self)
+        runner = _TestCaseRunner(loop, _get_timeout(self))
+        runner.install(self.instance, _get_shared_context(self.config, loop))
+        # IsolatedAsyncioTestCase runs its coroutines in debug mode. The loop
+        # may be shared with other tests, so its setting is restored afterwards.
+        debug = loop.get_debug()
+        loop.set_debug(True)
+        try:
+            super().runtest()
+        finally:
+            loop.set_debug(debug)
+
+
+@functools.cache
+def _with_item_class(item_class: type[_F], base: type[Function]) -> type[_F]:
+    """Returns a subclass of item_class that inherits the methods of base."""
+    if issubclass(item_class, base):
+        return item_class
+    return type(item_class.__name__, (item_class, base), {"__module__": __name__})
+
+
+class _TestCaseRunner:
+    """
+    Runs the coroutines of an IsolatedAsyncioTestCase in a pytest-asyncio loop.
+
+    The runner takes the place of the asyncio.Runner (Python 3.11 and newer) or the
+    event loop (earlier versions) that the test case would otherwise create and
+    close for every test. It replaces private members of IsolatedAsyncioTestCase,
+    which have only been checked against the Python versions below.
+    """
+
+    _tested_versions = ((3, 9), (3, 10), (3, 11), (3, 12), (3, 13))
+    if sys.version_info >= (3, 11):
+        _replaced_members: tuple[str, ...] = (
+            "_setupAsyncioRunner",
+            "_tearDownAsyncioRunner",
+            "_callAsync",
+            "_callMaybeAsync",
+        )
+    else:
+        _replaced_members = (
+            "_setupAsyncioLoop",
+            "_tearDownAsyncioLoop",
+            "_callAsync",
+            "_callMaybeAsync",
+        )
+
+    def __init__(self, loop: AbstractEventLoop, timeout: float | None) -> None:
+        self._loop = loop
+        self._timeout = timeout
+
+    @classmethod
+    def supports(cls, testcase_class: object) -> bool:
+        """Returns whether the runner can take over the specified test case."""
+        return sys.version_info[:2] in cls._tested_versions and all(
+            callable(getattr(testcase_class, name, None))
+            for name in cls._replaced_members
+        )
+
+    def get_loop(self) -> AbstractEventLoop:
+        return self._loop
+
+    def run(
+        self,
+        coro: AbstractCoroutine[Any, Any, _T],
+        *,
+        context: contextvars.Context | None = None,
+    ) -> _T:
+        if context is None:
+            with _creating_plugin_task(coro):
+                task = self._loop.create_task(coro)
+        else:
+            task = _create_task_in_context(self._loop, coro, context)
+        try:
+            return _run_until_complete(self._loop, task, self._timeout, "The test")
+        except BaseException:
+            # Consume the exception to prevent asyncio's warning from logging
+            if task.done() and not task.cancelled():
+                task.exception()
+            raise
+
+    def install(
+        self, testcase: Any, shared_context: contextvars.Context | None
+    ) -> None:
+        """Makes the test case run its coroutines with this runner."""
+        if sys.version_info >= (3, 11):
+            if shared_context is not None:
+                testcase._asyncioTestContext = shared_context
+            testcase._setupAsyncioRunner = functools.partial(
+                setattr, testcase, "_asyncioRunner", self
+            )
+            testcase._tearDownAsyncioRunner = functools.partial(
+                setattr, testcase, "_asyncioRunner", None
+            )
+            return
+        context = (
+            contextvars.copy_context() if shared_context is None else shared_context
+        )
+
+        def call_maybe_async(func, /, *args, **kwargs):
+            if inspect.iscoroutinefunction(func):
+                return self.run(func(*args, **kwargs), context=context)
+            return context.run(func, *args, **kwargs)
+
+        testcase._setupAsyncioLoop = functools.partial(
+            setattr, testcase, "_asyncioTestLoop", self._loop
+        )
+        testcase._tearDownAsyncioLoop = functools.partial(
+            setattr, testcase, "_asyncioTestLoop", None
+        )
+        testcase._callAsync = call_maybe_async
+        testcase._callMaybeAsync = call_maybe_async
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(
+    session: Session, config: Config, items: list[Item]
+) -> None:
+    """
+    Replaces the test methods of unittest.IsolatedAsyncioTestCase that are marked
+    with pytest.mark.asyncio by pytest-asyncio items.
+
+    Unittest items are created by the unittest plugin rather than by the
+    pytest_pycollect_makeitem hook, so they are replaced once all items have been
+    collected. Unmarked test cases are left to unittest, even in auto mode.
+    """
+    for index, item in enumerate(items):
+        if (
+            type(item) is Function
+            or not isinstance(item, Function)
+            or isinstance(item, PytestAsyncioFunction)
+            or not IsolatedAsyncioTestCaseFunction._can_substitute(item)
+        ):
+            continue
+        if not item.get_closest_marker("asyncio"):
+            continue
+        if not _TestCaseRunner.supports(getattr(item.parent, "obj", None)):
+            item.warn(
+                PytestCollectionWarning(
+                    f"{item.name} is left to unittest, because pytest-asyncio does "
+                    f"not support unittest.IsolatedAsyncioTestCase on Python "
+                    f"{sys.version_info[0]}.{sys.version_info[1]}."
+                )
+            )
+            continue
+        if _is_dormant(config):
+            _activate(config, item)
+        items[index] = IsolatedAsyncioTestCaseFunction._from_function(item)
+
+
+# The async fixtures that have been wrapped by _preprocess_async_fixtures
+_processed_fixturedefs = StashKey["weakref.WeakSet[FixtureDef]"]()
 
 
 # The function name needs to start with "pytest_"
@@ -624,9 +1684,15 @@ def pytest_pycollect_makeitem_preprocess_async_fixtures(
     collector: pytest.Module | pytest.Class, name: str, obj: object
 ) -> pytest.Item | pytest.Collector | list[pytest.Item | pytest.Collector] | None:
     """A pytest hook to collect asyncio coroutines."""
+    if _is_dormant(collector.config):
+        if not _requires_asyncio(obj):
+            return None
+        _activate(collector.config, collector)
     if not collector.funcnamefilter(name):
         return None
-    _preprocess_async_fixtures(collector, _HOLDER)
+    _preprocess_async_fixtures(
+        collector, collector.config.stash[_processed_fixturedefs]
+    )
     return None
 
 
@@ -641,6 +1707,8 @@ def pytest_pycollect_makeitem_convert_async_functions_to_subclass(
     to AsyncFunction items.
     """
     hook_result = yield
+    if _is_dormant(collector.config):
+        return
     try:
         node_or_list_of_nodes: (
             pytest.Item | pytest.Collector | list[pytest.Item | pytest.Collector] | None
@@ -656,21 +1724,26 @@ def pytest_pycollect_makeitem_convert_async_functions_to_subclass(
         # Treat single node as a single-element iterable
         node_iterator = iter((node_or_list_of_nodes,))
     updated_node_collection = []
+    # All Function items produced by a single hook call are parametrizations of
+    # the same test function, so the specialized class is looked up only once
+    specialized_item_class: type[PytestAsyncioFunction] | None = None
     for node in node_iterator:
         updated_item = node
         if isinstance(node, Function):
-            specialized_item_class = PytestAsyncioFunction.item_subclass_for(node)
-            if specialized_item_class:
-                if _get_asyncio_mode(
-                    node.config
-                ) == Mode.AUTO and not node.get_closest_marker("asyncio"):
-                    node.add_marker("asyncio")
-                if node.get_closest_marker("asyncio"):
-                    updated_item = specialized_item_class._from_function(node)
+            if specialized_item_class is None:
+                specialized_item_class = PytestAsyncioFunction.item_subclass_for(node)
+                if specialized_item_class is None:
+                    return
+                auto_mode = _get_asyncio_mode(node.config) == Mode.AUTO
+            if auto_mode and not node.get_closest_marker("asyncio"):
+                node.add_marker("asyncio")
+            if node.get_closest_marker("asyncio"):
+                updated_item = specialized_item_class._from_function(node)
         updated_node_collection.append(updated_item)
     hook_result.force_result(updated_node_collection)
 
 
+# The name of the event loop fixture provided by a collector or used by a test item
 _event_loop_fixture_id = StashKey[str]()
 _fixture_scope_by_collector_type: Mapping[type[pytest.Collector], _ScopeName] = {
     Class: "class",
@@ -681,20 +1754,34 @@ _fixture_scope_by_collector_type: Mapping[type[pytest.Collector], _ScopeName] =
     Session: "session",
 }
 
+
+def _get_event_loop_fixture_id(node: Collector | Item, scope: _ScopeName) -> str | None:
+    """Returns the name of the event loop fixture with the specified scope."""
+    if scope == "function":
+        return "event_loop"
+    return _retrieve_scope_root(node, scope).stash.get(_event_loop_fixture_id, None)
+
+
 # A stack used to push package-scoped loops during collection of a package
 # and pop those loops during collection of a Module
-__package_loop_stack: list[Callable[..., Any]] = []
+_package_loop_stack = StashKey[list[Callable[..., Any]]]()
 
 
-@pytest.hookimpl
-def pytest_collectstart(collector: pytest.Collector) -> None:
+def _get_collector_scope(collector: Collector) -> _ScopeName | None:
     try:
-        collector_scope = next(
+        return next(
             scope
             for cls, scope in _fixture_scope_by_collector_type.items()
             if isinstance(collector, cls)
         )
     except StopIteration:
+        return None
+
+
+@pytest.hookimpl
+def pytest_collectstart(collector: pytest.Collector) -> None:
+    collector_scope = _get_collector_scope(collector)
+    if collector_scope is None:
         return
     # Session is not a PyCollector type, so it doesn't have a corresponding
     # "obj" attribute to attach a dynamic fixture function to.
@@ -705,6 +1792,9 @@ def pytest_collectstart(collector: pytest.Collector) -> None:
         event_loop_fixture_id = _session_event_loop.__name__
         collector.stash[_event_loop_fixture_id] = event_loop_fixture_id
         return
+    if _is_dormant(collector.config):
+        # The event loop fixture is registered once the plugin is activated
+        return
     # There seem to be issues when a fixture is shadowed by another fixture
     # and both differ in their params.
     # https://github.com/pytest-dev/pytest/issues/2043
@@ -714,22 +1804,10 @@ def pytest_collectstart(collector: pytest.Collector) -> None:
     # be injected when setting up the test
     event_loop_fixture_id = f"{collector.nodeid}::<event_loop>"
     collector.stash[_event_loop_fixture_id] = event_loop_fixture_id
-
-    @pytest.fixture(
+    scoped_event_loop = pytest.fixture(
         scope=collector_scope,
         name=event_loop_fixture_id,
-    )
-    def scoped_event_loop(
-        *args,  # Function needs to accept "cls" when collected by pytest.Class
-        event_loop_policy,
-    ) -> Iterator[asyncio.AbstractEventLoop]:
-        new_loop_policy = event_loop_policy
-        with (
-            _temporary_event_loop_policy(new_loop_policy),
-            _provide_event_loop() as loop,
-        ):
-            asyncio.set_event_loop(loop)
-            yield loop
+    )(_create_scoped_event_loop_fixture())
 
     # @pytest.fixture does not register the fixture anywhere, so pytest doesn't
     # know it exists. We work around this by attaching the fixture function to the
@@ -740,7 +1818,7 @@ def pytest_collectstart(collector: pytest.Collector) -> None:
         # for the package-scoped event loop is added to a stack. When a module inside
         # the package is collected, the module will attach the fixture to its
         # Python object.
-        __package_loop_stack.append(scoped_event_loop)
+        collector.config.stash[_package_loop_stack].append(scoped_event_loop)
     elif isinstance(collector, Module):
         # Accessing Module.obj triggers a module import executing module-level
         # statements. A module-level pytest.skip statement raises the "Skipped"
@@ -752,10 +1830,16 @@ def pytest_collectstart(collector: pytest.Collector) -> None:
         def _patched_collect():
             # If the collected module is a DoctestTextfile, collector.obj is None
             module = collector.obj
-            if module is not None:
+            if module is None:
+                # DoctestTextfiles have no module that could carry the fixture.
+                # The loop is still needed for doctests that use top-level await.
+                _register_fixture_plugin(
+                    collector.config, event_loop_fixture_id, scoped_event_loop
+                )
+            else:
                 module.__pytest_asyncio_scoped_event_loop = scoped_event_loop
                 try:
-                    package_loop = __package_loop_stack.pop()
+                    package_loop = collector.config.stash[_package_loop_stack].pop()
                     module.__pytest_asyncio_package_scoped_event_loop = package_loop
                 except IndexError:
                     pass
@@ -767,6 +1851,93 @@ def pytest_collectstart(collector: pytest.Collector) -> None:
         collector.obj.__pytest_asyncio_scoped_event_loop = scoped_event_loop
 
 
+def _create_scoped_event_loop_fixture() -> Callable[..., Iterator[AbstractEventLoop]]:
+    def scoped_event_loop(
+        *args,  # Function needs to accept "cls" when collected by pytest.Class
+        event_loop_policy,
+        request: FixtureRequest,
+    ) -> Iterator[asyncio.AbstractEventLoop]:
+        new_loop_policy = event_loop_policy
+        with _provide_fixture_event_loop(request, new_loop_policy) as loop:
+            asyncio.set_event_loop(loop)
+            yield loop
+
+    return scoped_event_loop
+
+
+# Set while a lazily activated plugin has not seen any asyncio code
+_dormant = StashKey[bool]()
+
+
+def _is_dormant(config: Config) -> bool:
+    return config.stash.get(_dormant, False)
+
+
+def _requires_asyncio(obj: object) -> bool:
+    """Returns whether a collected object is async code or marked with asyncio."""
+    func = getattr(obj, "__func__", obj)
+    # Fixture definitions wrap the fixture function on pytest 8.4 and newer
+    func = getattr(func, "__wrapped__", func)
+    func = getattr(getattr(func, "hypothesis", None), "inner_test", func)
+    if _is_coroutine_or_asyncgen(func):
+        return True
+    marks = getattr(obj, "pytestmark", None)
+    return isinstance(marks, list) and any(mark.name == "asyncio" for mark in marks)
+
+
+def _activate(config: Config, node: Collector | Item) -> None:
+    """
+    Activates a dormant plugin.
+
+    Collectors that were collected while the plugin was dormant have no event loop
+    fixtures. pytest has already parsed them for fixture definitions, so the event
+    loop fixtures of the collectors containing node are provided by plugins.
+    """
+    config.stash[_dormant] = False
+    _register_autouse_event_loop_policy(config)
+    for collector in node.listchain():
+        if not isinstance(collector, Collector):
+            continue
+        collector_scope = _get_collector_scope(collector)
+        if collector_scope is None or _event_loop_fixture_id in collector.stash:
+            continue
+        event_loop_fixture_id = f"{collector.nodeid}::<event_loop>"
+        collector.stash[_event_loop_fixture_id] = event_loop_fixture_id
+        _register_fixture_plugin(
+            config,
+            event_loop_fixture_id,
+            pytest.fixture(scope=collector_scope, name=event_loop_fixture_id)(
+                _create_scoped_event_loop_fixture()
+            ),
+        )
+
+
+def _register_fixture_plugin(
+    config: Config, name: str, fixture: Callable[..., object]
+) -> None:
+    """
+    Provides the fixture to all tests by registering a plugin that defines it.
+
+    pytest parses the fixtures of plugins when they are registered, so the fixture
+    is available even to tests whose modules have already been collected.
+    """
+    plugin = types.ModuleType(f"pytest_asyncio.<{name}>")
+    # pytest uses the attribute name, unless the fixture is named explicitly
+    setattr(plugin, name, fixture)
+    config.pluginmanager.register(plugin)
+
+
+def _register_autouse_event_loop_policy(config: Config) -> None:
+    """Makes all tests that are collected from now on use the event_loop_policy."""
+
+    @pytest.fixture(scope="session", autouse=True)
+    def event_loop_policy() -> AbstractEventLoopPolicy:
+        """Return an instance of the policy used to create asyncio event loops."""
+        return asyncio.get_event_loop_policy()
+
+    _register_fixture_plugin(config, "event_loop_policy", event_loop_policy)
+
+
 @contextlib.contextmanager
 def _temporary_event_loop_policy(policy: AbstractEventLoopPolicy) -> Iterator[None]:
     old_loop_policy = asyncio.get_event_loop_policy()
@@ -859,9 +2030,16 @@ def pytest_generate_tests(metafunc: Metafunc) -> None:
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_fixture_setup(
-    fixturedef: FixtureDef,
+    fixturedef: FixtureDef, request: FixtureRequest
 ) -> Generator[None, pluggy.Result, None]:
     """Adjust the event loop policy when an event loop is produced."""
+    if _is_dormant(request.config) and _is_coroutine_or_asyncgen(fixturedef.func):
+        # An async fixture that was not seen during collection, for example
+        # a conftest fixture requested by a synchronous test
+        _activate(request.config, request.node)
+        _preprocess_async_fixtures(
+            request.node, request.config.stash[_processed_fixturedefs]
+        )
     if fixturedef.argname == "event_loop":
         # The use of a fixture finalizer is preferred over the
         # pytest_fixture_post_finalizer hook. The fixture finalizer is invoked once
@@ -988,39 +2166,1409 @@ def _provide_clean_event_loop() -> None:
 def _get_event_loop_no_warn(
     policy: AbstractEventLoopPolicy | None = None,
 ) -> asyncio.AbstractEventLoop:
+    if policy is None:
+        # A running loop is returned without consulting the policy,
+        # so there is no deprecation warning to suppress
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            policy = asyncio.get_event_loop_policy()
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", DeprecationWarning)
-        if policy is not None:
-            return policy.get_event_loop()
-        else:
-            return asyncio.get_event_loop()
+        return policy.get_event_loop()
 
 
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_pyfunc_call(pyfuncitem: Function) -> object | None:
+_LEFTOVER_RESOURCES_REPORT = """\
+pytest-asyncio detected asyncio resources that were created by {nodeid} \
+and are still alive after the test finished:
+{resources}
+Make sure the test awaits or cancels its tasks and closes its transports, \
+or set asyncio_leak_policy to "cancel" to clean them up automatically.
+"""
+
+
+class _LeakTracker:
     """
-    Pytest hook called before a test case is run.
+    Attributes asyncio tasks, timers, transports and subprocesses to the test
+    that created them.
 
-    Wraps marked tests in a synchronous function
-    where the wrapped test coroutine is executed in an event loop.
+    Resources are referenced weakly, so the accounting does not keep finished
+    tasks or closed transports alive.
     """
-    if pyfuncitem.get_closest_marker("asyncio") is not None:
-        if isinstance(pyfuncitem, PytestAsyncioFunction):
-            asyncio_mode = _get_asyncio_mode(pyfuncitem.config)
-            for fixname, fixtures in pyfuncitem._fixtureinfo.name2fixturedefs.items():
-                # name2fixturedefs is a dict between fixture name and a list of matching
-                # fixturedefs. The last entry in the list is closest and the one used.
-                func = fixtures[-1].func
-                if (
-                    asyncio_mode == Mode.STRICT
-                    and _is_coroutine_or_asyncgen(func)
-                    and not _is_asyncio_fixture_function(func)
-                ):
-                    warnings.warn(
-                        PytestDeprecationWarning(
-                            f"asyncio test {pyfuncitem.name!r} requested async "
-                            "@pytest.fixture "
-                            f"{fixname!r} in strict mode. "
+
+    _TRANSPORT_FACTORIES = (
+        "_make_socket_transport",
+        "_make_ssl_transport",
+        "_make_datagram_transport",
+        "_make_read_pipe_transport",
+        "_make_write_pipe_transport",
+    )
+
+    def __init__(self, policy: LeakPolicy) -> None:
+        self.policy = policy
+        self.owner: str | None = None
+        self._owners: weakref.WeakKeyDictionary[Any, str] = weakref.WeakKeyDictionary()
+        # Descriptions of resources found on loops that were closed
+        # before their owner finished
+        self._closed_loop_leftovers: dict[str, list[str]] = {}
+
+    @contextlib.contextmanager
+    def owned_by(self, owner: str | None) -> Iterator[None]:
+        """Attributes resources created inside the context to the specified node."""
+        previous_owner = self.owner
+        self.owner = owner
+        try:
+            yield
+        finally:
+            self.owner = previous_owner
+
+    def _record(self, resource: _T) -> _T:
+        if self.owner is not None:
+            self._owners[resource] = self.owner
+        return resource
+
+    def install(self, loop: AbstractEventLoop) -> None:
+        _chain_task_factory(loop, self._record)
+        # Loops implemented as extension types (e.g. uvloop) do not allow
+        # overriding methods on the instance. Only tasks are tracked for those.
+        with contextlib.suppress(AttributeError):
+            loop.call_at = self._tracked(loop.call_at)  # type: ignore[method-assign]
+            for name in self._TRANSPORT_FACTORIES:
+                make_transport = getattr(loop, name, None)
+                if make_transport is not None:
+                    setattr(loop, name, self._tracked(make_transport))
+            make_subprocess_transport = getattr(
+                loop, "_make_subprocess_transport", None
+            )
+            if make_subprocess_transport is not None:
+
+                @functools.wraps(make_subprocess_transport)
+                async def tracked_make_subprocess_transport(*args, **kwargs):
+                    transport = await make_subprocess_transport(*args, **kwargs)
+                    return self._record(transport)
+
+                loop._make_subprocess_transport = (  # type: ignore[attr-defined]
+                    tracked_make_subprocess_transport
+                )
+
+    def _tracked(self, factory: Callable[_P, _T]) -> Callable[_P, _T]:
+        @functools.wraps(factory)
+        def tracked_factory(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+            return self._record(factory(*args, **kwargs))
+
+        return tracked_factory
+
+    def _pop_leftovers(
+        self, predicate: Callable[[Any, str], bool]
+    ) -> list[tuple[Any, str, str]]:
+        leftovers = []
+        for resource, owner in list(self._owners.items()):
+            description = _describe_leftover_resource(resource)
+            if description is not None and predicate(resource, owner):
+                leftovers.append((resource, owner, description))
+                del self._owners[resource]
+        return leftovers
+
+    def release_loop(self, loop: AbstractEventLoop) -> None:
+        """Handles the resources left on the loop, before the loop is closed."""
+        leftovers = self._pop_leftovers(
+            lambda resource, _: _resource_loop(resource) is loop
+        )
+        if self.policy == LeakPolicy.CANCEL:
+            _cancel_leftover_resources(resource for resource, _, _ in leftovers)
+            return
+        # Timers and transports of a closed loop may be garbage collected
+        # before their owner finishes, so only their descriptions are kept.
+        for _, owner, description in leftovers:
+            self._closed_loop_leftovers.setdefault(owner, []).append(description)
+
+    def finish_item(self, item: Item) -> None:
+        """Handles the resources created by the item according to the policy."""
+        leftovers = self._pop_leftovers(lambda _, owner: owner == item.nodeid)
+        descriptions = self._closed_loop_leftovers.pop(item.nodeid, [])
+        if self.policy == LeakPolicy.CANCEL:
+            _cancel_leftover_resources(resource for resource, _, _ in leftovers)
+            return
+        descriptions += (description for _, _, description in leftovers)
+        if not descriptions:
+            return
+        report = _LEFTOVER_RESOURCES_REPORT.format(
+            nodeid=item.nodeid,
+            resources="\n".join(f"    {description}" for description in descriptions),
+        )
+        if self.policy == LeakPolicy.FAIL:
+            pytest.fail(report, pytrace=False)
+        item.warn(pytest.PytestWarning(report))
+
+
+_leak_tracker = StashKey[_LeakTracker]()
+
+
+def _chain_task_factory(
+    loop: AbstractEventLoop, on_task_created: Callable[[asyncio.Task[Any]], object]
+) -> None:
+    """
+    Installs a task factory that notifies the callback about every new task.
+
+    Task creation is delegated to the task factory that was previously installed
+    on the loop, so that several callbacks can be chained.
+    """
+    previous_task_factory = loop.get_task_factory()
+
+    def task_factory(loop, coro, **kwargs):
+        if previous_task_factory is None:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        else:
+            task = previous_task_factory(loop, coro, **kwargs)
+        on_task_created(task)
+        return task
+
+    loop.set_task_factory(task_factory)
+
+
+def _describe_leftover_resource(resource: Any) -> str | None:
+    """Returns a description of the resource, if it is still alive."""
+    if isinstance(resource, asyncio.Future):
+        return None if resource.done() else f"pending task {resource!r}"
+    if isinstance(resource, asyncio.TimerHandle):
+        # The loop resets the private _scheduled flag when a timer is due
+        if resource.cancelled() or not getattr(resource, "_scheduled", False):
+            return None
+        return f"scheduled timer {resource!r}"
+    if isinstance(resource, asyncio.SubprocessTransport):
+        if resource.get_returncode() is not None:
+            return None
+        return f"running subprocess {resource!r}"
+    if isinstance(resource, asyncio.BaseTransport) and not resource.is_closing():
+        return f"open transport {resource!r}"
+    return None
+
+
+def _resource_loop(resource: Any) -> AbstractEventLoop | None:
+    if isinstance(resource, asyncio.Future):
+        return resource.get_loop()
+    return getattr(resource, "_loop", None)
+
+
+def _cancel_leftover_resources(resources: Iterable[Any]) -> None:
+    tasks_by_loop: dict[AbstractEventLoop, list[asyncio.Future]] = {}
+    for resource in resources:
+        loop = _resource_loop(resource)
+        # Cancelling resources schedules callbacks, which fails on a closed loop
+        if loop is None or loop.is_closed():
+            continue
+        if isinstance(resource, asyncio.Future):
+            resource.cancel()
+            tasks_by_loop.setdefault(loop, []).append(resource)
+        elif isinstance(resource, asyncio.TimerHandle):
+            resource.cancel()
+        else:
+            if isinstance(resource, asyncio.SubprocessTransport):
+                with contextlib.suppress(ProcessLookupError):
+                    resource.kill()
+            resource.close()
+    for loop, tasks in tasks_by_loop.items():
+        if not loop.is_running():
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+
+class _TraceRecorder:
+    """
+    Records spans of event loops, async fixtures and tests in the Trace Event Format.
+
+    The resulting file can be opened in Perfetto or chrome://tracing. Each
+    process and thread is displayed on a separate track.
+    """
+
+    def __init__(self, path: str, *, process_name: str, trace_tasks: bool) -> None:
+        self.path = path
+        self.trace_tasks = trace_tasks
+        self.pid = os.getpid()
+        self.events: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": process_name},
+            }
+        ]
+        self._named_threads: set[int] = set()
+        self._lock = threading.Lock()
+
+    def _append(self, event: dict[str, Any]) -> None:
+        tid = threading.get_ident()
+        event["pid"] = self.pid
+        event["tid"] = tid
+        with self._lock:
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self.pid,
+                        "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: str) -> Iterator[None]:
+        start = _trace_clock()
+        try:
+            yield
+        finally:
+            self._append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": _trace_clock() - start,
+                    "args": args,
+                }
+            )
+
+    def install(self, loop: AbstractEventLoop) -> None:
+        """Records the lifetime of every task created on the loop."""
+        _chain_task_factory(loop, self._task_created)
+
+    def _task_created(self, task: asyncio.Task[Any]) -> None:
+        self._append(
+            {
+                "name": _task_trace_name(task),
+                "cat": "task",
+                "ph": "b",
+                "id": hex(id(task)),
+                "ts": _trace_clock(),
+            }
+        )
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task[Any]) -> None:
+        self._append(
+            {
+                "name": _task_trace_name(task),
+                "cat": "task",
+                "ph": "e",
+                "id": hex(id(task)),
+                "ts": _trace_clock(),
+                "args": {"cancelled": str(task.cancelled())},
+            }
+        )
+
+    def write(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, trace_file)
+
+
+_trace_recorder = StashKey[_TraceRecorder]()
+# Key of the trace events that an xdist worker sends to the controller
+_WORKER_TRACE_EVENTS = "pytest_asyncio_trace_events"
+
+
+def _trace_clock() -> float:
+    """Returns a timestamp in microseconds that is comparable across processes."""
+    return time.perf_counter_ns() / 1000
+
+
+def _task_trace_name(task: asyncio.Task[Any]) -> str:
+    coro = task.get_coro()
+    return getattr(coro, "__qualname__", None) or repr(coro)
+
+
+def _trace(
+    config: Config, name: str, category: str, **args: str
+) -> contextlib.AbstractContextManager[None]:
+    """Returns a context that is recorded as a span, if tracing is enabled."""
+    trace_recorder = config.stash.get(_trace_recorder, None)
+    if trace_recorder is None:
+        return contextlib.nullcontext()
+    return trace_recorder.span(name, category, **args)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session: Session) -> None:
+    config = session.config
+    workeroutput = getattr(config, "workeroutput", None)
+    trace_recorder = config.stash.get(_trace_recorder, None)
+    if trace_recorder is not None:
+        if workeroutput is not None:
+            # Running in a pytest-xdist worker. The controller writes the trace file.
+            workeroutput[_WORKER_TRACE_EVENTS] = trace_recorder.events
+        else:
+            trace_recorder.write()
+    profiler = config.stash.get(_profiler, None)
+    if profiler is not None and profiler.aggregate:
+        workerinput = getattr(config, "workerinput", None)
+        profiler.write_session(workerinput["workerid"] if workerinput else None)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: object) -> None:
+    """Collects the trace events of a pytest-xdist worker that has finished."""
+    trace_recorder = node.config.stash.get(_trace_recorder, None)
+    workeroutput = getattr(node, "workeroutput", {})
+    if trace_recorder is not None and _WORKER_TRACE_EVENTS in workeroutput:
+        trace_recorder.events.extend(workeroutput[_WORKER_TRACE_EVENTS])
+
+
+def pytest_terminal_summary(terminalreporter: Any, config: Config) -> None:
+    load_test_summaries = config.stash.get(_load_test_summaries, None)
+    if load_test_summaries:
+        terminalreporter.write_sep("=", "asyncio load tests")
+        for nodeid, summary in load_test_summaries:
+            terminalreporter.write_line(f"{nodeid}: {summary}")
+    snapshot_cache = config.stash.get(_snapshot_cache, None)
+    if snapshot_cache is not None and (snapshot_cache.hits or snapshot_cache.misses):
+        terminalreporter.write_sep(
+            "-",
+            f"asyncio fixture cache: {snapshot_cache.hits} hits, "
+            f"{snapshot_cache.misses} misses, "
+            f"{snapshot_cache.time_saved:.2f}s saved",
+        )
+    memory_tracker = config.stash.get(_memory_tracker, None)
+    if memory_tracker is not None:
+        memory_tracker.write_summary(terminalreporter)
+    gc_controller = config.stash.get(_gc_controller, None)
+    if gc_controller is not None:
+        gc_controller.write_summary(terminalreporter)
+    lag_monitor = config.stash.get(_lag_monitor, None)
+    if lag_monitor is not None and lag_monitor.report:
+        lag_monitor.write_summary(terminalreporter)
+    advisor = config.stash.get(_loop_scope_advisor, None)
+    if advisor is not None:
+        terminalreporter.write_sep("=", "asyncio loop scope advice")
+        recommendations = advisor.recommendations()
+        for _, recommendation in recommendations:
+            terminalreporter.write_line(recommendation)
+        if not recommendations:
+            terminalreporter.write_line("no event loops or async fixtures to reuse")
+    trace_recorder = config.stash.get(_trace_recorder, None)
+    if trace_recorder is not None and not hasattr(config, "workeroutput"):
+        terminalreporter.write_sep(
+            "-", f"generated asyncio trace file: {trace_recorder.path}"
+        )
+
+
+class _LoopScopeAdvisor:
+    """
+    Measures how often event loops and async fixtures are created and recommends
+    wider scopes for them.
+
+    Event loops are grouped by the module, package or session that could provide
+    a single event loop instead. Async fixtures are grouped by their definition.
+    The estimated savings assume that every creation after the first one could be
+    avoided.
+    """
+
+    def __init__(self) -> None:
+        # (wider scope, node ID of the wider scope, scope) -> [count, seconds]
+        self.loops: dict[tuple[str, str, str], list[Any]] = {}
+        # (fixture ID, scope) -> [count, seconds, module node IDs]
+        self.fixtures: dict[tuple[str, str], list[Any]] = {}
+
+    def record_loop(self, node: Collector | Item, scope: str, seconds: float) -> None:
+        wider_scope = _WIDER_LOOP_SCOPES.get(scope)
+        if wider_scope is None:
+            return
+        wider_node: Collector | None
+        if wider_scope == "module":
+            wider_node = node.getparent(Module)
+        elif wider_scope == "package":
+            parent = node.parent
+            wider_node = None if parent is None else parent.getparent(Package)
+            if wider_node is None:
+                wider_node = node.session
+        else:
+            wider_node = node.session
+        if wider_node is None:
+            return
+        # The recommended scope must match the node that groups the loops
+        if isinstance(wider_node, Package):
+            wider_scope = "package"
+        elif isinstance(wider_node, Session):
+            wider_scope = "session"
+        usage = self.loops.setdefault((wider_scope, wider_node.nodeid, scope), [0, 0.0])
+        usage[0] += 1
+        usage[1] += seconds
+
+    def record_fixture(
+        self,
+        request: FixtureRequest,
+        fixturedef: FixtureDef,
+        seconds: float,
+        *,
+        setup: bool,
+    ) -> None:
+        if request.scope == "session":
+            return
+        fixture_id = _fixture_id(fixturedef)
+        usage = self.fixtures.setdefault((fixture_id, request.scope), [0, 0.0, set()])
+        usage[0] += setup
+        usage[1] += seconds
+        module = request.node.getparent(Module)
+        usage[2].add(module.nodeid if module is not None else None)
+
+    def recommendations(self) -> list[tuple[float, str]]:
+        """Returns the recommendations, sorted by their estimated savings."""
+        recommendations = []
+        for (wider_scope, nodeid, scope), (count, seconds) in self.loops.items():
+            if count < 2:
+                continue
+            savings = seconds * (count - 1) / count
+            location = nodeid or "the session"
+            recommendations.append(
+                (
+                    savings,
+                    f"{location}: {count} {scope}-scoped event loops took "
+                    f"{seconds:.3f}s, loop_scope={wider_scope!r} would save "
+                    f"~{savings:.3f}s",
+                )
+            )
+        for (fixture_id, scope), (count, seconds, modules) in self.fixtures.items():
+            if count < 2:
+                continue
+            # Fixtures used by several modules can only be shared by the session
+            wider_scope = "session" if len(modules) > 1 or None in modules else "module"
+            savings = seconds * (count - 1) / count
+            recommendations.append(
+                (
+                    savings,
+                    f"{fixture_id}: {count} setups and teardowns of a {scope}-scoped "
+                    f"async fixture took {seconds:.3f}s, scope={wider_scope!r} and "
+                    f"loop_scope={wider_scope!r} would save ~{savings:.3f}s",
+                )
+            )
+        recommendations.sort(key=lambda recommendation: -recommendation[0])
+        return recommendations
+
+
+def _fixture_id(fixturedef: FixtureDef) -> str:
+    if not fixturedef.baseid:
+        return fixturedef.argname
+    return f"{fixturedef.baseid}::{fixturedef.argname}"
+
+
+_WIDER_LOOP_SCOPES = {
+    "function": "module",
+    "class": "module",
+    "module": "package",
+    "package": "session",
+}
+
+_loop_scope_advisor = StashKey[_LoopScopeAdvisor]()
+
+
+class _LagHistogram:
+    """
+    Histogram of the loop lag with a relative error below 2%.
+
+    Similar to an HDR histogram, lags are counted in buckets whose width grows with
+    the lag, so that the histogram stays small regardless of the number of samples.
+    """
+
+    # Number of significant bits of a lag in microseconds that are retained
+    _PRECISION = 7
+
+    def __init__(self) -> None:
+        self.counts: collections.Counter[int] = collections.Counter()
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, lag: float) -> None:
+        microseconds = max(0, int(lag * 1_000_000))
+        shift = max(0, microseconds.bit_length() - self._PRECISION)
+        self.counts[microseconds >> shift << shift] += 1
+        self.count += 1
+        self.max = max(self.max, lag)
+
+    def percentile(self, percent: int) -> float | None:
+        """Returns the lower bound of the bucket holding the percentile, if any."""
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for microseconds in sorted(self.counts):
+            seen += self.counts[microseconds]
+            if seen >= rank:
+                return microseconds / 1_000_000
+        return None
+
+    def summary(self) -> str:
+        return (
+            f"p50 {_format_latency(self.percentile(50))}, "
+            f"p99 {_format_latency(self.percentile(99))}, "
+            f"max {_format_latency(self.max if self.count else None)} "
+            f"({self.count} callbacks)"
+        )
+
+
+class _LagMonitor:
+    """
+    Measures the loop lag, which is the delay between the time a callback is
+    scheduled to run and the time it actually runs.
+
+    The lag is recorded in the histogram of the test or async fixture that is
+    running, if any.
+    """
+
+    # Number of tests and fixtures with the highest lag in the terminal summary
+    _SUMMARY_SIZE = 10
+
+    def __init__(self, *, report: bool) -> None:
+        self.report = report
+        self._histogram: _LagHistogram | None = None
+        self._loops: weakref.WeakSet[AbstractEventLoop] = weakref.WeakSet()
+        self._items: dict[str, _LagHistogram] = {}
+        self._fixtures: dict[str, _LagHistogram] = {}
+
+    def install(self, loop: AbstractEventLoop) -> None:
+        """Measures the lag of callbacks that are scheduled on the loop."""
+        if loop in self._loops:
+            return
+        call_soon = loop.call_soon
+        call_at = loop.call_at
+
+        def monitored_call_soon(
+            callback: Callable[[Unpack[_Ts]], object],
+            *args: Unpack[_Ts],
+            context: contextvars.Context | None = None,
+        ) -> asyncio.Handle:
+            return call_soon(
+                self._measured(loop, loop.time(), callback), *args, context=context
+            )
+
+        # call_later is implemented in terms of call_at
+        def monitored_call_at(
+            when: float,
+            callback: Callable[[Unpack[_Ts]], object],
+            *args: Unpack[_Ts],
+            context: contextvars.Context | None = None,
+        ) -> asyncio.TimerHandle:
+            return call_at(
+                when, self._measured(loop, when, callback), *args, context=context
+            )
+
+        # Loops implemented as extension types (e.g. uvloop) cannot be monitored
+        with contextlib.suppress(AttributeError):
+            loop.call_soon = monitored_call_soon  # type: ignore[method-assign]
+            loop.call_at = monitored_call_at  # type: ignore[method-assign]
+        self._loops.add(loop)
+
+    def _measured(
+        self,
+        loop: AbstractEventLoop,
+        scheduled_at: float,
+        callback: Callable[[Unpack[_Ts]], object],
+    ) -> Callable[[Unpack[_Ts]], object]:
+        def measured_callback(*args: Unpack[_Ts]) -> object:
+            histogram = self._histogram
+            if histogram is not None:
+                histogram.record(max(0.0, loop.time() - scheduled_at))
+            return callback(*args)
+
+        # Lets the profiler attribute the callback to the task it belongs to
+        wrapped = _unwrap_callback(callback)
+        measured_callback._pytest_asyncio_callback = wrapped  # type: ignore[attr-defined]
+        return measured_callback
+
+    @contextlib.contextmanager
+    def measuring(self, histogram: _LagHistogram) -> Iterator[_LagHistogram]:
+        """Records the lag of callbacks run inside the context in the histogram."""
+        if self._histogram is not None:
+            # Inside of another measurement
+            yield histogram
+            return
+        self._histogram = histogram
+        try:
+            yield histogram
+        finally:
+            self._histogram = None
+
+    @contextlib.contextmanager
+    def measuring_item(
+        self, item: Item, loop: AbstractEventLoop
+    ) -> Iterator[_LagHistogram]:
+        self.install(loop)
+        histogram = _LagHistogram()
+        try:
+            with self.measuring(histogram):
+                yield histogram
+        finally:
+            if histogram.count:
+                item.user_properties.extend(
+                    [
+                        ("asyncio_lag_p50", histogram.percentile(50)),
+                        ("asyncio_lag_p99", histogram.percentile(99)),
+                        ("asyncio_lag_max", histogram.max),
+                    ]
+                )
+                if self.report:
+                    self._items[item.nodeid] = histogram
+
+    def fixture_histogram(self, fixturedef: FixtureDef) -> _LagHistogram:
+        """Returns the histogram of all setups and teardowns of the fixture."""
+        return self._fixtures.setdefault(_fixture_id(fixturedef), _LagHistogram())
+
+    def write_summary(self, terminalreporter: Any) -> None:
+        terminalreporter.write_sep("=", "asyncio loop lag")
+        for kind, histograms in (("test", self._items), ("fixture", self._fixtures)):
+            ranked = sorted(
+                (item for item in histograms.items() if item[1].count),
+                key=lambda item: item[1].percentile(99) or 0.0,
+                reverse=True,
+            )
+            for name, histogram in ranked[: self._SUMMARY_SIZE]:
+                terminalreporter.write_line(f"{kind} {name}: {histogram.summary()}")
+
+
+_lag_monitor = StashKey[_LagMonitor]()
+
+
+def _unwrap_callback(callback: Callable[..., object]) -> Callable[..., object]:
+    """
+    Returns the callback that was scheduled on the loop, before the
+    instrumentation of pytest-asyncio wrapped it.
+    """
+    return getattr(callback, "_pytest_asyncio_callback", callback)
+
+
+class _GcController:
+    """
+    Controls the garbage collector around async tests and measures the time it
+    spends collecting garbage during each test.
+
+    In "deferred" and "frozen" mode, automatic collections are disabled while an
+    async test is set up, run and torn down. Once the test and its function-scoped
+    event loop have been torn down, the young generation is collected. Every
+    full_interval tests, a full collection is run instead. In "frozen" mode, the
+    objects that exist after collection and after the setup of each session-scoped
+    fixture are moved to the permanent generation, so that later collections
+    don't need to examine them.
+    """
+
+    # Number of tests in the terminal summary
+    _SUMMARY_SIZE = 10
+
+    def __init__(self, mode: GcMode, full_interval: int) -> None:
+        self.mode = mode
+        self.full_interval = full_interval
+        self._frozen = False
+        self._deferred_tests = 0
+        self._collection_start: float | None = None
+        self._collections = 0
+        self._collection_time = 0.0
+        self._disabled_gc = False
+        self._items: dict[str, tuple[int, float]] = {}
+        gc.callbacks.append(self._measure)
+
+    def stop(self) -> None:
+        gc.callbacks.remove(self._measure)
+        if self._disabled_gc:
+            gc.enable()
+        if self._frozen:
+            gc.unfreeze()
+
+    def _measure(self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self._collection_start = time.perf_counter()
+        elif self._collection_start is not None:
+            self._collections += 1
+            self._collection_time += time.perf_counter() - self._collection_start
+            self._collection_start = None
+
+    def _item_mode(self, item: Item) -> GcMode:
+        if item.get_closest_marker("asyncio") is None:
+            return GcMode.DEFAULT
+        mode = _get_closest_marker_kwargs(item, ("gc",)).get("gc")
+        if mode is None:
+            return self.mode
+        if mode not in (GcMode.DEFAULT, GcMode.DEFERRED):
+            raise ValueError(
+                f"Invalid asyncio gc mode for {item.nodeid}: "
+                f"expected 'default' or 'deferred', got {mode!r}"
+            )
+        return GcMode(mode)
+
+    def start_item(self, item: Item) -> None:
+        self._collections = 0
+        self._collection_time = 0.0
+        if self._item_mode(item) != GcMode.DEFAULT and gc.isenabled():
+            gc.disable()
+            self._disabled_gc = True
+
+    def freeze(self) -> None:
+        """Freezes the objects that exist at this point, if enabled."""
+        if self.mode != GcMode.FROZEN:
+            return
+        # Collect the existing garbage, so it's not kept alive forever
+        gc.collect()
+        gc.freeze()
+        self._frozen = True
+
+    def finish_item(self, item: Item) -> None:
+        """Runs the deferred collection and records the GC time of the item."""
+        if self._disabled_gc:
+            self._deferred_tests += 1
+            gc.collect(2 if self._deferred_tests % self.full_interval == 0 else 0)
+            gc.enable()
+            self._disabled_gc = False
+        # The teardown report has not been created yet, so the properties show up
+        # in the reports of the item
+        item.user_properties.extend(
+            [
+                ("asyncio_gc_collections", self._collections),
+                ("asyncio_gc_time", self._collection_time),
+            ]
+        )
+        self._items[item.nodeid] = (self._collections, self._collection_time)
+
+    def write_summary(self, terminalreporter: Any) -> None:
+        terminalreporter.write_sep("=", "asyncio garbage collection")
+        collections = sum(count for count, _ in self._items.values())
+        collection_time = sum(seconds for _, seconds in self._items.values())
+        terminalreporter.write_line(
+            f"mode {self.mode.value}: {collections} collections took "
+            f"{collection_time:.3f}s, {self._deferred_tests} tests deferred "
+            f"their collections"
+        )
+        ranked = sorted(self._items.items(), key=lambda item: item[1][1], reverse=True)
+        for nodeid, (count, seconds) in ranked[: self._SUMMARY_SIZE]:
+            if count:
+                terminalreporter.write_line(
+                    f"{nodeid}: {count} collections took {seconds:.3f}s"
+                )
+
+
+_gc_controller = StashKey[_GcController]()
+
+
+class _TaskCounter:
+    """
+    Counts the tasks spawned by async code while a test is set up, run and torn
+    down, the peak number of those tasks that are pending at the same time, and
+    the iterations of the event loops.
+
+    A high number of tasks hints at accidental fan-out, whereas a high number of
+    loop iterations compared to the number of tasks hints at busy polling.
+    """
+
+    def __init__(self) -> None:
+        self._loops: weakref.WeakSet[AbstractEventLoop] = weakref.WeakSet()
+        # Tasks created during previous items don't affect the pending count
+        self._generation = 0
+        self._tasks_created = 0
+        self._pending_tasks = 0
+        self._peak_pending_tasks = 0
+        self._loop_iterations = 0
+
+    def install(self, loop: AbstractEventLoop) -> None:
+        if loop in self._loops:
+            return
+        _chain_task_factory(loop, self._task_created)
+        run_once = getattr(loop, "_run_once", None)
+        if run_once is not None:
+
+            def counting_run_once() -> None:
+                self._loop_iterations += 1
+                run_once()
+
+            # Loops implemented as extension types (e.g. uvloop) don't allow
+            # overriding methods on the instance. Only tasks are counted for those.
+            with contextlib.suppress(AttributeError):
+                loop._run_once = counting_run_once  # type: ignore[attr-defined]
+        self._loops.add(loop)
+
+    def _task_created(self, task: asyncio.Task[Any]) -> None:
+        # Tasks that pytest-asyncio creates to run tests, fixtures, load tests and
+        # the shutdown of a loop are not spawned by the code under test
+        if _is_plugin_task(task):
+            return
+        self._tasks_created += 1
+        self._pending_tasks += 1
+        self._peak_pending_tasks = max(self._peak_pending_tasks, self._pending_tasks)
+        task.add_done_callback(functools.partial(self._task_done, self._generation))
+
+    def _task_done(self, generation: int, task: asyncio.Task[Any]) -> None:
+        if generation == self._generation:
+            self._pending_tasks -= 1
+
+    def start_item(self) -> None:
+        self._generation += 1
+        self._tasks_created = 0
+        self._pending_tasks = 0
+        self._peak_pending_tasks = 0
+        self._loop_iterations = 0
+
+    def finish_item(self, item: Item) -> None:
+        if item.get_closest_marker("asyncio") is None:
+            return
+        item.user_properties.extend(
+            [
+                ("asyncio_tasks_created", self._tasks_created),
+                ("asyncio_tasks_peak_pending", self._peak_pending_tasks),
+                ("asyncio_loop_iterations", self._loop_iterations),
+            ]
+        )
+
+
+_task_counter = StashKey[_TaskCounter]()
+
+
+class _MemoryTracker:
+    """
+    Traces memory allocations with tracemalloc and reports the allocations that
+    are still alive after a test or an async fixture has finished.
+
+    A test is measured from the start of its setup until the end of its teardown.
+    Allocations made by the setup of async fixtures with a scope wider than
+    "function" are attributed to the fixture rather than to the test that
+    happened to set it up. The futures, tasks and handles that a test leaves
+    behind are counted per event loop.
+
+    Allocations made by pytest, pluggy and pytest-asyncio itself are ignored.
+    For the same reason, the tracker keeps its records in plain dicts that are
+    created in this module.
+    """
+
+    # Number of tests, fixtures and allocation sites in the terminal summary
+    _SUMMARY_SIZE = 10
+    _SUMMARY_SITES = 5
+
+    def __init__(self) -> None:
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(
+                False, os.path.join(os.path.dirname(inspect.getfile(Function)), "*")
+            ),
+            tracemalloc.Filter(
+                False, os.path.join(os.path.dirname(pluggy.__file__), "*")
+            ),
+        ]
+        self._loops: weakref.WeakKeyDictionary[AbstractEventLoop, str] = (
+            weakref.WeakKeyDictionary()
+        )
+        # The state of the current test
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._loop_objects: dict[str, dict[str, int]] = {}
+        # Allocations of wider-scoped fixtures set up by the current test
+        self._excluded: dict[str, int] | None = None
+        # Fixtures whose cached value is released after their finalizers ran
+        self._finished_fixtures: list[tuple[str, tracemalloc.Snapshot]] = []
+        self._items: dict[str, tuple[dict[str, int], dict[str, dict[str, int]]]] = {}
+        self._fixtures: dict[str, dict[str, int]] = {}
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def track_loop(self, loop: AbstractEventLoop, description: str) -> None:
+        self._loops[loop] = description
+
+    def start_item(self) -> None:
+        self._loop_objects = self._count_loop_objects()
+        self._snapshot = self._take_snapshot()
+        self._excluded = {}
+
+    def finish_item(self, item: Item) -> None:
+        """Records the allocations and loop objects the torn down item left behind."""
+        if self._snapshot is None:
+            return
+        final_snapshot = self._take_snapshot()
+        growth = _subtract_sizes(
+            _allocation_growth(self._snapshot, final_snapshot), self._excluded or {}
+        )
+        leftovers = {}
+        for description, counts in self._count_loop_objects().items():
+            new_counts = _subtract_sizes(
+                counts, self._loop_objects.get(description, {})
+            )
+            if new_counts:
+                leftovers[description] = new_counts
+        # The teardown report has not been created yet, so the property shows up
+        # in the reports of the item
+        item.user_properties.append(("asyncio_memory_growth", sum(growth.values())))
+        self._items[item.nodeid] = (growth, leftovers)
+        for fixture_id, fixture_snapshot in self._finished_fixtures:
+            self._fixtures[fixture_id] = _allocation_growth(
+                fixture_snapshot, final_snapshot
+            )
+        self._finished_fixtures.clear()
+        self._snapshot = None
+        self._excluded = None
+
+    @contextlib.contextmanager
+    def tracking_fixture(
+        self, request: FixtureRequest, fixturedef: FixtureDef
+    ) -> Iterator[None]:
+        snapshot = self._take_snapshot()
+
+        def finish() -> None:
+            # Pytest releases the fixture value after all finalizers have run,
+            # so the allocations are compared at the end of the current test
+            self._finished_fixtures.append((_fixture_id(fixturedef), snapshot))
+
+        # Finalizers run in reverse order, so this one runs after the fixture
+        # has been torn down
+        request.addfinalizer(finish)
+        yield
+        if request.scope != "function" and self._excluded is not None:
+            for site, size in _allocation_growth(
+                snapshot, self._take_snapshot()
+            ).items():
+                self._excluded[site] = self._excluded.get(site, 0) + size
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def _count_loop_objects(self) -> dict[str, dict[str, int]]:
+        """Counts the pending futures, tasks and handles of each tracked loop."""
+        counts: dict[str, dict[str, int]] = {}
+        for loop, description in self._loops.items():
+            loop_counts = counts.setdefault(
+                description, {"futures": 0, "handles": 0, "tasks": 0}
+            )
+            loop_counts["tasks"] += sum(
+                not task.done() for task in asyncio.all_tasks(loop)
+            )
+            loop_counts["handles"] += len(getattr(loop, "_ready", ())) + sum(
+                not handle.cancelled() for handle in getattr(loop, "_scheduled", ())
+            )
+        for obj in gc.get_objects():
+            if (
+                isinstance(obj, asyncio.Future)
+                and not isinstance(obj, asyncio.Task)
+                and not obj.done()
+            ):
+                # Futures of loops that are not tracked have no description
+                future_loop_description = self._loops.get(obj.get_loop())
+                if future_loop_description is not None:
+                    counts[future_loop_description]["futures"] += 1
+        return counts
+
+    def write_summary(self, terminalreporter: Any) -> None:
+        terminalreporter.write_sep("=", "asyncio memory")
+        ranked_items = sorted(
+            self._items.items(),
+            key=lambda item: sum(item[1][0].values()),
+            reverse=True,
+        )
+        for nodeid, (growth, leftovers) in ranked_items[: self._SUMMARY_SIZE]:
+            if not growth and not leftovers:
+                continue
+            self._write_growth(terminalreporter, f"test {nodeid}", growth)
+            for description, counts in leftovers.items():
+                terminalreporter.write_line(
+                    f"    left on {description}: "
+                    + ", ".join(f"{count} {kind}" for kind, count in counts.items())
+                )
+        ranked_fixtures = sorted(
+            self._fixtures.items(),
+            key=lambda fixture: sum(fixture[1].values()),
+            reverse=True,
+        )
+        for fixture_id, growth in ranked_fixtures[: self._SUMMARY_SIZE]:
+            if growth:
+                self._write_growth(terminalreporter, f"fixture {fixture_id}", growth)
+
+    def _write_growth(
+        self, terminalreporter: Any, name: str, growth: dict[str, int]
+    ) -> None:
+        terminalreporter.write_line(f"{name}: +{_format_size(sum(growth.values()))}")
+        sites = sorted(growth.items(), key=lambda site: site[1], reverse=True)
+        for site, size in sites[: self._SUMMARY_SITES]:
+            terminalreporter.write_line(f"    {site}: +{_format_size(size)}")
+
+
+_memory_tracker = StashKey[_MemoryTracker]()
+
+
+def _allocation_growth(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot
+) -> dict[str, int]:
+    """Returns the size of the allocations that grew between the snapshots by site."""
+    return {
+        str(statistic.traceback[0]): statistic.size_diff
+        for statistic in after.compare_to(before, "lineno")
+        if statistic.size_diff > 0
+    }
+
+
+def _subtract_sizes(sizes: dict[str, int], other: dict[str, int]) -> dict[str, int]:
+    """Subtracts the other sizes and keeps the positive differences."""
+    return {
+        key: size - other.get(key, 0)
+        for key, size in sizes.items()
+        if size > other.get(key, 0)
+    }
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+class _AsyncioProfiler:
+    """
+    Profiles async tests and the setup and teardown of async fixtures.
+
+    The "collapsed" format attributes the CPU time of each task step and the time
+    a task spends suspended to the chain of coroutines the task is awaiting.
+    Time the event loop spends waiting in the selector is reported as "idle".
+    The "pstats" format records a cProfile profile with wall-clock timing, where
+    idle time shows up as time spent in the selector.
+    """
+
+    def __init__(
+        self, directory: str, profile_format: ProfileFormat, *, aggregate: bool
+    ) -> None:
+        self.directory = directory
+        self.profile_format = profile_format
+        self.aggregate = aggregate
+        self._phase: str | None = None
+        self._stacks: collections.Counter[str] | None = None
+        self._cprofile: cProfile.Profile | None = None
+        self._suspended_tasks: weakref.WeakKeyDictionary[
+            asyncio.Task[Any], tuple[str, float]
+        ] = weakref.WeakKeyDictionary()
+        self._session_stacks: collections.Counter[str] = collections.Counter()
+        self._session_stats: pstats.Stats | None = None
+
+    def install(self, loop: AbstractEventLoop) -> None:
+        """Measures the callbacks and the selector wait time of the loop."""
+        if self.profile_format != ProfileFormat.COLLAPSED:
+            return
+        call_soon = loop.call_soon
+
+        def profiled_call_soon(
+            callback: Callable[[Unpack[_Ts]], object],
+            *args: Unpack[_Ts],
+            context: contextvars.Context | None = None,
+        ) -> asyncio.Handle:
+            return call_soon(self._profiled(callback), *args, context=context)
+
+        # Loops implemented as extension types (e.g. uvloop) cannot be profiled
+        with contextlib.suppress(AttributeError):
+            loop.call_soon = profiled_call_soon  # type: ignore[method-assign]
+            selector = getattr(loop, "_selector", None)
+            if selector is not None:
+                selector.select = self._profiled_select(selector.select)
+
+    def _profiled(
+        self, callback: Callable[[Unpack[_Ts]], object]
+    ) -> Callable[[Unpack[_Ts]], object]:
+        def profiled_callback(*args: Unpack[_Ts]) -> object:
+            stacks = self._stacks
+            if stacks is None or self._phase is None:
+                return callback(*args)
+            scheduled_callback = _unwrap_callback(callback)
+            task = getattr(scheduled_callback, "__self__", None)
+            if isinstance(task, asyncio.Task):
+                suspended = self._suspended_tasks.pop(task, None)
+                if suspended is not None:
+                    awaited_stack, suspended_at = suspended
+                    stacks[f"{self._phase};await;{awaited_stack}"] += _microseconds(
+                        time.perf_counter() - suspended_at
+                    )
+            cpu_start = time.thread_time()
+            try:
+                return callback(*args)
+            finally:
+                cpu_time = _microseconds(time.thread_time() - cpu_start)
+                if isinstance(task, asyncio.Task):
+                    coroutine_stack = _coroutine_stack(task)
+                    stacks[f"{self._phase};cpu;{coroutine_stack}"] += cpu_time
+                    if not task.done():
+                        self._suspended_tasks[task] = (
+                            coroutine_stack,
+                            time.perf_counter(),
+                        )
+                else:
+                    callback_name = getattr(
+                        scheduled_callback, "__qualname__", repr(scheduled_callback)
+                    )
+                    stacks[f"{self._phase};cpu;{callback_name}"] += cpu_time
+
+        return profiled_callback
+
+    def _profiled_select(self, select: Callable[..., _T]) -> Callable[..., _T]:
+        @functools.wraps(select)
+        def profiled_select(*args: Any, **kwargs: Any) -> _T:
+            start = time.perf_counter()
+            try:
+                return select(*args, **kwargs)
+            finally:
+                if self._stacks is not None and self._phase is not None:
+                    self._stacks[f"{self._phase};idle"] += _microseconds(
+                        time.perf_counter() - start
+                    )
+
+        return profiled_select
+
+    @contextlib.contextmanager
+    def profiling_item(self, item: Item) -> Iterator[None]:
+        self._stacks = collections.Counter()
+        if self.profile_format == ProfileFormat.PSTATS:
+            self._cprofile = cProfile.Profile()
+        try:
+            yield
+        finally:
+            self._finish_item(item)
+            self._stacks = None
+            self._cprofile = None
+            self._suspended_tasks.clear()
+
+    @contextlib.contextmanager
+    def profiling(self, phase: str) -> Iterator[None]:
+        """Attributes the time spent inside the context to the specified phase."""
+        if self._stacks is None or self._phase is not None:
+            # Either outside of a test or inside of another phase
+            yield
+            return
+        self._phase = phase
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        try:
+            yield
+        finally:
+            if self._cprofile is not None:
+                self._cprofile.disable()
+            self._phase = None
+
+    def _finish_item(self, item: Item) -> None:
+        if self._cprofile is not None:
+            if not self._cprofile.getstats():
+                return
+            stats = pstats.Stats(self._cprofile)
+            if self.aggregate:
+                if self._session_stats is None:
+                    self._session_stats = stats
+                else:
+                    self._session_stats.add(stats)
+            else:
+                stats.dump_stats(self._path(_profile_file_stem(item.nodeid)))
+        elif self._stacks:
+            if self.aggregate:
+                self._session_stacks.update(self._stacks)
+            else:
+                self._write_stacks(
+                    self._path(_profile_file_stem(item.nodeid)), self._stacks
+                )
+
+    def write_session(self, worker_id: str | None) -> None:
+        stem = "session" if worker_id is None else f"session-{worker_id}"
+        if self._session_stats is not None:
+            self._session_stats.dump_stats(self._path(stem))
+        elif self._session_stacks:
+            self._write_stacks(self._path(stem), self._session_stacks)
+
+    def _path(self, stem: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f"{stem}.{self.profile_format.value}")
+
+    @staticmethod
+    def _write_stacks(path: str, stacks: collections.Counter[str]) -> None:
+        with open(path, "w", encoding="utf-8") as collapsed_file:
+            for stack, microseconds in sorted(stacks.items()):
+                if microseconds:
+                    collapsed_file.write(f"{stack} {microseconds}\n")
+
+
+_profiler = StashKey[_AsyncioProfiler]()
+
+
+def _microseconds(seconds: float) -> int:
+    return round(seconds * 1_000_000)
+
+
+def _profile_file_stem(nodeid: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+def _coroutine_stack(task: asyncio.Task[Any]) -> str:
+    """Returns the chain of awaitables the task is currently suspended on."""
+    frames = []
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        if inspect.iscoroutine(awaitable) or inspect.isgenerator(awaitable):
+            frames.append(awaitable.__qualname__)
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(
+                awaitable, "gi_yieldfrom", None
+            )
+        else:
+            frames.append(type(awaitable).__name__)
+            break
+    return ";".join(frames)
+
+
+def _profile(config: Config, phase: str) -> contextlib.AbstractContextManager[None]:
+    """Returns a context that is profiled as the specified phase, if enabled."""
+    profiler = config.stash.get(_profiler, None)
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.profiling(phase)
+
+
+@contextlib.contextmanager
+def _instrument_fixture_phase(
+    request: FixtureRequest, fixturedef: FixtureDef, phase: str
+) -> Iterator[None]:
+    """Applies the optional instrumentation to the setup or teardown of a fixture."""
+    name = f"{phase} {fixturedef.argname}"
+    with (
+        _trace(request.config, name, "fixture"),
+        _profile(request.config, name),
+        _fixture_resource_owner(request),
+        _advise_fixture(request, fixturedef, phase),
+        _measure_fixture_lag(request, fixturedef),
+        _track_fixture_memory(request, fixturedef, phase),
+    ):
+        yield
+
+
+def _track_fixture_memory(
+    request: FixtureRequest, fixturedef: FixtureDef, phase: str
+) -> contextlib.AbstractContextManager[None]:
+    memory_tracker = request.config.stash.get(_memory_tracker, None)
+    if memory_tracker is None or phase != "setup":
+        return contextlib.nullcontext()
+    return memory_tracker.tracking_fixture(request, fixturedef)
+
+
+def _measure_fixture_lag(
+    request: FixtureRequest, fixturedef: FixtureDef
+) -> contextlib.AbstractContextManager[_LagHistogram | None]:
+    lag_monitor = request.config.stash.get(_lag_monitor, None)
+    if lag_monitor is None or not lag_monitor.report:
+        return contextlib.nullcontext()
+    return lag_monitor.measuring(lag_monitor.fixture_histogram(fixturedef))
+
+
+@contextlib.contextmanager
+def _advise_fixture(
+    request: FixtureRequest, fixturedef: FixtureDef, phase: str
+) -> Iterator[None]:
+    advisor = request.config.stash.get(_loop_scope_advisor, None)
+    if advisor is None:
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    advisor.record_fixture(
+        request, fixturedef, time.perf_counter() - start, setup=phase == "setup"
+    )
+
+
+def _fixture_resource_owner(
+    request: FixtureRequest,
+) -> contextlib.AbstractContextManager[None]:
+    """
+    Returns a context in which resources are attributed to the owner of the fixture.
+
+    Resources created by fixtures with a scope wider than "function" are
+    expected to outlive the current test, so they are not attributed to it.
+    """
+    leak_tracker = request.config.stash.get(_leak_tracker, None)
+    if leak_tracker is None or request.scope == "function":
+        return contextlib.nullcontext()
+    return leak_tracker.owned_by(None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(
+    item: Item, nextitem: Item | None
+) -> Generator[None, pluggy.Result, None]:
+    leak_tracker = item.config.stash.get(_leak_tracker, None)
+    profiler = item.config.stash.get(_profiler, None)
+    memory_tracker = item.config.stash.get(_memory_tracker, None)
+    gc_controller = item.config.stash.get(_gc_controller, None)
+    if gc_controller is not None:
+        # The item is finished in pytest_runtest_teardown
+        gc_controller.start_item(item)
+    task_counter = item.config.stash.get(_task_counter, None)
+    if task_counter is not None:
+        # The item is finished in pytest_runtest_teardown
+        task_counter.start_item()
+    if leak_tracker is None and profiler is None and memory_tracker is None:
+        yield
+        return
+    with contextlib.ExitStack() as stack:
+        if leak_tracker is not None:
+            stack.enter_context(leak_tracker.owned_by(item.nodeid))
+        if profiler is not None:
+            stack.enter_context(profiler.profiling_item(item))
+        if memory_tracker is not None:
+            # The item is finished in pytest_runtest_teardown
+            memory_tracker.start_item()
+        yield
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_teardown(item: Item, nextitem: Item | None) -> None:
+    # Every finisher runs, even if another one raises. The callbacks run in
+    # reverse order: the memory tracker measures first, and the leak tracker,
+    # which fails the test under asyncio_leak_policy=fail, runs last.
+    with contextlib.ExitStack() as stack:
+        leak_tracker = item.config.stash.get(_leak_tracker, None)
+        if leak_tracker is not None:
+            stack.callback(leak_tracker.finish_item, item)
+        task_counter = item.config.stash.get(_task_counter, None)
+        if task_counter is not None:
+            stack.callback(task_counter.finish_item, item)
+        gc_controller = item.config.stash.get(_gc_controller, None)
+        if gc_controller is not None:
+            stack.callback(gc_controller.finish_item, item)
+        memory_tracker = item.config.stash.get(_memory_tracker, None)
+        if memory_tracker is not None:
+            stack.callback(memory_tracker.finish_item, item)
+
+
+def pytest_collection_finish(session: Session) -> None:
+    gc_controller = session.config.stash.get(_gc_controller, None)
+    if gc_controller is not None:
+        gc_controller.freeze()
+
+
+@pytest.hookimpl(specname="pytest_fixture_setup", hookwrapper=True)
+def pytest_fixture_setup_freeze_gc(
+    fixturedef: FixtureDef, request: FixtureRequest
+) -> Generator[None, pluggy.Result, None]:
+    # Session-scoped fixtures live until the end of the session. Fixtures with
+    # narrower scopes are not frozen, so their garbage can still be collected.
+    yield
+    gc_controller = request.config.stash.get(_gc_controller, None)
+    if gc_controller is not None and fixturedef.scope == "session":
+        gc_controller.freeze()
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_pyfunc_call(pyfuncitem: Function) -> object | None:
+    """
+    Pytest hook called before a test case is run.
+
+    Wraps marked tests in a synchronous function
+    where the wrapped test coroutine is executed in an event loop.
+    """
+    if pyfuncitem.get_closest_marker("asyncio") is not None:
+        if isinstance(pyfuncitem, PytestAsyncioFunction):
+            asyncio_mode = _get_asyncio_mode(pyfuncitem.config)
+            for fixname, fixtures in pyfuncitem._fixtureinfo.name2fixturedefs.items():
+                # name2fixturedefs is a dict between fixture name and a list of matching
+                # fixturedefs. The last entry in the list is closest and the one used.
+                func = fixtures[-1].func
+                if (
+                    asyncio_mode == Mode.STRICT
+                    and _is_coroutine_or_asyncgen(func)
+                    and not _is_asyncio_fixture_function(func)
+                ):
+                    warnings.warn(
+                        PytestDeprecationWarning(
+                            f"asyncio test {pyfuncitem.name!r} requested async "
+                            "@pytest.fixture "
+                            f"{fixname!r} in strict mode. "
                             "You might want to use @pytest_asyncio.fixture or switch "
                             "to auto mode. "
                             "This will become an error in future versions of "
@@ -1042,16 +3590,26 @@ def pytest_pyfunc_call(pyfuncitem: Function) -> object | None:
                     "check for global marks applied via 'pytestmark'."
                 )
             )
-    yield
+    with (
+        _trace(pyfuncitem.config, pyfuncitem.nodeid, "test"),
+        _profile(pyfuncitem.config, "call"),
+    ):
+        yield
     return None
 
 
 def wrap_in_sync(
     func: Callable[..., Awaitable[Any]],
+    shared_contexts: _SharedContexts | None = None,
+    loop: AbstractEventLoop | None = None,
+    timeout: float | None = None,
 ):
     """
     Return a sync wrapper around an async function executing it in the
-    current event loop.
+    specified event loop or, if no loop is given, in the current event loop.
+
+    If shared_contexts is given, the function runs in the context of the loop.
+    If timeout is given, the function is cancelled after timeout seconds.
     """
     # if the function is already wrapped, we rewrap using the original one
     # not using __wrapped__ because the original function may already be
@@ -1063,10 +3621,14 @@ def wrap_in_sync(
     @functools.wraps(func)
     def inner(*args, **kwargs):
         coro = func(*args, **kwargs)
-        _loop = _get_event_loop_no_warn()
-        task = asyncio.ensure_future(coro, loop=_loop)
+        _loop = _get_event_loop_no_warn() if loop is None else loop
+        if shared_contexts is None:
+            with _creating_plugin_task(coro):
+                task = asyncio.ensure_future(coro, loop=_loop)
+        else:
+            task = _create_task_in_context(_loop, coro, shared_contexts.for_loop(_loop))
         try:
-            _loop.run_until_complete(task)
+            _run_until_complete(_loop, task, timeout, "The test")
         except BaseException:
             # run_until_complete doesn't get the result from exceptions
             # that are not subclasses of `Exception`. Consume all
@@ -1079,6 +3641,140 @@ def wrap_in_sync(
     return inner
 
 
+def _run_until_complete(
+    loop: AbstractEventLoop,
+    task: asyncio.Task[_T],
+    timeout: float | None,
+    description: str,
+) -> _T:
+    """
+    Runs the loop until the task is done and returns its result.
+
+    If the task takes longer than timeout seconds, the stacks of all pending tasks
+    are recorded. The task and the tasks created while it ran are cancelled,
+    and the current test fails.
+    """
+    if timeout is None:
+        return loop.run_until_complete(task)
+    preexisting_tasks = asyncio.all_tasks(loop) - {task}
+    pending_task_stacks: list[str] = []
+
+    def cancel_tasks() -> None:
+        if task.done():
+            return
+        # The timed out task comes first, followed by the others in a stable order
+        other_tasks = sorted(
+            (
+                pending_task
+                for pending_task in asyncio.all_tasks(loop) - {task}
+                if not pending_task.done()
+            ),
+            key=asyncio.Task.get_name,
+        )
+        tasks = [task, *other_tasks]
+        pending_task_stacks.extend(map(_format_task_stack, tasks))
+        for pending_task in tasks:
+            if pending_task not in preexisting_tasks:
+                pending_task.cancel()
+
+    timeout_handle = loop.call_later(timeout, cancel_tasks)
+    try:
+        result = loop.run_until_complete(task)
+    except BaseException:
+        if not pending_task_stacks:
+            raise
+    else:
+        # The task may have completed in spite of being cancelled
+        if not pending_task_stacks:
+            return result
+    finally:
+        timeout_handle.cancel()
+    cancelled_tasks = [
+        cancelled_task
+        for cancelled_task in asyncio.all_tasks(loop)
+        if cancelled_task not in preexisting_tasks
+    ]
+    if cancelled_tasks:
+        # Give the cancelled tasks a chance to clean up
+        wait = asyncio.wait(cancelled_tasks, timeout=timeout)
+        with _creating_plugin_task(wait):
+            loop.run_until_complete(wait)
+    pytest.fail(
+        f"{description} timed out after {timeout:g}s. "
+        f"Stacks of the pending tasks:\n\n" + "\n\n".join(pending_task_stacks),
+        pytrace=False,
+    )
+
+
+def _format_task_stack(task: asyncio.Task[Any]) -> str:
+    """Formats the chain of coroutines the task is suspended on, outermost first."""
+    lines = [f"Task {task.get_name()!r}:"]
+    awaitable: Any = task.get_coro()
+    while awaitable is not None:
+        frame = (
+            getattr(awaitable, "cr_frame", None)
+            or getattr(awaitable, "ag_frame", None)
+            or getattr(awaitable, "gi_frame", None)
+        )
+        if frame is None:
+            # Futures are awaited through an iterator, which doesn't reveal them
+            waiter = getattr(task, "_fut_waiter", None) or awaitable
+            lines.append(f"  awaiting {waiter!r}")
+            break
+        filename = frame.f_code.co_filename
+        lines.append(
+            f'  File "{filename}", line {frame.f_lineno}, in {awaitable.__qualname__}'
+        )
+        source_line = linecache.getline(filename, frame.f_lineno).strip()
+        if source_line:
+            lines.append(f"    {source_line}")
+        awaitable = (
+            getattr(awaitable, "cr_await", None)
+            or getattr(awaitable, "ag_await", None)
+            or getattr(awaitable, "gi_yieldfrom", None)
+        )
+    return "\n".join(lines)
+
+
+def _get_timeout(item: Item) -> float | None:
+    """
+    Returns the timeout of the item in seconds, if any.
+
+    The timeout is taken from the closest asyncio marker that defines it,
+    or from the asyncio_default_timeout ini option.
+    """
+    try:
+        return item.stash[_timeout]
+    except KeyError:
+        pass
+    kwargs = _get_closest_marker_kwargs(item, ("timeout",))
+    timeout = kwargs.get("timeout", item.config.getini("asyncio_default_timeout"))
+    try:
+        item.stash[_timeout] = _optional_limit("timeout", timeout or None, float)
+    except ValueError as e:
+        raise ValueError(f"Invalid asyncio timeout for {item.nodeid}: {e}") from e
+    return item.stash[_timeout]
+
+
+_timeout = StashKey["float | None"]()
+
+
+def _get_item_event_loop(item: Function) -> AbstractEventLoop:
+    """
+    Returns the event loop in which the specified test runs.
+
+    The loop is taken from the event loop fixture that was registered for the item
+    during test setup.
+    """
+    event_loop_fixture_id = item.stash.get(_event_loop_fixture_id, None)
+    if event_loop_fixture_id is None:
+        raise PytestAsyncioError(
+            f"{item.nodeid} has no event loop, because it was not set up as an "
+            "asyncio test. Make sure the test is marked with pytest.mark.asyncio."
+        )
+    return cast(AbstractEventLoop, item.funcargs[event_loop_fixture_id])
+
+
 _MULTIPLE_LOOPS_REQUESTED_ERROR = dedent(
     """\
         Multiple asyncio event loops with different scopes have been requested
@@ -1097,11 +3793,9 @@ def pytest_runtest_setup(item: pytest.Item) -> None:
         return
     default_loop_scope = _get_default_test_loop_scope(item.config)
     scope = _get_marked_loop_scope(marker, default_loop_scope)
-    if scope != "function":
-        parent_node = _retrieve_scope_root(item, scope)
-        event_loop_fixture_id = parent_node.stash[_event_loop_fixture_id]
-    else:
-        event_loop_fixture_id = "event_loop"
+    event_loop_fixture_id = _get_event_loop_fixture_id(item, scope)
+    assert event_loop_fixture_id
+    item.stash[_event_loop_fixture_id] = event_loop_fixture_id
     fixturenames = item.fixturenames  # type: ignore[attr-defined]
     if event_loop_fixture_id not in fixturenames:
         fixturenames.append(event_loop_fixture_id)
@@ -1115,6 +3809,99 @@ def pytest_runtest_setup(item: pytest.Item) -> None:
         )
 
 
+# The name under which async doctest examples find their runner in the globals
+_ASYNC_DOCTEST_RUNNER = "__pytest_asyncio_run_example"
+# The code objects of the doctest examples that use top-level await
+_async_doctest_examples = StashKey["list[types.CodeType]"]()
+
+
+@pytest.hookimpl(specname="pytest_runtest_setup", trylast=True)
+def pytest_runtest_setup_async_doctest(item: Item) -> None:
+    """
+    Prepares doctests containing top-level await to run in an event loop.
+
+    Examples that use top-level await are compiled as coroutines. They run in the
+    module-scoped event loop, which is shared by all doctests of the module.
+    Examples without await are left to the doctest runner as usual.
+    """
+    dtest = getattr(item, "dtest", None)
+    if dtest is None:
+        return
+    try:
+        code_objects = item.stash[_async_doctest_examples]
+    except KeyError:
+        code_objects = item.stash[_async_doctest_examples] = (
+            _compile_async_doctest_examples(dtest)
+        )
+    if not code_objects:
+        return
+    event_loop_fixture_id = _get_event_loop_fixture_id(item, "module")
+    if event_loop_fixture_id is None:
+        _activate(item.config, item)
+        event_loop_fixture_id = _get_event_loop_fixture_id(item, "module")
+    assert event_loop_fixture_id
+    item.stash[_event_loop_fixture_id] = event_loop_fixture_id
+    # The doctest plugin provides getfixture to the examples during setup
+    loop = dtest.globs["getfixture"](event_loop_fixture_id)
+    dtest.globs[_ASYNC_DOCTEST_RUNNER] = functools.partial(
+        _run_async_doctest_example,
+        loop,
+        code_objects,
+        dtest.globs,
+        _get_timeout(item),
+    )
+
+
+def _compile_async_doctest_examples(dtest: Any) -> list[types.CodeType]:
+    """
+    Compiles the doctest examples that use top-level await.
+
+    The source of each such example is replaced by a call to the async example
+    runner, so that the doctest runner still checks its output and exceptions.
+    """
+    code_objects: list[types.CodeType] = []
+    for index, example in enumerate(dtest.examples):
+        # The doctest runner serves the source of "<doctest ...>" filenames from
+        # the rewritten examples, so the original source is registered separately
+        filename = f"<async doctest {dtest.name}[{index}]>"
+        try:
+            code = compile(
+                example.source,
+                filename,
+                "single",
+                flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT,
+                dont_inherit=True,
+            )
+        except SyntaxError:
+            # The doctest runner reports the error when it runs the example
+            continue
+        if not code.co_flags & inspect.CO_COROUTINE:
+            continue
+        linecache.cache[filename] = (
+            len(example.source),
+            None,
+            example.source.splitlines(keepends=True),
+            filename,
+        )
+        example.source = f"{_ASYNC_DOCTEST_RUNNER}({len(code_objects)})\n"
+        code_objects.append(code)
+    return code_objects
+
+
+def _run_async_doctest_example(
+    loop: AbstractEventLoop,
+    code_objects: list[types.CodeType],
+    globs: dict[str, Any],
+    timeout: float | None,
+    index: int,
+) -> None:
+    code = code_objects[index]
+    coro = eval(code, globs)
+    with _creating_plugin_task(coro):
+        task = loop.create_task(coro)
+    _run_until_complete(loop, task, timeout, f"Example {code.co_filename}")
+
+
 _DUPLICATE_LOOP_SCOPE_DEFINITION_ERROR = """\
 An asyncio pytest marker defines both "scope" and "loop_scope", \
 but it should only use "loop_scope".
@@ -1126,14 +3913,39 @@ Please use the "loop_scope" argument instead.
 """
 
 
+_BUDGET_MARKER_KWARGS = ("max_duration", "max_cpu", "max_loop_iterations", "max_lag")
+_LOAD_TEST_MARKER_KWARGS = ("repeat", "concurrency", "max_p50", "max_p95", "max_p99")
+_ASYNCIO_MARKER_KWARGS = {
+    "loop_scope",
+    "scope",
+    "timeout",
+    "gc",
+    *_BUDGET_MARKER_KWARGS,
+    *_LOAD_TEST_MARKER_KWARGS,
+}
+
+
 def _get_marked_loop_scope(
     asyncio_marker: Mark, default_loop_scope: _ScopeName
 ) -> _ScopeName:
     assert asyncio_marker.name == "asyncio"
     if asyncio_marker.args or (
-        asyncio_marker.kwargs and set(asyncio_marker.kwargs) - {"loop_scope", "scope"}
+        asyncio_marker.kwargs and set(asyncio_marker.kwargs) - _ASYNCIO_MARKER_KWARGS
     ):
-        raise ValueError("mark.asyncio accepts only a keyword argument 'loop_scope'.")
+        raise ValueError(
+            "mark.asyncio accepts only a keyword argument 'loop_scope' or one of "
+            "the keyword arguments "
+            + ", ".join(
+                repr(kwarg)
+                for kwarg in (
+                    "timeout",
+                    "gc",
+                    *_BUDGET_MARKER_KWARGS,
+                    *_LOAD_TEST_MARKER_KWARGS,
+                )
+            )
+            + "."
+        )
     if "scope" in asyncio_marker.kwargs:
         if "loop_scope" in asyncio_marker.kwargs:
             raise pytest.UsageError(_DUPLICATE_LOOP_SCOPE_DEFINITION_ERROR)
@@ -1151,18 +3963,344 @@ def _get_default_test_loop_scope(config: Config) -> _ScopeName:
     return config.getini("asyncio_default_test_loop_scope")
 
 
+class _TestBudget:
+    """Limits of the loop time, CPU time, iterations and lag of a single test."""
+
+    def __init__(
+        self,
+        max_duration: float | None,
+        max_cpu: float | None,
+        max_loop_iterations: int | None,
+        max_lag: float | None = None,
+    ) -> None:
+        self.max_duration = max_duration
+        self.max_cpu = max_cpu
+        self.max_loop_iterations = max_loop_iterations
+        self.max_lag = max_lag
+
+    @classmethod
+    def for_item(cls, item: Item) -> _TestBudget | None:
+        """
+        Returns the budget of the item, if any.
+
+        Each limit is taken from the closest asyncio marker that defines it,
+        so that a module-level or class-level pytestmark can provide defaults
+        for the tests it contains. The ini options are used as a fallback.
+        """
+        limits = _get_closest_marker_kwargs(item, _BUDGET_MARKER_KWARGS)
+        for kwarg in _BUDGET_MARKER_KWARGS:
+            if kwarg not in limits:
+                limits[kwarg] = item.config.getini(f"asyncio_default_{kwarg}") or None
+        if all(limit is None for limit in limits.values()):
+            return None
+        try:
+            return cls(
+                max_duration=_optional_limit(
+                    "max_duration", limits["max_duration"], float
+                ),
+                max_cpu=_optional_limit("max_cpu", limits["max_cpu"], float),
+                max_loop_iterations=_optional_limit(
+                    "max_loop_iterations", limits["max_loop_iterations"], int
+                ),
+                max_lag=_optional_limit("max_lag", limits["max_lag"], float),
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid asyncio budget for {item.nodeid}: {e}") from e
+
+    @contextlib.contextmanager
+    def enforce(
+        self, item: Item, loop: AbstractEventLoop, lag: _LagHistogram | None = None
+    ) -> Iterator[None]:
+        """
+        Fails the test if the code inside the context exceeds the budget.
+
+        The loop lag budget is checked against the lag histogram of the test.
+        """
+        loop_iterations = 0
+        run_once = None
+        if self.max_loop_iterations is not None:
+            run_once = getattr(loop, "_run_once", None)
+        count_iterations = run_once is not None
+        # Other instrumentation may have overridden the method on the instance
+        overridden = "_run_once" in getattr(loop, "__dict__", {})
+        if run_once is not None:
+
+            def counting_run_once() -> None:
+                nonlocal loop_iterations
+                loop_iterations += 1
+                run_once()
+
+            loop._run_once = counting_run_once  # type: ignore[attr-defined]
+        loop_start = loop.time()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            duration = loop.time() - loop_start
+            cpu_time = time.process_time() - cpu_start
+            if count_iterations and overridden:
+                loop._run_once = run_once  # type: ignore[attr-defined]
+            elif count_iterations:
+                del loop._run_once  # type: ignore[attr-defined]
+        breakdown = [
+            _budget_line("duration", duration, self.max_duration, "{:.3f}s"),
+            _budget_line("cpu", cpu_time, self.max_cpu, "{:.3f}s"),
+        ]
+        if count_iterations:
+            breakdown.append(
+                _budget_line(
+                    "loop iterations", loop_iterations, self.max_loop_iterations, "{}"
+                )
+            )
+        if self.max_lag is not None and lag is not None:
+            breakdown.append(
+                _budget_line(
+                    "loop lag p99", lag.percentile(99) or 0.0, self.max_lag, "{:.3f}s"
+                )
+            )
+        if any(exceeded for exceeded, _ in breakdown):
+            pytest.fail(
+                f"{item.nodeid} exceeded its asyncio budget:\n"
+                + "\n".join(f"    {line}" for _, line in breakdown),
+                pytrace=False,
+            )
+
+
+class _LoadTest:
+    """Runs the body of a test repeatedly and concurrently in the same event loop."""
+
+    def __init__(
+        self,
+        repeat: int,
+        concurrency: int,
+        max_percentiles: Mapping[str, float | None],
+    ) -> None:
+        self.repeat = repeat
+        self.concurrency = concurrency
+        self.max_percentiles = max_percentiles
+
+    @classmethod
+    def for_item(cls, item: Item) -> _LoadTest | None:
+        kwargs = _get_closest_marker_kwargs(item, _LOAD_TEST_MARKER_KWARGS)
+        repeat = kwargs.get("repeat", item.config.getoption("asyncio_load"))
+        if repeat is None:
+            return None
+        try:
+            return cls(
+                repeat=_optional_limit("repeat", repeat, int),  # type: ignore[arg-type]
+                concurrency=_optional_limit(  # type: ignore[arg-type]
+                    "concurrency",
+                    kwargs.get(
+                        "concurrency", item.config.getoption("asyncio_load_concurrency")
+                    ),
+                    int,
+                ),
+                max_percentiles={
+                    percentile: _optional_limit(
+                        f"max_{percentile}", kwargs.get(f"max_{percentile}"), float
+                    )
+                    for percentile in _LOAD_TEST_PERCENTILES
+                },
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid asyncio load test for {item.nodeid}: {e}") from e
+
+    @classmethod
+    def apply(
+        cls, item: Item, func: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """Turns the test function into a load test, if the item requests it."""
+        load_test = cls.for_item(item)
+        if load_test is None:
+            return func
+        # Unwrap the test function in case the item is run more than once
+        func = getattr(func, "_raw_test_func", func)
+        func = getattr(func, "_load_tested_func", func)
+        return load_test.wrap(item, func)
+
+    def wrap(
+        self, item: Item, func: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def load_test(*args, **kwargs):
+            latencies: list[float] = []
+            errors: list[Exception] = []
+            runs = iter(range(self.repeat))
+
+            async def worker() -> None:
+                for _ in runs:
+                    start = time.perf_counter()
+                    try:
+                        await func(*args, **kwargs)
+                    except Exception as e:
+                        errors.append(e)
+                    else:
+                        latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            workers = []
+            for _ in range(min(self.concurrency, self.repeat)):
+                worker_coro = worker()
+                with _creating_plugin_task(worker_coro):
+                    workers.append(asyncio.ensure_future(worker_coro))
+            try:
+                await asyncio.gather(*workers)
+            except BaseException:
+                # pytest.fail, pytest.skip and cancellation abort the load test
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                elapsed = time.perf_counter() - start
+                self._report(item, latencies, len(errors), elapsed, aborted=True)
+                raise
+            elapsed = time.perf_counter() - start
+            self._report(item, latencies, len(errors), elapsed)
+            if errors:
+                raise errors[0]
+
+        load_test._load_tested_func = func  # type: ignore[attr-defined]
+        return load_test
+
+    def _report(
+        self,
+        item: Item,
+        latencies: list[float],
+        error_count: int,
+        elapsed: float,
+        aborted: bool = False,
+    ) -> None:
+        latencies.sort()
+        percentiles = {
+            percentile: _percentile(latencies, int(percentile[1:]))
+            for percentile in _LOAD_TEST_PERCENTILES
+        }
+        runs = len(latencies) + error_count
+        throughput = runs / elapsed if elapsed else float("inf")
+        summary = (
+            f"{runs} runs{' (aborted)' if aborted else ''}, "
+            f"concurrency {self.concurrency}, "
+            f"{error_count} errors, {throughput:.1f} runs/s, "
+            + ", ".join(
+                f"{percentile} {_format_latency(latency)}"
+                for percentile, latency in percentiles.items()
+            )
+        )
+        item.add_report_section("call", "asyncio load test", summary)
+        item.user_properties.extend(
+            [
+                ("asyncio_load_runs", runs),
+                ("asyncio_load_errors", error_count),
+                ("asyncio_load_throughput", throughput),
+                *(
+                    (f"asyncio_load_{percentile}", latency)
+                    for percentile, latency in percentiles.items()
+                ),
+            ]
+        )
+        item.config.stash.setdefault(_load_test_summaries, []).append(
+            (item.nodeid, summary)
+        )
+        exceeded = [
+            f"{percentile} {_format_latency(percentiles[percentile])} "
+            f"exceeds {_format_latency(limit)}"
+            for percentile, limit in self.max_percentiles.items()
+            if limit is not None
+            and percentiles[percentile] is not None
+            and percentiles[percentile] > limit  # type: ignore[operator]
+        ]
+        if exceeded and not error_count and not aborted:
+            pytest.fail(
+                f"{item.nodeid} exceeded its latency thresholds: "
+                + "; ".join(exceeded)
+                + f"\n{summary}",
+                pytrace=False,
+            )
+
+
+_LOAD_TEST_PERCENTILES = ("p50", "p95", "p99")
+_load_test_summaries = StashKey[list[tuple[str, str]]]()
+
+
+def _percentile(sorted_values: Sequence[float], percent: int) -> float | None:
+    """Returns the percentile of the sorted values using the nearest-rank method."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+def _format_latency(latency: float | None) -> str:
+    return "n/a" if latency is None else f"{latency * 1000:.2f}ms"
+
+
+def _get_closest_marker_kwargs(item: Item, names: Iterable[str]) -> dict[str, Any]:
+    """
+    Returns the specified keyword arguments of the item's asyncio markers.
+
+    Each argument is taken from the closest marker that defines it.
+    """
+    kwargs: dict[str, Any] = {}
+    for marker in item.iter_markers("asyncio"):
+        for name in names:
+            if name in marker.kwargs:
+                kwargs.setdefault(name, marker.kwargs[name])
+    return kwargs
+
+
+def _optional_limit(name: str, value: object, type_: Callable[[Any], _T]) -> _T | None:
+    if value is None:
+        return None
+    limit = type_(value)
+    if limit <= 0:  # type: ignore[operator]
+        raise ValueError(f"{name} must be positive, got {value!r}")
+    return limit
+
+
+def _budget_line(
+    name: str, value: float, limit: float | None, value_format: str
+) -> tuple[bool, str]:
+    line = f"{name}: {value_format.format(value)}"
+    if limit is None:
+        return False, line
+    line += f" (budget: {value_format.format(limit)})"
+    exceeded = value > limit
+    if exceeded:
+        line += " EXCEEDED"
+    return exceeded, line
+
+
+_scope_roots = StashKey[dict[str, Collector]]()
+_scope_root_type_by_scope: Mapping[str, type[Collector]] = {
+    "class": Class,
+    "module": Module,
+    "package": Package,
+    "session": Session,
+}
+
+
 def _retrieve_scope_root(item: Collector | Item, scope: str) -> Collector:
-    node_type_by_scope = {
-        "class": Class,
-        "module": Module,
-        "package": Package,
-        "session": Session,
-    }
-    scope_root_type = node_type_by_scope[scope]
-    for node in reversed(item.listchain()):
-        if isinstance(node, scope_root_type):
-            assert isinstance(node, pytest.Collector)
-            return node
+    """
+    Returns the closest collector of the specified scope that contains the item.
+
+    The result is memoized in the stash of the item and of every collector
+    between the item and the scope root, so that later lookups for the same item
+    or for its siblings take constant time.
+    """
+    scope_root_type = _scope_root_type_by_scope[scope]
+    visited_scope_roots: list[dict[str, Collector]] = []
+    node: Collector | Item | None = item
+    while node is not None:
+        scope_roots = node.stash.setdefault(_scope_roots, {})
+        scope_root = scope_roots.get(scope)
+        if scope_root is None and isinstance(node, scope_root_type):
+            scope_root = node
+        if scope_root is not None:
+            for visited in visited_scope_roots:
+                visited[scope] = scope_root
+            scope_roots[scope] = scope_root
+            return scope_root
+        visited_scope_roots.append(scope_roots)
+        node = node.parent  # type: ignore[assignment]
     error_message = (
         f"{item.name} is marked to be run in an event loop with scope {scope}, "
         f"but is not part of any {scope}."
@@ -1174,26 +4312,188 @@ def _retrieve_scope_root(item: Collector | Item, scope: str) -> Collector:
 def event_loop(request: FixtureRequest) -> Iterator[asyncio.AbstractEventLoop]:
     """Create an instance of the default event loop for each test case."""
     new_loop_policy = request.getfixturevalue(event_loop_policy.__name__)
-    with _temporary_event_loop_policy(new_loop_policy), _provide_event_loop() as loop:
+    with _provide_fixture_event_loop(request, new_loop_policy) as loop:
         yield loop
 
 
 @contextlib.contextmanager
-def _provide_event_loop() -> Iterator[asyncio.AbstractEventLoop]:
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+def _provide_fixture_event_loop(
+    request: FixtureRequest, policy: AbstractEventLoopPolicy
+) -> Iterator[asyncio.AbstractEventLoop]:
+    """Provides the event loop of an event loop fixture under the specified policy."""
+    advisor = request.config.stash.get(_loop_scope_advisor, None)
+    with contextlib.ExitStack() as stack:
+        start = time.perf_counter()
+        stack.enter_context(_temporary_event_loop_policy(policy))
+        stack.enter_context(_shared_child_watcher(request.config, policy))
+        loop = stack.enter_context(_provide_event_loop(request.config))
+        overhead = time.perf_counter() - start
+        memory_tracker = request.config.stash.get(_memory_tracker, None)
+        if memory_tracker is not None:
+            memory_tracker.track_loop(
+                loop,
+                f"{request.scope}-scoped loop of {request.node.nodeid or '<session>'}",
+            )
+        yield loop
+        start = time.perf_counter()
+        stack.close()
+        overhead += time.perf_counter() - start
+        if advisor is not None:
+            advisor.record_loop(request.node, request.scope, overhead)
+
+
+@contextlib.contextmanager
+def _provide_event_loop(config: Config) -> Iterator[asyncio.AbstractEventLoop]:
+    with _trace(config, "create event loop", "loop"):
+        loop = asyncio.get_event_loop_policy().new_event_loop()
     # Add a magic value to the event loop, so pytest-asyncio can determine if the
     # event_loop fixture was overridden. Other implementations of event_loop don't
     # set this value.
     # The magic value must be set as part of the function definition, because pytest
     # seems to have multiple instances of the same FixtureDef or fixture function
     loop = _make_pytest_asyncio_loop(loop)
+    _instrument_event_loop(config, loop)
     try:
         yield loop
     finally:
-        try:
-            loop.run_until_complete(loop.shutdown_asyncgens())
-        finally:
-            loop.close()
+        with _trace(config, "close event loop", "loop"):
+            _release_event_loop(config, loop)
+            shutdown = loop.shutdown_asyncgens()
+            try:
+                with _creating_plugin_task(shutdown):
+                    loop.run_until_complete(shutdown)
+            finally:
+                loop.close()
+
+
+def _instrument_event_loop(config: Config, loop: AbstractEventLoop) -> None:
+    """Installs the optional instrumentation of pytest-asyncio on a new loop."""
+    leak_tracker = config.stash.get(_leak_tracker, None)
+    if leak_tracker is not None:
+        leak_tracker.install(loop)
+    trace_recorder = config.stash.get(_trace_recorder, None)
+    if trace_recorder is not None and trace_recorder.trace_tasks:
+        trace_recorder.install(loop)
+    profiler = config.stash.get(_profiler, None)
+    if profiler is not None:
+        profiler.install(loop)
+    lag_monitor = config.stash.get(_lag_monitor, None)
+    if lag_monitor is not None:
+        lag_monitor.install(loop)
+    task_counter = config.stash.get(_task_counter, None)
+    if task_counter is not None:
+        task_counter.install(loop)
+
+
+def _release_event_loop(config: Config, loop: AbstractEventLoop) -> None:
+    """Gives the instrumentation a chance to inspect the loop before it is closed."""
+    leak_tracker = config.stash.get(_leak_tracker, None)
+    if leak_tracker is not None:
+        leak_tracker.release_loop(loop)
+
+
+def _can_use_pidfd() -> bool:
+    """
+    Returns whether child processes can be watched by the shared pidfd watcher.
+
+    The watcher is only used where the child watcher of asyncio can be replaced,
+    that is on Python versions before 3.12. Later versions watch child processes
+    through pidfds by default.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return False
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return False
+    return True
+
+
+if sys.version_info < (3, 12) and sys.platform != "win32":
+
+    class _PidfdChildWatcher(asyncio.AbstractChildWatcher):
+        """
+        Watches child processes through pidfds in whichever event loop is running.
+
+        Before Python 3.12, asyncio.PidfdChildWatcher is bound to a single event loop
+        and the default ThreadedChildWatcher starts a thread for every child process.
+        This watcher registers the pidfd of each child with the loop that started
+        the child, so it can be shared by all event loops of pytest-asyncio.
+        """
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info: object) -> None:
+            pass
+
+        def is_active(self) -> bool:
+            return True
+
+        def close(self) -> None:
+            pass
+
+        def attach_loop(self, loop: AbstractEventLoop | None) -> None:
+            pass
+
+        def add_child_handler(
+            self,
+            pid: int,
+            callback: Callable[[int, int, Unpack[_Ts]], object],
+            *args: Unpack[_Ts],
+        ) -> None:
+            loop = asyncio.get_running_loop()
+            pidfd = os.pidfd_open(pid)
+            loop.add_reader(pidfd, self._do_wait, loop, pid, pidfd, callback, args)
+
+        def remove_child_handler(self, pid: int) -> bool:
+            # The pidfd is closed once the child has exited
+            return True
+
+        @staticmethod
+        def _do_wait(
+            loop: AbstractEventLoop,
+            pid: int,
+            pidfd: int,
+            callback: Callable[[int, int, Unpack[_Ts]], object],
+            args: tuple[Unpack[_Ts]],
+        ) -> None:
+            loop.remove_reader(pidfd)
+            try:
+                _, status = os.waitpid(pid, 0)
+            except ChildProcessError:
+                # The child has been reaped by someone else
+                returncode = 255
+            else:
+                returncode = os.waitstatus_to_exitcode(status)
+            os.close(pidfd)
+            callback(pid, returncode, *args)
+
+
+_child_watcher = StashKey["asyncio.AbstractChildWatcher"]()
+
+
+@contextlib.contextmanager
+def _shared_child_watcher(
+    config: Config, policy: AbstractEventLoopPolicy
+) -> Iterator[None]:
+    """Lets the policy use the child watcher shared by all loops, if there is one."""
+    watcher = config.stash.get(_child_watcher, None)
+    # Only the asyncio policies for Unix have child watchers
+    if watcher is None or not hasattr(policy, "set_child_watcher"):
+        yield
+        return
+    # The watcher is swapped without set_child_watcher, which would close the
+    # previous watcher of the policy. This relies on the private _watcher
+    # attribute of the Unix policies of CPython. The shared watcher only exists
+    # before Python 3.12, where the attribute has been stable. Nested loops
+    # restore the watcher of the enclosing loop.
+    previous_watcher = policy._watcher  # type: ignore[attr-defined]
+    policy._watcher = watcher  # type: ignore[attr-defined]
+    try:
+        yield
+    finally:
+        policy._watcher = previous_watcher  # type: ignore[attr-defined]
 
 
 @pytest.fixture(scope="session")
@@ -1201,12 +4501,13 @@ def _session_event_loop(
     request: FixtureRequest, event_loop_policy: AbstractEventLoopPolicy
 ) -> Iterator[asyncio.AbstractEventLoop]:
     new_loop_policy = event_loop_policy
-    with _temporary_event_loop_policy(new_loop_policy), _provide_event_loop() as loop:
+    with _provide_fixture_event_loop(request, new_loop_policy) as loop:
         asyncio.set_event_loop(loop)
         yield loop
 
 
-@pytest.fixture(scope="session", autouse=True)
+# All tests use the fixture once _register_autouse_event_loop_policy overrides it
+@pytest.fixture(scope="session")
 def event_loop_policy() -> AbstractEventLoopPolicy:
     """Return an instance of the policy used to create asyncio event loops."""
     return asyncio.get_event_loop_policy()
@@ -1217,6 +4518,36 @@ def is_async_test(item: Item) -> bool:
     return isinstance(item, PytestAsyncioFunction)
 
 
+@pytest.fixture(scope="session")
+def process_pool_executor() -> Iterator[concurrent.futures.ProcessPoolExecutor]:
+    """
+    Return a process pool that is shared by all tests of the session.
+
+    Worker processes are forked from a forkserver where available. All workers
+    are started before the pool is returned, so tests do not pay for starting
+    the pool.
+    """
+    import multiprocessing
+
+    mp_context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("forkserver")
+    max_workers = getattr(os, "process_cpu_count", os.cpu_count)() or 1
+    if sys.platform == "win32":
+        # The limit of ProcessPoolExecutor on Windows
+        max_workers = min(max_workers, 61)
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp_context
+    )
+    try:
+        # Unless workers are forked, the pool starts a worker only when a task is
+        # submitted while no worker is idle. One task per worker starts all of them.
+        list(executor.map(int, range(max_workers)))
+        yield executor
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def _unused_port(socket_type: int) -> int:
     """Find an unused localhost port from 1024-65535 and return it."""
     with contextlib.closing(socket.socket(type=socket_type)) as sock:
@@ -1270,3 +4601,131 @@ def unused_udp_port_factory() -> Callable[[], int]:
         return port
 
     return factory
+
+
+class StubResolver:
+    """
+    Answers the getaddrinfo calls of an event loop from a table of host names.
+
+    The table maps host names to lists of IP addresses. Lookups are answered
+    without a round-trip to the default executor of the event loop, and names
+    missing from the table fail immediately rather than reaching the system
+    resolver. IP addresses resolve to themselves.
+    """
+
+    def __init__(self) -> None:
+        self.hosts: dict[str, list[str]] = {"localhost": ["127.0.0.1", "::1"]}
+        self.avoided_executor_calls = 0
+
+    def add(self, host: str, *addresses: str) -> None:
+        """Adds addresses for the host name to the table."""
+        self.hosts.setdefault(host.lower(), []).extend(addresses)
+
+    async def getaddrinfo(
+        self,
+        host: bytes | str | None,
+        port: bytes | str | int | None,
+        *,
+        family: int = 0,
+        type: int = 0,
+        proto: int = 0,
+        flags: int = 0,
+    ) -> list[tuple[Any, ...]]:
+        self.avoided_executor_calls += 1
+        if isinstance(host, bytes):
+            host = host.decode("idna")
+        if host is None:
+            passive = flags & socket.AI_PASSIVE
+            addresses = ["0.0.0.0", "::"] if passive else ["127.0.0.1", "::1"]
+        elif self._is_ip_address(host):
+            addresses = [host]
+        elif flags & socket.AI_NUMERICHOST:
+            raise socket.gaierror(
+                socket.EAI_NONAME, f"{host} is not a numeric host address"
+            )
+        else:
+            try:
+                addresses = self.hosts[host.lower()]
+            except KeyError:
+                raise socket.gaierror(
+                    socket.EAI_NONAME,
+                    f"{host} is not in the table of the asyncio_resolver fixture",
+                ) from None
+        port_number = self._port_number(port)
+        canonname = (host or "") if flags & socket.AI_CANONNAME else ""
+        default_protos: dict[int, int] = {
+            socket.SOCK_STREAM: socket.IPPROTO_TCP,
+            socket.SOCK_DGRAM: socket.IPPROTO_UDP,
+        }
+        socket_types = (
+            [(type, proto or default_protos.get(type, 0))]
+            if type
+            else list(default_protos.items())
+        )
+        infos: list[tuple[Any, ...]] = []
+        for address in addresses:
+            address_family = socket.AF_INET6 if ":" in address else socket.AF_INET
+            if family not in (socket.AF_UNSPEC, address_family):
+                continue
+            sockaddr: tuple[Any, ...] = (
+                (address, port_number, 0, 0)
+                if address_family == socket.AF_INET6
+                else (address, port_number)
+            )
+            for socket_type, socket_proto in socket_types:
+                infos.append(
+                    (address_family, socket_type, socket_proto, canonname, sockaddr)
+                )
+        if not infos:
+            raise socket.gaierror(
+                socket.EAI_NONAME,
+                f"{host} has no address of the requested family",
+            )
+        return infos
+
+    @staticmethod
+    def _is_ip_address(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def _port_number(port: bytes | str | int | None) -> int:
+        if port is None:
+            return 0
+        if isinstance(port, bytes):
+            port = port.decode()
+        if isinstance(port, str) and not port.isdigit():
+            return socket.getservbyname(port)
+        return int(port)
+
+
+@pytest.fixture
+def asyncio_resolver(request: FixtureRequest) -> Iterator[StubResolver]:
+    """
+    Resolves host names in the event loop of the test from a table.
+
+    The getaddrinfo method of the event loop is replaced for the duration of the
+    test. The returned resolver holds the table of host names and counts the
+    calls that did not need the default executor.
+    """
+    event_loop_fixture_id = request.node.stash.get(_event_loop_fixture_id, None)
+    if event_loop_fixture_id is None:
+        raise PytestAsyncioError(
+            f"{request.node.name} requests the asyncio_resolver fixture, "
+            f"but it does not run in an event loop of pytest-asyncio."
+        )
+    loop = request.getfixturevalue(event_loop_fixture_id)
+    resolver = StubResolver()
+    try:
+        loop.getaddrinfo = resolver.getaddrinfo
+    except AttributeError as e:
+        raise PytestAsyncioError(
+            f"The getaddrinfo method of {type(loop).__name__} cannot be replaced."
+        ) from e
+    try:
+        yield resolver
+    finally:
+        del loop.getaddrinfo
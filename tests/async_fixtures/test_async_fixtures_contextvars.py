@@ -245,3 +245,165 @@ def test_var_set_to_existing_value_ok(pytester: Pytester):
     )
     result = pytester.runpytest("--asyncio-mode=strict")
     result.assert_outcomes(passed=1)
+
+
+@pytest.mark.xfail(
+    sys.version_info < (3, 11),
+    reason="requires asyncio Task context support",
+    strict=True,
+)
+def test_var_from_async_fixture_visible_in_shared_context(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_context_mode = shared
+            """
+        )
+    )
+    pytester.makepyfile(
+        _prelude
+        + dedent(
+            """
+        @pytest_asyncio.fixture
+        async def var_fixture_1():
+            with context_var_manager("value1"):
+                yield
+                assert _context_var.get() == "value2"
+
+        @pytest_asyncio.fixture
+        async def var_fixture_2(var_fixture_1):
+            _context_var.set("value2")
+
+        @pytest.mark.asyncio
+        async def test(var_fixture_2):
+            assert _context_var.get() == "value2"
+        """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.xfail(
+    sys.version_info < (3, 11),
+    reason="requires asyncio Task context support",
+    strict=True,
+)
+def test_shared_context_is_owned_by_loop_scope(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_context_mode = shared
+            """
+        )
+    )
+    pytester.makepyfile(
+        _prelude
+        + dedent(
+            """
+        pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+        async def test_sets_var():
+            _context_var.set("value")
+
+        async def test_sees_var_in_same_loop():
+            assert _context_var.get() == "value"
+
+        @pytest.mark.asyncio
+        async def test_does_not_see_var_in_other_loop():
+            with pytest.raises(LookupError):
+                _context_var.get()
+        """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=3)
+
+
+@pytest.mark.xfail(
+    sys.version_info < (3, 11),
+    reason="requires asyncio Task context support",
+    strict=True,
+)
+def test_shared_context_keeps_vars_of_function_scoped_fixtures(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = module
+            asyncio_context_mode = shared
+            """
+        )
+    )
+    pytester.makepyfile(
+        _prelude
+        + dedent(
+            """
+        pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+        @pytest_asyncio.fixture
+        async def sets_var():
+            _context_var.set("value")
+
+        @pytest_asyncio.fixture
+        async def resets_var():
+            with context_var_manager("other value"):
+                yield
+
+        async def test_uses_fixtures(sets_var, resets_var):
+            assert _context_var.get() == "other value"
+
+        async def test_sees_var_of_fixture_of_previous_test():
+            assert _context_var.get() == "value"
+        """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+
+
+def test_shared_context_is_not_visible_to_sync_tests(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_context_mode = shared
+            """
+        )
+    )
+    pytester.makepyfile(
+        _prelude
+        + dedent(
+            """
+        @pytest_asyncio.fixture
+        async def var_fixture():
+            _context_var.set("value")
+
+        def test_sync(var_fixture):
+            with pytest.raises(LookupError):
+                _context_var.get()
+        """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+def test_invalid_context_mode_is_usage_error(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_context_mode = global
+            """
+        )
+    )
+    pytester.makepyfile("def test_nothing(): pass")
+    result = pytester.runpytest()
+    result.stderr.fnmatch_lines(["*'global' is not a valid asyncio_context_mode*"])
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+_CACHED_FIXTURE_MODULE = dedent(
+    """\
+    import pathlib
+    import pytest
+    import pytest_asyncio
+
+    @pytest_asyncio.fixture(
+        scope="session", loop_scope="session", cache="disk", cache_inputs=["data.txt"]
+    )
+    async def expensive():
+        calls = pathlib.Path("calls.txt")
+        calls.write_text(calls.read_text() + "x" if calls.exists() else "x")
+        return pathlib.Path("data.txt").read_text()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_uses_expensive(expensive):
+        assert expensive == pathlib.Path("data.txt").read_text()
+    """
+)
+
+
+def test_second_run_uses_cached_result(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makefile(".txt", data="payload")
+    pytester.makepyfile(_CACHED_FIXTURE_MODULE)
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*asyncio fixture cache: 0 hits, 1 misses*"])
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*asyncio fixture cache: 1 hits, 0 misses*"])
+    assert (pytester.path / "calls.txt").read_text() == "x"
+
+
+def test_changed_input_file_invalidates_cached_result(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makefile(".txt", data="payload")
+    pytester.makepyfile(_CACHED_FIXTURE_MODULE)
+    pytester.runpytest().assert_outcomes(passed=1)
+    pytester.makefile(".txt", data="changed payload")
+    pytester.runpytest().assert_outcomes(passed=1)
+    assert (pytester.path / "calls.txt").read_text() == "xx"
+
+
+def test_cache_clear_option_discards_cached_results(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makefile(".txt", data="payload")
+    pytester.makepyfile(_CACHED_FIXTURE_MODULE)
+    pytester.runpytest().assert_outcomes(passed=1)
+    pytester.runpytest("--asyncio-cache-clear").assert_outcomes(passed=1)
+    assert (pytester.path / "calls.txt").read_text() == "xx"
+
+
+def test_results_exceeding_max_size_are_evicted(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_cache_max_size = 0
+            """
+        )
+    )
+    pytester.makefile(".txt", data="payload")
+    pytester.makepyfile(_CACHED_FIXTURE_MODULE)
+    pytester.runpytest().assert_outcomes(passed=1)
+    pytester.runpytest().assert_outcomes(passed=1)
+    assert (pytester.path / "calls.txt").read_text() == "xx"
+
+
+def test_unpicklable_result_warns(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import threading
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture(cache="disk")
+            async def lock():
+                return threading.Lock()
+
+            @pytest.mark.asyncio
+            async def test_uses_lock(lock):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("-W", "default::pytest.PytestWarning")
+    result.assert_outcomes(passed=1, warnings=1)
+    result.stdout.fnmatch_lines(["*cache='disk' cannot be stored*"])
+
+
+def test_async_generator_fixture_cannot_be_cached(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture(cache="disk")
+            async def resource():
+                yield 1
+
+            def test_nothing():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*resource cannot be cached on disk*"])
+
+
+def test_parametrized_fixture_with_object_params_uses_cached_result(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pathlib
+            import pytest
+            import pytest_asyncio
+
+            class Config:
+                def __init__(self, name):
+                    self.name = name
+
+            @pytest_asyncio.fixture(
+                cache="disk", params=[Config("small"), Config("large")]
+            )
+            async def dataset(request):
+                calls = pathlib.Path("calls.txt")
+                calls.write_text(calls.read_text() + "x" if calls.exists() else "x")
+                return request.param.name
+
+            @pytest.mark.asyncio
+            async def test_uses_dataset(dataset):
+                assert dataset in ("small", "large")
+            """
+        )
+    )
+    pytester.runpytest().assert_outcomes(passed=2)
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["*asyncio fixture cache: 2 hits, 0 misses*"])
+    assert (pytester.path / "calls.txt").read_text() == "xx"
+
+
+def test_cache_directory_is_not_created_without_cached_fixtures(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_nothing():
+                pass
+            """
+        )
+    )
+    pytester.runpytest().assert_outcomes(passed=1)
+    assert not list(pytester.path.glob(".pytest_cache/d/pytest-asyncio-fixtures"))
+
+
+def test_invalid_cache_max_size_is_usage_error(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_cache_max_size = large
+            """
+        )
+    )
+    pytester.makepyfile("def test_nothing(): pass")
+    result = pytester.runpytest()
+    result.stderr.fnmatch_lines(["*'large' is not a valid asyncio_cache_max_size*"])
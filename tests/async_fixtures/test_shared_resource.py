@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+from pytest import Pytester
+
+import pytest_asyncio
+
+
+def test_shared_resource_is_used_from_loops_of_all_scopes(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+
+            import pytest
+            import pytest_asyncio
+
+            class Pool:
+                def __init__(self):
+                    self.loop = asyncio.get_running_loop()
+                    self.size = 2
+
+                async def query(self, value):
+                    assert asyncio.get_running_loop() is self.loop
+                    await asyncio.sleep(0)
+                    return value * 2
+
+            pools = []
+            closed = []
+
+            @pytest_asyncio.shared_resource
+            async def pool():
+                pool = Pool()
+                pools.append(pool)
+                yield pool
+                closed.append(pool)
+
+            @pytest.mark.asyncio
+            async def test_function_loop(pool):
+                assert pools[0].loop is not asyncio.get_running_loop()
+                assert await pool.query(21) == 42
+                assert pool.size == 2
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_module_loop(pool):
+                assert await pool.query(1) == 2
+
+            def test_sync(pool):
+                assert len(pools) == 1
+                assert closed == []
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=3)
+
+
+def test_shared_resource_runs_functions_in_its_loop(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import contextlib
+
+            import pytest
+            import pytest_asyncio
+
+            class Pool:
+                @contextlib.asynccontextmanager
+                async def acquire(self):
+                    yield "connection"
+
+            @pytest_asyncio.shared_resource(scope="module")
+            async def pool():
+                return Pool()
+
+            async def use_connection(pool, suffix):
+                async with pool.acquire() as connection:
+                    return connection + suffix
+
+            @pytest.mark.asyncio
+            async def test_run_in_loop(pool):
+                assert await pool.run_in_loop(use_connection, "!") == "connection!"
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+def test_shared_resource_setup_error_is_reported(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.shared_resource
+            async def pool():
+                raise ConnectionError("database is down")
+
+            @pytest.mark.asyncio
+            async def test_uses_pool(pool):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*ConnectionError: database is down"])
+
+
+def test_shared_resource_cancels_pending_tasks_on_close(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makeconftest(
+        dedent(
+            """\
+            import asyncio
+
+            import pytest_asyncio
+
+            cancelled = []
+
+            async def heartbeat():
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            @pytest_asyncio.shared_resource(scope="module")
+            async def pool():
+                asyncio.create_task(heartbeat())
+                await asyncio.sleep(0)
+                yield "pool"
+            """
+        )
+    )
+    pytester.makepyfile(
+        test_a=dedent(
+            """\
+            import pytest
+
+            from conftest import cancelled
+
+            @pytest.mark.asyncio
+            async def test_uses_pool(pool):
+                assert cancelled == []
+            """
+        ),
+        test_b=dedent(
+            """\
+            from conftest import cancelled
+
+            def test_task_was_cancelled():
+                assert cancelled == [True]
+            """
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+
+
+def test_shared_resource_must_be_async():
+    def pool():
+        pass
+
+    with pytest.raises(ValueError, match="pool cannot be a shared resource"):
+        pytest_asyncio.shared_resource(pool)
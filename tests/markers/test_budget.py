@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_test_within_budget_passes(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio(max_duration=10, max_cpu=10, max_loop_iterations=100)
+            async def test_within_budget():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+def test_test_exceeding_duration_fails_with_breakdown(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio(max_duration=0.01)
+            async def test_slow():
+                await asyncio.sleep(0.05)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*test_slow exceeded its asyncio budget:",
+            "*duration: 0.0*s (budget: 0.010s) EXCEEDED",
+            "*cpu: *s",
+        ]
+    )
+
+
+def test_test_exceeding_loop_iterations_fails(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio(max_loop_iterations=5)
+            async def test_busy_polling():
+                for _ in range(10):
+                    await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*loop iterations: 1* (budget: 5) EXCEEDED"])
+
+
+def test_test_exceeding_loop_lag_fails(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import time
+            import pytest
+
+            async def block_loop():
+                time.sleep(0.05)
+
+            @pytest.mark.asyncio(max_lag=0.01)
+            async def test_blocks_loop():
+                asyncio.create_task(block_loop())
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*test_blocks_loop exceeded its asyncio budget:",
+            "*loop lag p99: 0.0*s (budget: 0.010s) EXCEEDED",
+        ]
+    )
+
+
+def test_budget_of_module_marker_applies_to_marked_tests(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            pytestmark = pytest.mark.asyncio(max_loop_iterations=5)
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_busy_polling():
+                for _ in range(10):
+                    await asyncio.sleep(0)
+
+            @pytest.mark.asyncio(max_loop_iterations=100)
+            async def test_with_larger_budget():
+                for _ in range(10):
+                    await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*test_busy_polling exceeded its asyncio budget*"])
+
+
+def test_budget_defaults_to_ini_option(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_default_max_duration = 0.01
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_slow():
+                await asyncio.sleep(0.05)
+
+            @pytest.mark.asyncio(max_duration=1)
+            async def test_with_larger_budget():
+                await asyncio.sleep(0.05)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1, failed=1)
+
+
+def test_invalid_budget_raises_error(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio(max_cpu=-1)
+            async def test_anything():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*max_cpu must be positive, got -1*"])
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_load_test_runs_body_concurrently_with_shared_fixtures(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            setups = []
+            running = set()
+            max_running = 0
+
+            @pytest_asyncio.fixture
+            async def shared():
+                setups.append(True)
+                return object()
+
+            @pytest.mark.asyncio(repeat=20, concurrency=4)
+            async def test_body(shared):
+                global max_running
+                running.add(asyncio.current_task())
+                max_running = max(max_running, len(running))
+                await asyncio.sleep(0.001)
+                running.discard(asyncio.current_task())
+
+            def test_load_test_shared_fixture():
+                assert setups == [True]
+                assert max_running == 4
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= asyncio load tests =*",
+            "*::test_body: 20 runs, concurrency 4, 0 errors, * runs/s, "
+            "p50 *ms, p95 *ms, p99 *ms",
+        ]
+    )
+
+
+def test_load_test_fails_on_any_error(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import itertools
+            import pytest
+
+            counter = itertools.count()
+
+            @pytest.mark.asyncio(repeat=10)
+            async def test_body():
+                assert next(counter) != 5
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        ["*assert 5 != 5*", "*10 runs, concurrency 1, 1 errors*"]
+    )
+
+
+def test_load_test_fails_when_percentile_exceeds_threshold(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio(repeat=5, concurrency=5, max_p99=0.001)
+            async def test_body():
+                await asyncio.sleep(0.01)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        ["*test_body exceeded its latency thresholds: p99 *ms exceeds 1.00ms"]
+    )
+
+
+def test_load_option_turns_async_tests_into_load_tests(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            runs = []
+
+            @pytest.mark.asyncio
+            async def test_body():
+                runs.append(True)
+
+            def test_runs():
+                assert len(runs) == 3
+            """
+        )
+    )
+    result = pytester.runpytest(
+        "--asyncio-mode=strict",
+        "--asyncio-load=3",
+        "--asyncio-load-concurrency=2",
+        "--junitxml=report.xml",
+    )
+    result.assert_outcomes(passed=2)
+    junit_report = (pytester.path / "report.xml").read_text()
+    assert '<property name="asyncio_load_runs" value="3" />' in junit_report
+
+
+def test_load_test_cancels_other_runs_when_a_run_fails_the_test(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = module")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import itertools
+            import pytest
+
+            counter = itertools.count()
+            cancelled = []
+
+            @pytest.mark.asyncio(loop_scope="module", repeat=10, concurrency=2)
+            async def test_body():
+                if next(counter) == 1:
+                    pytest.fail("stop the load test")
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            def test_other_runs_were_cancelled():
+                assert cancelled == [True]
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*stop the load test*",
+            "*::test_body: 0 runs (aborted), concurrency 2, 0 errors*",
+        ]
+    )
+
+
+def test_invalid_concurrency_is_reported_by_name(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio(repeat=2, concurrency=0)
+            async def test_body():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*concurrency must be positive, got 0*"])
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_timeout_fails_hanging_test_with_task_stacks(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            cancelled = []
+
+            async def wait_forever():
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            @pytest.mark.asyncio(timeout=0.1)
+            async def test_hangs():
+                asyncio.create_task(wait_forever(), name="background")
+                await asyncio.sleep(60)
+
+            def test_background_task_was_cancelled():
+                assert cancelled == [True]
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "-W", "error")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "The test timed out after 0.1s. Stacks of the pending tasks:",
+            "Task 'Task-*':",
+            '  File "*test_timeout_fails_hanging_test_with_task_stacks.py", '
+            "line *, in test_hangs",
+            "    await asyncio.sleep(60)",
+            "Task 'background':",
+            "*in wait_forever",
+            "    await asyncio.Event().wait()",
+        ]
+    )
+
+
+def test_timeout_defaults_to_ini_option(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_default_timeout = 0.1
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_hangs():
+                await asyncio.sleep(60)
+
+            @pytest.mark.asyncio(timeout=10)
+            async def test_overrides_default():
+                await asyncio.sleep(0.2)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*The test timed out after 0.1s*"])
+
+
+def test_timeout_applies_to_async_fixtures(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture
+            async def hangs_in_setup():
+                await asyncio.sleep(60)
+
+            @pytest_asyncio.fixture
+            async def hangs_in_teardown():
+                yield
+                await asyncio.sleep(60)
+
+            @pytest.mark.asyncio(timeout=0.1)
+            async def test_setup(hangs_in_setup):
+                pass
+
+            @pytest.mark.asyncio(timeout=0.1)
+            async def test_teardown(hangs_in_teardown):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1, errors=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*Setup of hangs_in_setup timed out after 0.1s*",
+            "*Teardown of hangs_in_teardown timed out after 0.1s*",
+        ]
+    )
+
+
+def test_timeout_does_not_cancel_tasks_of_fixtures(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = module")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture(scope="module")
+            async def background_task():
+                task = asyncio.create_task(asyncio.sleep(60))
+                yield task
+                task.cancel()
+
+            @pytest.mark.asyncio(loop_scope="module", timeout=0.1)
+            async def test_hangs(background_task):
+                await asyncio.sleep(60)
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_background_task_is_alive(background_task):
+                assert not background_task.done()
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1, failed=1)
+
+
+def test_invalid_timeout_raises_error(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio(timeout=-1)
+            async def test_anything():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*Invalid asyncio timeout for *test_anything*"])
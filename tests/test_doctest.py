@@ -41,3 +41,138 @@ def test_plugin_does_not_interfere_with_doctest_textfile_collection(pytester: Py
     )
     result = pytester.runpytest("--asyncio-mode=strict")
     result.assert_outcomes(passed=1)
+
+
+def test_doctest_examples_with_top_level_await(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            '''\
+            import asyncio
+
+            async def answer():
+                """
+                >>> await answer()
+                42
+                >>> result = await asyncio.sleep(0, result="awaited")
+                >>> result
+                'awaited'
+                """
+                return 42
+
+            async def fail():
+                """
+                >>> await fail()
+                Traceback (most recent call last):
+                ...
+                ValueError: failed
+                """
+                raise ValueError("failed")
+            '''
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "--doctest-modules")
+    result.assert_outcomes(passed=2)
+
+
+def test_doctests_of_a_module_share_the_event_loop(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            '''\
+            import asyncio
+
+            loops = []
+
+            def first():
+                """
+                >>> loops.append(await asyncio.sleep(0, asyncio.get_running_loop()))
+                """
+
+            def second():
+                """
+                >>> loops.append(await asyncio.sleep(0, asyncio.get_running_loop()))
+                >>> loops[0] is loops[1]
+                True
+                """
+            '''
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "--doctest-modules")
+    result.assert_outcomes(passed=2)
+
+
+def test_doctest_textfile_with_top_level_await(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makefile(
+        ".txt",
+        dedent(
+            """\
+            >>> import asyncio
+            >>> await asyncio.sleep(0, result=1)
+            1
+            >>> await asyncio.sleep(0, result=2)
+            3
+            """
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["Expected:", "    3", "Got:", "    2"])
+
+
+def test_async_doctest_example_times_out(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_default_timeout = 0.1
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            '''\
+            def wait():
+                """
+                >>> import asyncio
+                >>> await asyncio.sleep(10)
+                """
+            '''
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "--doctest-modules")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*Example <async doctest *wait?1?> timed out after 0.1s*",
+            "    await asyncio.sleep(10)",
+        ]
+    )
+
+
+def test_async_doctest_activates_lazy_plugin(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_activation = lazy
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            '''\
+            def sleep():
+                """
+                >>> import asyncio
+                >>> await asyncio.sleep(0, result="done")
+                'done'
+                """
+            '''
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "--doctest-modules")
+    result.assert_outcomes(passed=1)
@@ -80,3 +80,31 @@ def test_event_loop_fixture_handles_unclosed_async_gen(
     )
     result = pytester.runpytest_subprocess("--asyncio-mode=strict", "-W", "default")
     result.assert_outcomes(passed=1, warnings=0)
+
+
+def test_test_runs_in_event_loop_fixture_when_current_loop_is_replaced(
+    pytester: Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.fixture
+            def replaces_current_loop(event_loop):
+                other_loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(other_loop)
+                yield event_loop
+                asyncio.set_event_loop(event_loop)
+                other_loop.close()
+
+            @pytest.mark.asyncio
+            async def test_runs_in_event_loop_fixture(replaces_current_loop):
+                assert asyncio.get_running_loop() is replaces_current_loop
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "-W", "default")
+    result.assert_outcomes(passed=1)
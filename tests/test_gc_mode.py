@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_deferred_gc_mode_disables_collector_during_async_tests(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_gc_mode = deferred
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import gc
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_async():
+                assert not gc.isenabled()
+
+            @pytest.mark.asyncio(gc="default")
+            async def test_opts_out():
+                assert gc.isenabled()
+
+            def test_sync():
+                assert gc.isenabled()
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*asyncio garbage collection*",
+            "mode deferred: * collections took *s, 1 tests deferred their collections",
+        ]
+    )
+
+
+def test_marker_defers_gc_without_ini_mode(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_gc_mode = default
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import gc
+            import pytest
+
+            @pytest.mark.asyncio(gc="deferred")
+            async def test_deferred():
+                assert not gc.isenabled()
+
+            @pytest.mark.asyncio
+            async def test_default():
+                assert gc.isenabled()
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=2)
+
+
+def test_frozen_gc_mode_freezes_objects_after_collection(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_gc_mode = frozen
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import gc
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_objects_are_frozen():
+                assert gc.get_freeze_count() > 0
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=1)
+
+
+def test_frozen_gc_mode_freezes_session_fixtures_only(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_gc_mode = frozen
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import gc
+            import pytest
+
+            def is_frozen(obj):
+                return not any(tracked is obj for tracked in gc.get_objects())
+
+            @pytest.fixture(scope="session")
+            def session_data():
+                return {"session": []}
+
+            @pytest.fixture
+            def function_data():
+                return {"function": []}
+
+            @pytest.mark.asyncio
+            async def test_first(session_data, function_data):
+                assert is_frozen(session_data)
+                assert not is_frozen(function_data)
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=1)
+
+
+def test_gc_time_is_added_to_user_properties(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_gc_mode = deferred
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_async():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess("--junitxml=report.xml")
+    result.assert_outcomes(passed=1)
+    report = (pytester.path / "report.xml").read_text()
+    assert 'name="asyncio_gc_collections" value="1"' in report
+    assert 'name="asyncio_gc_time"' in report
+
+
+def test_invalid_gc_mode_is_usage_error(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_gc_mode = never
+            """
+        )
+    )
+    pytester.makepyfile("def test_nothing(): pass")
+    result = pytester.runpytest()
+    result.stderr.fnmatch_lines(["*'never' is not a valid asyncio_gc_mode*"])
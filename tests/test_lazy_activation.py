@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+from pytest import Pytester
+
+
+def test_dormant_plugin_does_not_provide_event_loops_to_sync_tests(
+    pytester: Pytester,
+):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_activation = lazy
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import sys
+
+            class TestSync:
+                def test_sync(self, request):
+                    assert "event_loop_policy" not in request.fixturenames
+                    module = sys.modules[__name__]
+                    assert not hasattr(module, "__pytest_asyncio_scoped_event_loop")
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=auto")
+    result.assert_outcomes(passed=1)
+
+
+def test_activation_provides_event_loops_to_collectors_seen_while_dormant(
+    pytester: Pytester,
+):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_activation = lazy
+            """
+        )
+    )
+    pytester.makepyfile(
+        __init__="",
+        test_a_sync="def test_sync(): pass",
+        test_b_async=dedent(
+            """\
+            import asyncio
+            import pytest
+
+            def test_sync():
+                pass
+
+            class TestClassScope:
+                loop = None
+
+                @pytest.mark.asyncio(loop_scope="class")
+                async def test_remembers_loop(self):
+                    TestClassScope.loop = asyncio.get_running_loop()
+
+                @pytest.mark.asyncio(loop_scope="class")
+                async def test_runs_in_class_loop(self):
+                    assert asyncio.get_running_loop() is TestClassScope.loop
+
+            module_loops = []
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_remembers_loop():
+                module_loops.append(asyncio.get_running_loop())
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_runs_in_module_loop():
+                assert asyncio.get_running_loop() is module_loops[0]
+            """
+        ),
+        test_c_async=dedent(
+            """\
+            import asyncio
+            import pytest
+
+            package_loops = []
+
+            @pytest.mark.asyncio(loop_scope="package")
+            async def test_remembers_loop():
+                package_loops.append(asyncio.get_running_loop())
+
+            @pytest.mark.asyncio(loop_scope="package")
+            async def test_runs_in_package_loop():
+                assert asyncio.get_running_loop() is package_loops[0]
+            """
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=8)
+
+
+def test_sync_test_activates_plugin_when_requesting_async_conftest_fixture(
+    pytester: Pytester,
+):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_activation = lazy
+            """
+        )
+    )
+    pytester.makeconftest(
+        dedent(
+            """\
+            import asyncio
+
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture
+            async def running_loop():
+                return asyncio.get_running_loop()
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            def test_sync(running_loop):
+                assert running_loop.is_closed() is False
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+def test_package_loop_is_torn_down_after_session_loop(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_activation = lazy
+            """
+        )
+    )
+    package = pytester.mkpydir("pkg")
+    package.joinpath("test_loops.py").write_text(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio(loop_scope="package")
+            async def test_package_loop():
+                pass
+
+            @pytest.mark.asyncio(loop_scope="session")
+            async def test_session_loop():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("-W", "error")
+    result.assert_outcomes(passed=2)
+
+
+def test_activation_applies_parametrized_event_loop_policy(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_activation = lazy
+            """
+        )
+    )
+    pytester.makeconftest(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            class CustomPolicy(asyncio.DefaultEventLoopPolicy):
+                pass
+
+            @pytest.fixture(
+                scope="session", params=[asyncio.DefaultEventLoopPolicy, CustomPolicy]
+            )
+            def event_loop_policy(request):
+                return request.param()
+            """
+        )
+    )
+    pytester.makepyfile(
+        test_a_sync="def test_sync(): pass",
+        test_b_async=dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_async():
+                pass
+
+            def test_sync_after_activation():
+                pass
+            """
+        ),
+    )
+    result = pytester.runpytest("--asyncio-mode=strict", "-v")
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines(
+        [
+            "test_a_sync.py::test_sync PASSED*",
+            "test_b_async.py::test_sync_after_activation?CustomPolicy? PASSED*",
+        ]
+    )
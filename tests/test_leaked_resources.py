@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_leak_policy_off_by_default(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_leaks_timer():
+                asyncio.get_running_loop().call_later(60, print)
+            """
+        )
+    )
+    result = pytester.runpytest("-W", "error::pytest.PytestWarning")
+    result.assert_outcomes(passed=1)
+
+
+def test_warns_about_pending_task(pytester: pytest.Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_leak_policy = warn
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_leaks_task():
+                asyncio.create_task(asyncio.sleep(60), name="leaked-task")
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=1, warnings=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*test_leaks_task*still alive after the test finished*",
+            "*pending task <Task pending name='leaked-task'*",
+        ]
+    )
+
+
+def test_fail_policy_reports_timer_as_error(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_leaks_timer():
+                asyncio.get_running_loop().call_later(60, print)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-leak-policy=fail")
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines(["*scheduled timer <TimerHandle*"])
+
+
+def test_fail_policy_lets_other_finishers_run(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import gc
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_leaks_timer():
+                asyncio.get_running_loop().call_later(60, print)
+
+            def test_gc_is_enabled_again():
+                assert gc.isenabled()
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess(
+        "--asyncio-leak-policy=fail",
+        "-o",
+        "asyncio_gc_mode=deferred",
+        "--asyncio-task-counts",
+        "--junitxml=report.xml",
+    )
+    result.assert_outcomes(passed=2, errors=1)
+    assert "asyncio_tasks_created" in (pytester.path / "report.xml").read_text()
+
+
+def test_fail_policy_reports_open_transport(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_leaks_transport():
+                loop = asyncio.get_running_loop()
+                await loop.create_datagram_endpoint(
+                    asyncio.DatagramProtocol, local_addr=("127.0.0.1", 0)
+                )
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_does_not_leak():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess(
+        "--asyncio-leak-policy=fail", "-W", "ignore::ResourceWarning"
+    )
+    result.assert_outcomes(passed=2, errors=1)
+    result.stdout.fnmatch_lines(
+        ["*test_leaks_transport*", "*open transport <_SelectorDatagramTransport*"]
+    )
+
+
+def test_cancel_policy_cancels_pending_tasks(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            cancelled = []
+
+            async def wait_forever():
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            @pytest.mark.asyncio
+            async def test_leaks_task():
+                asyncio.create_task(wait_forever())
+                await asyncio.sleep(0)
+
+            def test_task_was_cancelled():
+                assert cancelled == [True]
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-leak-policy=cancel", "-W", "error")
+    result.assert_outcomes(passed=2)
+
+
+def test_tasks_of_wider_scoped_fixtures_are_not_attributed_to_tests(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = module")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture(scope="module")
+            async def background_task():
+                task = asyncio.create_task(asyncio.sleep(60))
+                yield task
+                task.cancel()
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_uses_background_task(background_task):
+                assert not background_task.done()
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-leak-policy=fail")
+    result.assert_outcomes(passed=1)
+
+
+def test_invalid_leak_policy_is_usage_error(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile("def test_nothing(): pass")
+    result = pytester.runpytest("--asyncio-leak-policy=ignore")
+    result.stderr.fnmatch_lines(["*'ignore' is not a valid asyncio_leak_policy*"])
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from textwrap import dedent
+from xml.etree import ElementTree
+
+import pytest
+
+
+def test_lag_is_reported_per_test_and_fixture(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import time
+            import pytest
+            import pytest_asyncio
+
+            async def block_loop():
+                time.sleep(0.02)
+
+            @pytest_asyncio.fixture
+            async def resource():
+                await asyncio.sleep(0)
+                yield
+
+            @pytest.mark.asyncio
+            async def test_blocks_loop(resource):
+                asyncio.create_task(block_loop())
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-lag")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*asyncio loop lag*",
+            "test test_lag_is_reported_per_test_and_fixture.py::test_blocks_loop: "
+            "p50 *ms, p99 *ms, max *ms (* callbacks)",
+            "fixture test_lag_is_reported_per_test_and_fixture.py::resource: "
+            "p50 *ms, p99 *ms, max *ms (* callbacks)",
+        ]
+    )
+
+
+def test_lag_is_added_to_user_properties(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import time
+            import pytest
+
+            async def block_loop():
+                time.sleep(0.02)
+
+            @pytest.mark.asyncio
+            async def test_blocks_loop():
+                asyncio.create_task(block_loop())
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-lag", "--junitxml=report.xml")
+    result.assert_outcomes(passed=1)
+    report = ElementTree.parse(pytester.path / "report.xml")
+    properties = {
+        prop.get("name"): float(prop.get("value")) for prop in report.iter("property")
+    }
+    assert properties["asyncio_lag_p50"] <= properties["asyncio_lag_p99"]
+    assert properties["asyncio_lag_p99"] >= 0.019
+    assert properties["asyncio_lag_max"] >= 0.02
+
+
+def test_lag_is_not_reported_by_default(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_nothing():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+    result.stdout.no_fnmatch_line("*asyncio loop lag*")
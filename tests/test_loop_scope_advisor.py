@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_advise_recommends_module_scoped_loop(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            @pytest.mark.parametrize("i", range(3))
+            async def test_function_scoped_loop(i):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-advise")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*asyncio loop scope advice*",
+            "test_advise_recommends_module_scoped_loop.py: 3 function-scoped event "
+            "loops took *s, loop_scope='module' would save ~*s",
+        ]
+    )
+
+
+def test_advise_recommends_session_scoped_loop_for_modules(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    test_module = dedent(
+        """\
+        import pytest
+
+        @pytest.mark.asyncio(loop_scope="module")
+        async def test_module_scoped_loop():
+            pass
+        """
+    )
+    pytester.makepyfile(test_first=test_module, test_second=test_module)
+    result = pytester.runpytest("--asyncio-advise")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        ["the session: 2 module-scoped event loops took *s, loop_scope='session'*"]
+    )
+
+
+def test_advise_ranks_recreated_async_fixtures(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture
+            async def slow_resource():
+                await asyncio.sleep(0.1)
+                yield
+
+            @pytest.mark.asyncio
+            async def test_first(slow_resource):
+                pass
+
+            @pytest.mark.asyncio
+            async def test_second(slow_resource):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-advise")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*asyncio loop scope advice*",
+            "*::slow_resource: 2 setups and teardowns of a function-scoped async "
+            "fixture took *s, scope='module' and loop_scope='module' would save ~*s",
+            "*: 2 function-scoped event loops took *",
+        ]
+    )
+
+
+def test_advise_is_off_by_default(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            @pytest.mark.parametrize("i", range(2))
+            async def test_function_scoped_loop(i):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=2)
+    result.stdout.no_fnmatch_line("*asyncio loop scope advice*")
+
+
+def test_advise_groups_package_scoped_loops_of_nested_packages_by_session(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    test_module = dedent(
+        """\
+        import pytest
+
+        @pytest.mark.asyncio(loop_scope="package")
+        async def test_package_scoped_loop():
+            pass
+        """
+    )
+    package = pytester.mkpydir("pkg")
+    for name in ("first", "second"):
+        subpackage = package / name
+        subpackage.mkdir()
+        (subpackage / "__init__.py").write_text("")
+        (subpackage / f"test_{name}.py").write_text(test_module)
+    result = pytester.runpytest("--asyncio-advise")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        ["the session: 2 package-scoped event loops took *s, loop_scope='session'*"]
+    )
+    result.stdout.no_fnmatch_line("pkg: *")
+
+
+def test_advise_recommends_package_scoped_loop_for_modules_of_nested_package(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    test_module = dedent(
+        """\
+        import pytest
+
+        @pytest.mark.asyncio(loop_scope="module")
+        async def test_module_scoped_loop():
+            pass
+        """
+    )
+    subpackage = pytester.mkpydir("pkg") / "sub"
+    subpackage.mkdir()
+    (subpackage / "__init__.py").write_text("")
+    (subpackage / "test_first.py").write_text(test_module)
+    (subpackage / "test_second.py").write_text(test_module)
+    result = pytester.runpytest("--asyncio-advise")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        ["pkg/sub: 2 module-scoped event loops took *s, loop_scope='package'*"]
+    )
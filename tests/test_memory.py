@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+import pytest
+
+
+def test_memory_reports_allocations_that_outlive_test(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            leaked = []
+
+            @pytest.mark.asyncio
+            async def test_leaks_memory():
+                leaked.append(bytearray(100_000))
+
+            @pytest.mark.asyncio
+            async def test_releases_memory():
+                data = bytearray(100_000)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-memory")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*asyncio memory*",
+            "test test_memory_reports_allocations_that_outlive_test.py"
+            "::test_leaks_memory: +*KiB",
+            "    *test_memory_reports_allocations_that_outlive_test.py:7: +9*.* KiB",
+        ]
+    )
+    result.stdout.no_fnmatch_line("*test_memory_reports*.py:11: *")
+
+
+def test_memory_attributes_wider_scoped_fixtures_to_fixture(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = module")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+            import pytest_asyncio
+
+            retained = []
+
+            @pytest_asyncio.fixture(scope="module")
+            async def resource():
+                retained.append(bytearray(100_000))
+                yield
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_uses_resource(resource):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-memory")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*asyncio memory*",
+            "fixture test_memory_attributes_wider_scoped_fixtures_to_fixture.py"
+            "::resource: +*KiB",
+            "    *test_memory_attributes_wider_scoped_fixtures_to_fixture.py:8: +9*",
+        ]
+    )
+    allocation_lines = [
+        line
+        for line in result.stdout.lines
+        if "test_memory_attributes_wider_scoped_fixtures_to_fixture.py:8:" in line
+    ]
+    assert len(allocation_lines) == 1
+
+
+def test_memory_counts_leftover_tasks_and_futures(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            leaked = []
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_leaves_task_behind():
+                loop = asyncio.get_running_loop()
+                leaked.append(loop.create_future())
+                leaked.append(loop.create_task(asyncio.Event().wait()))
+                await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-memory", "-W", "ignore")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "    left on module-scoped loop of "
+            "test_memory_counts_leftover_tasks_and_futures.py: "
+            "2 futures, 1 tasks",
+        ]
+    )
+
+
+def test_memory_growth_is_added_to_user_properties(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            leaked = []
+
+            @pytest.mark.asyncio
+            async def test_leaks_memory():
+                leaked.append(bytearray(100_000))
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-memory", "--junitxml=report.xml")
+    result.assert_outcomes(passed=1)
+    report = (pytester.path / "report.xml").read_text()
+    assert 'name="asyncio_memory_growth"' in report
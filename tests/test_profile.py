@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pstats
+from textwrap import dedent
+
+import pytest
+
+
+def test_collapsed_profile_separates_cpu_await_and_idle_time(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture
+            async def async_fixture():
+                await asyncio.sleep(0)
+                return 1
+
+            async def wait_for_timer():
+                await asyncio.sleep(0.05)
+
+            @pytest.mark.asyncio
+            async def test_a(async_fixture):
+                await wait_for_timer()
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-profile=profiles")
+    result.assert_outcomes(passed=1)
+    (profile,) = (pytester.path / "profiles").iterdir()
+    assert profile.name.endswith(".py_test_a.collapsed")
+    stacks = {}
+    for line in profile.read_text().splitlines():
+        stack, microseconds = line.rsplit(" ", 1)
+        stacks[stack] = int(microseconds)
+    assert "call;idle" in stacks
+    awaited_time = sum(
+        microseconds
+        for stack, microseconds in stacks.items()
+        if stack.startswith("call;await;test_a;wait_for_timer;sleep")
+    )
+    assert awaited_time >= 40_000
+    assert any(stack.startswith("call;cpu;test_a") for stack in stacks)
+    assert any(stack.startswith("setup async_fixture;") for stack in stacks)
+
+
+def test_pstats_profile_is_aggregated_for_session(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            def busy():
+                return sum(range(1000))
+
+            @pytest.mark.asyncio
+            async def test_a():
+                busy()
+
+            @pytest.mark.asyncio
+            async def test_b():
+                busy()
+            """
+        )
+    )
+    result = pytester.runpytest(
+        "--asyncio-profile=profiles",
+        "--asyncio-profile-format=pstats",
+        "--asyncio-profile-aggregate",
+    )
+    result.assert_outcomes(passed=2)
+    assert [p.name for p in (pytester.path / "profiles").iterdir()] == [
+        "session.pstats"
+    ]
+    stats = pstats.Stats(str(pytester.path / "profiles" / "session.pstats"))
+    busy_calls = [
+        call_count
+        for (_, _, function_name), (_, call_count, *_) in stats.stats.items()
+        if function_name == "busy"
+    ]
+    assert busy_calls == [2]
+
+
+def test_collapsed_profile_attributes_tasks_when_measuring_loop_lag(
+    pytester: pytest.Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            async def wait_for_timer():
+                await asyncio.sleep(0.05)
+
+            @pytest.mark.asyncio
+            async def test_a():
+                await wait_for_timer()
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-profile=profiles", "--asyncio-lag")
+    result.assert_outcomes(passed=1)
+    (profile,) = (pytester.path / "profiles").iterdir()
+    stacks = [line.rsplit(" ", 1)[0] for line in profile.read_text().splitlines()]
+    assert any(stack.startswith("call;cpu;test_a") for stack in stacks)
+    assert any(
+        stack.startswith("call;await;test_a;wait_for_timer;sleep") for stack in stacks
+    )
+    assert not any("measured_callback" in stack for stack in stacks)
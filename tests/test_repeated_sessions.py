@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+from pytest import Pytester
+
+
+def test_async_fixtures_are_released_after_in_process_sessions(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        test_released_fixture=dedent(
+            """\
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture
+            async def released_fixture():
+                yield
+
+            @pytest.mark.asyncio
+            async def test_uses_fixture(released_fixture):
+                pass
+            """
+        )
+    )
+    script = pytester.makepyfile(
+        run_sessions=dedent(
+            """\
+            import gc
+            import sys
+
+            import pytest
+            from pytest import FixtureDef
+
+            for _ in range(3):
+                exit_code = pytest.main(["-q", "test_released_fixture.py"])
+                assert exit_code == pytest.ExitCode.OK
+                del sys.modules["test_released_fixture"]
+
+            gc.collect()
+            fixturedefs = [
+                obj
+                for obj in gc.get_objects()
+                if isinstance(obj, FixtureDef) and obj.argname == "released_fixture"
+            ]
+            # Pytest keeps a reference to the config of the most recent session
+            assert len(fixturedefs) == 1, fixturedefs
+            """
+        )
+    )
+    result = pytester.runpython(script)
+    assert result.ret == 0, result.stderr.str()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from textwrap import dedent
+
+from pytest import Pytester
+
+
+def test_resolver_answers_from_table(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import socket
+
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_connects_to_stubbed_host(asyncio_resolver, unused_tcp_port):
+                asyncio_resolver.add("db.test", "127.0.0.1")
+                server = await asyncio.start_server(
+                    lambda reader, writer: writer.close(), "127.0.0.1", unused_tcp_port
+                )
+                async with server:
+                    _, writer = await asyncio.open_connection(
+                        "db.test", unused_tcp_port
+                    )
+                    writer.close()
+                    await writer.wait_closed()
+                assert asyncio_resolver.avoided_executor_calls == 1
+
+            @pytest.mark.asyncio
+            async def test_filters_by_family(asyncio_resolver):
+                loop = asyncio.get_running_loop()
+                infos = await loop.getaddrinfo(
+                    "localhost", 80, family=socket.AF_INET6, type=socket.SOCK_STREAM
+                )
+                assert infos == [
+                    (
+                        socket.AF_INET6,
+                        socket.SOCK_STREAM,
+                        socket.IPPROTO_TCP,
+                        "",
+                        ("::1", 80, 0, 0),
+                    )
+                ]
+
+            @pytest.mark.asyncio
+            async def test_ip_addresses_resolve_to_themselves(asyncio_resolver):
+                loop = asyncio.get_running_loop()
+                for address, family in (
+                    ("127.0.0.1", socket.AF_INET),
+                    ("::1", socket.AF_INET6),
+                ):
+                    infos = await loop.getaddrinfo(
+                        address,
+                        80,
+                        type=socket.SOCK_STREAM,
+                        flags=socket.AI_NUMERICHOST,
+                    )
+                    assert [(info[0], info[4][0]) for info in infos] == [
+                        (family, address)
+                    ]
+
+            @pytest.mark.asyncio
+            async def test_numeric_host_flag_rejects_names(asyncio_resolver):
+                loop = asyncio.get_running_loop()
+                with pytest.raises(socket.gaierror, match="not a numeric host"):
+                    await loop.getaddrinfo(
+                        "localhost", 80, flags=socket.AI_NUMERICHOST
+                    )
+
+            @pytest.mark.asyncio
+            async def test_unknown_host_fails(asyncio_resolver):
+                loop = asyncio.get_running_loop()
+                with pytest.raises(socket.gaierror, match="unknown.test is not in"):
+                    await loop.getaddrinfo("unknown.test", 80)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=5)
+
+
+def test_resolver_is_removed_after_test(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+
+            import pytest
+
+            pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+            async def test_uses_resolver(asyncio_resolver):
+                loop = asyncio.get_running_loop()
+                assert loop.getaddrinfo == asyncio_resolver.getaddrinfo
+
+            async def test_uses_loop_resolver():
+                loop = asyncio.get_running_loop()
+                assert "getaddrinfo" not in vars(loop)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+
+
+def test_resolver_requires_async_test(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            def test_sync(asyncio_resolver):
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(
+        ["*test_sync requests the asyncio_resolver fixture, but it does not run*"]
+    )
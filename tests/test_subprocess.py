@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import asyncio.subprocess
 import sys
+from textwrap import dedent
 
 import pytest
+from pytest import Pytester
 
 if sys.platform == "win32":
     # The default asyncio event loop implementation on Windows does not
@@ -25,3 +27,171 @@ async def test_subprocess():
         sys.executable, "--version", stdout=asyncio.subprocess.PIPE
     )
     await proc.communicate()
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 12) or sys.platform != "linux",
+    reason="Child watchers can only be replaced before Python 3.12",
+)
+def test_pidfd_child_watcher_does_not_start_threads(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_child_watcher = pidfd
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import sys
+            import threading
+
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_subprocess_in_function_loop():
+                threads = threading.active_count()
+                proc = await asyncio.create_subprocess_exec(
+                    sys.executable, "-c", "raise SystemExit(3)"
+                )
+                assert await proc.wait() == 3
+                assert threading.active_count() == threads
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_subprocess_in_module_loop():
+                proc = await asyncio.create_subprocess_exec(
+                    sys.executable, "-c", "print(42)", stdout=asyncio.subprocess.PIPE
+                )
+                stdout, _ = await proc.communicate()
+                assert stdout.strip() == b"42"
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 12) or sys.platform != "linux",
+    reason="Child watchers can only be replaced before Python 3.12",
+)
+def test_pidfd_child_watcher_restores_previous_watcher(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_child_watcher = pidfd
+            """
+        )
+    )
+    pytester.makeconftest(
+        dedent(
+            """\
+            import asyncio
+
+            original_watcher = asyncio.get_event_loop_policy()._watcher
+            """
+        )
+    )
+    pytester.makepyfile(
+        test_a=dedent(
+            """\
+            import asyncio
+
+            import pytest
+            from conftest import original_watcher
+
+            watchers = []
+
+            def current_watcher():
+                return asyncio.get_event_loop_policy()._watcher
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_module_loop():
+                watchers.append(current_watcher())
+                assert watchers[0] is not original_watcher
+
+            @pytest.mark.asyncio
+            async def test_function_loop_within_module_loop():
+                assert current_watcher() is watchers[0]
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_module_loop_after_function_loop():
+                assert current_watcher() is watchers[0]
+            """
+        ),
+        test_b=dedent(
+            """\
+            import asyncio
+
+            from conftest import original_watcher
+
+            def test_watcher_is_restored():
+                assert asyncio.get_event_loop_policy()._watcher is original_watcher
+            """
+        ),
+    )
+    result = pytester.runpytest_subprocess("--asyncio-mode=strict")
+    result.assert_outcomes(passed=4)
+
+
+def test_invalid_child_watcher_is_usage_error(pytester: Pytester):
+    pytester.makeini(
+        dedent(
+            """\
+            [pytest]
+            asyncio_default_fixture_loop_scope = function
+            asyncio_child_watcher = threaded
+            """
+        )
+    )
+    pytester.makepyfile("def test_nothing(): pass")
+    result = pytester.runpytest()
+    result.stderr.fnmatch_lines(["*'threaded' is not a valid asyncio_child_watcher*"])
+
+
+def test_process_pool_executor_is_shared_by_session(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makeconftest(
+        dedent(
+            """\
+            import os
+
+            # The pool must start more than one worker, even on a single CPU
+            os.cpu_count = os.process_cpu_count = lambda: 3
+            """
+        )
+    )
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import math
+
+            import pytest
+
+            executors = []
+
+            @pytest.mark.asyncio
+            async def test_runs_in_process_pool(process_pool_executor):
+                # All workers are started before the first test runs
+                assert len(process_pool_executor._processes) == 3
+                executors.append(process_pool_executor)
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    process_pool_executor, math.factorial, 5
+                )
+                assert result == 120
+
+            def test_reuses_process_pool(process_pool_executor):
+                assert executors == [process_pool_executor]
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from textwrap import dedent
+from xml.etree import ElementTree
+
+import pytest
+
+
+def _read_properties(path) -> dict[str, dict[str, int]]:
+    report = ElementTree.parse(path)
+    return {
+        testcase.get("name"): {
+            prop.get("name"): int(prop.get("value"))
+            for prop in testcase.iter("property")
+            if not prop.get("name").startswith("asyncio_load_")
+        }
+        for testcase in report.iter("testcase")
+    }
+
+
+def test_task_counts_are_added_to_user_properties(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_fans_out():
+                await asyncio.gather(*(asyncio.sleep(0) for _ in range(10)))
+                await asyncio.gather(*(asyncio.sleep(0) for _ in range(5)))
+
+            @pytest.mark.asyncio
+            async def test_polls():
+                for _ in range(100):
+                    await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-task-counts", "--junitxml=report.xml")
+    result.assert_outcomes(passed=2)
+    properties = _read_properties(pytester.path / "report.xml")
+    fans_out = properties["test_fans_out"]
+    assert fans_out["asyncio_tasks_created"] == 15
+    assert fans_out["asyncio_tasks_peak_pending"] == 10
+    polls = properties["test_polls"]
+    assert polls["asyncio_tasks_created"] == 0
+    assert polls["asyncio_tasks_peak_pending"] == 0
+    assert polls["asyncio_loop_iterations"] >= 100
+    assert fans_out["asyncio_loop_iterations"] < polls["asyncio_loop_iterations"]
+
+
+def test_task_counts_cover_fixtures_in_wider_scoped_loops(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = module")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture(loop_scope="module")
+            async def spawns_task():
+                task = asyncio.create_task(asyncio.sleep(0))
+                yield
+                await task
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_first(spawns_task):
+                pass
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_second():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-task-counts", "--junitxml=report.xml")
+    result.assert_outcomes(passed=2)
+    properties = _read_properties(pytester.path / "report.xml")
+    assert properties["test_first"]["asyncio_tasks_created"] == 1
+    assert properties["test_second"]["asyncio_tasks_created"] == 0
+
+
+def test_task_counts_exclude_load_test_workers(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio(repeat=20, concurrency=4)
+            async def test_spawns_task():
+                await asyncio.create_task(asyncio.sleep(0))
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-task-counts", "--junitxml=report.xml")
+    result.assert_outcomes(passed=1)
+    properties = _read_properties(pytester.path / "report.xml")
+    assert properties["test_spawns_task"]["asyncio_tasks_created"] == 20
+    assert properties["test_spawns_task"]["asyncio_tasks_peak_pending"] == 4
+
+
+def test_loop_iterations_are_counted_after_budgeted_test(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = module")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            @pytest.mark.asyncio(loop_scope="module", max_loop_iterations=1000)
+            async def test_with_budget():
+                await asyncio.sleep(0)
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_without_budget():
+                for _ in range(10):
+                    await asyncio.sleep(0)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-task-counts", "--junitxml=report.xml")
+    result.assert_outcomes(passed=2)
+    properties = _read_properties(pytester.path / "report.xml")
+    assert properties["test_without_budget"]["asyncio_loop_iterations"] >= 10
+
+
+def test_task_counts_are_not_reported_by_default(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_nothing():
+                pass
+
+            def test_sync():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--junitxml=report.xml")
+    result.assert_outcomes(passed=2)
+    assert "asyncio_tasks_created" not in (pytester.path / "report.xml").read_text()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from textwrap import dedent
+
+import pytest
+
+
+def test_trace_contains_loops_fixtures_and_tests(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+            import pytest_asyncio
+
+            @pytest_asyncio.fixture
+            async def async_fixture():
+                yield 1
+
+            @pytest.mark.asyncio
+            async def test_a(async_fixture):
+                assert async_fixture == 1
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-trace=trace.json")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*generated asyncio trace file: *trace.json*"])
+    trace = json.loads((pytester.path / "trace.json").read_text())
+    spans = {
+        (event["cat"], event["name"])
+        for event in trace["traceEvents"]
+        if event["ph"] == "X"
+    }
+    assert ("loop", "create event loop") in spans
+    assert ("loop", "close event loop") in spans
+    assert ("fixture", "setup async_fixture") in spans
+    assert ("fixture", "teardown async_fixture") in spans
+    assert ("test", "test_trace_contains_loops_fixtures_and_tests.py::test_a") in spans
+    thread_names = [
+        event for event in trace["traceEvents"] if event["name"] == "thread_name"
+    ]
+    assert len(thread_names) == 1
+
+
+def test_trace_contains_task_lifetimes_when_requested(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import pytest
+
+            async def child():
+                await asyncio.sleep(0)
+
+            @pytest.mark.asyncio
+            async def test_a():
+                await asyncio.create_task(child())
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-trace=trace.json", "--asyncio-trace-tasks")
+    result.assert_outcomes(passed=1)
+    trace = json.loads((pytester.path / "trace.json").read_text())
+    task_events = [
+        (event["ph"], event["name"])
+        for event in trace["traceEvents"]
+        if event.get("cat") == "task"
+    ]
+    assert ("b", "child") in task_events
+    assert ("e", "child") in task_events
+    assert ("b", "test_a") in task_events
+
+
+def test_trace_omits_tasks_by_default(pytester: pytest.Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import pytest
+
+            @pytest.mark.asyncio
+            async def test_a():
+                pass
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-trace=trace.json")
+    result.assert_outcomes(passed=1)
+    trace = json.loads((pytester.path / "trace.json").read_text())
+    assert not [e for e in trace["traceEvents"] if e.get("cat") == "task"]
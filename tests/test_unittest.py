@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import sys
+from textwrap import dedent
+
+import pytest
+from pytest import Pytester
+
+
+def test_isolated_asyncio_test_case_runs_in_class_scoped_loop(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            loops = []
+
+            @pytest.mark.asyncio(loop_scope="class")
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def asyncSetUp(self):
+                    self.setup_loop = asyncio.get_running_loop()
+
+                async def test_a(self):
+                    loops.append(asyncio.get_running_loop())
+                    assert loops[-1] is self.setup_loop
+
+                async def test_b(self):
+                    loops.append(asyncio.get_running_loop())
+                    assert loops[0] is loops[-1]
+
+                def test_sync(self):
+                    assert self.setup_loop is loops[0]
+
+                async def asyncTearDown(self):
+                    assert asyncio.get_running_loop() is self.setup_loop
+
+            def test_loop_is_closed_after_class():
+                assert loops[0].is_closed()
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=4)
+
+
+def test_unmarked_test_case_is_left_to_unittest_in_strict_mode(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_runs_in_unittest_loop(self):
+                    assert not hasattr(asyncio.get_running_loop(), "__pytest_asyncio")
+            """
+        )
+    )
+    # The asyncio.Runner of unittest unsets the current event loop of the process
+    result = pytester.runpytest_subprocess("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+def test_isolated_asyncio_test_case_uses_event_loop_policy(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            class CustomEventLoop(asyncio.SelectorEventLoop):
+                pass
+
+            class CustomEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+                def new_event_loop(self):
+                    return CustomEventLoop()
+
+            @pytest.fixture
+            def event_loop_policy():
+                return CustomEventLoopPolicy()
+
+            @pytest.mark.asyncio
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_uses_custom_loop(self):
+                    assert isinstance(asyncio.get_running_loop(), CustomEventLoop)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=auto")
+    result.assert_outcomes(passed=1)
+
+
+def test_unmarked_test_case_is_left_to_unittest_in_auto_mode(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_runs_in_unittest_loop(self):
+                    assert not hasattr(asyncio.get_running_loop(), "__pytest_asyncio")
+            """
+        )
+    )
+    # The asyncio.Runner of unittest unsets the current event loop of the process
+    result = pytester.runpytest_subprocess("--asyncio-mode=auto")
+    result.assert_outcomes(passed=1)
+
+
+def test_isolated_asyncio_test_case_runs_in_debug_mode(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            @pytest.mark.asyncio(loop_scope="module")
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_debug_mode(self):
+                    assert asyncio.get_running_loop().get_debug()
+
+            @pytest.mark.asyncio(loop_scope="module")
+            async def test_debug_mode_is_restored():
+                assert not asyncio.get_running_loop().get_debug()
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+
+
+def test_isolated_asyncio_test_case_reports_failures(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import unittest
+
+            import pytest
+
+            @pytest.mark.asyncio
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def asyncTearDown(self):
+                    self.calls.append("asyncTearDown")
+
+                async def test_fails(self):
+                    self.calls = []
+                    self.addAsyncCleanup(self.cleanup)
+                    assert 1 == 2
+
+                async def cleanup(self):
+                    assert self.calls == ["asyncTearDown"]
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*assert 1 == 2"])
+
+
+def test_isolated_asyncio_test_case_honours_timeout(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            @pytest.mark.asyncio(timeout=0.1)
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_hangs(self):
+                    await asyncio.sleep(10)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*The test timed out after 0.1s*"])
+
+
+def test_isolated_asyncio_test_case_honours_budget(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            @pytest.mark.asyncio(max_duration=0.01)
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_slow(self):
+                    await asyncio.sleep(0.05)
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*test_slow exceeded its asyncio budget:"])
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 11) or sys.version_info >= (3, 14),
+    reason="IsolatedAsyncioTestCase uses an asyncio.Runner since Python 3.11",
+)
+def test_isolated_asyncio_test_case_runner_is_replaced(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import contextlib
+            import contextvars
+            import unittest
+
+            import pytest
+
+            var = contextvars.ContextVar("var")
+
+            @contextlib.asynccontextmanager
+            async def resource():
+                yield asyncio.get_running_loop()
+
+            @pytest.mark.asyncio
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def asyncSetUp(self):
+                    var.set("set up")
+                    self.resource_loop = await self.enterAsyncContext(resource())
+
+                async def test_uses_pytest_asyncio_loop(self):
+                    loop = asyncio.get_running_loop()
+                    assert hasattr(loop, "__pytest_asyncio")
+                    assert self.resource_loop is loop
+                    assert var.get() == "set up"
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=1)
+
+
+@pytest.mark.skipif(
+    sys.version_info >= (3, 11),
+    reason="IsolatedAsyncioTestCase creates its own loop before Python 3.11",
+)
+def test_isolated_asyncio_test_case_loop_is_replaced(pytester: Pytester):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            loops = []
+
+            @pytest.mark.asyncio
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def asyncSetUp(self):
+                    loops.append(asyncio.get_running_loop())
+                    self.addAsyncCleanup(self.cleanup)
+
+                async def test_uses_pytest_asyncio_loop(self):
+                    loops.append(asyncio.get_running_loop())
+
+                async def cleanup(self):
+                    loops.append(asyncio.get_running_loop())
+
+            def test_all_coroutines_ran_in_pytest_asyncio_loop():
+                assert len(loops) == 3
+                assert all(loop is loops[0] for loop in loops)
+                assert hasattr(loops[0], "__pytest_asyncio")
+            """
+        )
+    )
+    result = pytester.runpytest("--asyncio-mode=strict")
+    result.assert_outcomes(passed=2)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 14),
+    reason="The test cases of untested Python versions are left to unittest",
+)
+def test_isolated_asyncio_test_case_is_left_to_unittest_on_untested_python(
+    pytester: Pytester,
+):
+    pytester.makeini("[pytest]\nasyncio_default_fixture_loop_scope = function")
+    pytester.makepyfile(
+        dedent(
+            """\
+            import asyncio
+            import unittest
+
+            import pytest
+
+            @pytest.mark.asyncio
+            class TestCase(unittest.IsolatedAsyncioTestCase):
+                async def test_runs_in_unittest_loop(self):
+                    assert not hasattr(asyncio.get_running_loop(), "__pytest_asyncio")
+            """
+        )
+    )
+    result = pytester.runpytest_subprocess("--asyncio-mode=strict", "-W default")
+    result.assert_outcomes(passed=1, warnings=1)
+    result.stdout.fnmatch_lines(["*test_runs_in_unittest_loop is left to unittest*"])